@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
-from .models import BlogCategory, BlogPost
+from .models import BlogCategory, BlogPost, BlogPostDailyViews
+from .search import search_posts
 
 
 @admin.register(BlogCategory)
@@ -15,7 +16,7 @@ class BlogPostAdmin(admin.ModelAdmin):
     list_display = ['title', 'category', 'author', 'is_published', 'is_featured',
                     'views_count', 'published_date', 'created_at']
     list_filter = ['is_published', 'is_featured', 'category', 'published_date', 'created_at']
-    search_fields = ['title', 'title_ur', 'excerpt', 'content']
+    search_fields = ['title', 'title_ur', 'excerpt', 'excerpt_ur']
     prepopulated_fields = {'slug': ('title',)}
     readonly_fields = ['views_count', 'created_at', 'updated_at']
     list_editable = ['is_published', 'is_featured']
@@ -48,6 +49,13 @@ class BlogPostAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        """Search titles, excerpts and bodies in both languages through the full-text index"""
+        if not search_term.strip():
+            return queryset, False
+        results, _snippets = search_posts(queryset, search_term)
+        return results, False
+
     def save_model(self, request, obj, form, change):
         """Auto-set author and published date"""
         if not obj.author:
@@ -56,3 +64,16 @@ class BlogPostAdmin(admin.ModelAdmin):
             from django.utils import timezone
             obj.published_date = timezone.now()
         super().save_model(request, obj, form, change)
+
+
+@admin.register(BlogPostDailyViews)
+class BlogPostDailyViewsAdmin(admin.ModelAdmin):
+    list_display = ['post', 'date', 'views']
+    list_filter = ['date']
+    search_fields = ['post__title']
+    date_hierarchy = 'date'
+    list_select_related = ['post']
+    readonly_fields = ['post', 'date', 'views']
+
+    def has_add_permission(self, request):
+        return False
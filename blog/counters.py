@@ -0,0 +1,138 @@
+"""Buffered blog post view counting"""
+import atexit
+import os
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+
+class ViewCounter:
+    """Per-process buffer of blog post views, written to the database in batches.
+
+    Page views only bump an in-memory counter. Every ``interval`` seconds,
+    or once ``max_pending`` views are buffered, the next request flushes
+    them: one ``F('views_count') + n`` UPDATE per distinct count, plus the
+    matching per-day totals. With ``background`` (and
+    BLOG_VIEW_FLUSH_IN_BACKGROUND), a thread started by the first view in
+    each process also flushes every ``interval`` seconds, so a process left
+    idle does not sit on its counts. Views buffered when a flush fails are kept for
+    the next one; whatever is left when the process exits is flushed then.
+    A process killed outright loses at most one interval's views.
+    """
+
+    def __init__(self, interval, max_pending, background=False):
+        self.interval = interval
+        self.max_pending = max_pending
+        self.background = background
+        self._pending = Counter()
+        self._total = 0
+        self._day = None
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._flusher_pid = None
+        self._stopped = threading.Event()
+
+    def record(self, post_pk):
+        """Count one view of a post"""
+        if self.background and self._flusher_pid != os.getpid():
+            self._start_flusher()
+        today = timezone.localdate()
+        # Views from different days are never mixed in one batch
+        if self._day != today and self._pending:
+            self._try_flush()
+        with self._lock:
+            self._day = today
+            self._pending[post_pk] += 1
+            self._total += 1
+            due = self._total >= self.max_pending or time.monotonic() - self._flushed_at >= self.interval
+        if due:
+            self._try_flush()
+
+    def _start_flusher(self):
+        with self._lock:
+            # Threads do not survive a fork: each worker process starts its own
+            if self._flusher_pid == os.getpid() or not getattr(settings, 'BLOG_VIEW_FLUSH_IN_BACKGROUND', True):
+                return
+            self._flusher_pid = os.getpid()
+        threading.Thread(target=self._flush_periodically, name='blog-view-flusher', daemon=True).start()
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self.interval):
+            if self.pending():
+                self._try_flush()
+                # The thread's own connection; not held between flushes
+                connections.close_all()
+
+    def stop(self):
+        """Stop the background flushes (buffered views stay pending)"""
+        self._stopped.set()
+
+    def _try_flush(self):
+        try:
+            self.flush()
+        except DatabaseError:
+            # Counting never fails a page view; the views stay buffered
+            pass
+
+    def pending(self, post_pk=None):
+        """Buffered views of one post, or of all posts"""
+        with self._lock:
+            return self._pending[post_pk] if post_pk is not None else self._total
+
+    def flush(self):
+        """Write buffered views to the database; returns the number written"""
+        with self._lock:
+            pending, day = self._pending, self._day
+            self._pending, self._total = Counter(), 0
+            self._flushed_at = time.monotonic()
+        if not pending:
+            return 0
+        try:
+            write_views(pending, day)
+        except DatabaseError:
+            with self._lock:
+                self._pending.update(pending)
+                self._total += sum(pending.values())
+            raise
+        return sum(pending.values())
+
+
+def write_views(counts, day):
+    """Add ``{post pk: views}`` to the posts' totals and to their counts for ``day``"""
+    from .models import BlogPost, BlogPostDailyViews
+    with transaction.atomic():
+        # Posts deleted since their views were buffered are dropped
+        post_pks = set(BlogPost.objects.filter(pk__in=list(counts)).values_list('pk', flat=True))
+        by_count = {}
+        for post_pk in post_pks:
+            by_count.setdefault(counts[post_pk], []).append(post_pk)
+
+        for views, post_pks in by_count.items():
+            BlogPost.objects.filter(pk__in=post_pks).update(views_count=F('views_count') + views)
+        # Make sure each day row exists, then add to it, so concurrent flushes never clash
+        BlogPostDailyViews.objects.bulk_create(
+            [BlogPostDailyViews(post_id=post_pk, date=day) for post_pk in post_pks],
+            ignore_conflicts=True,
+        )
+        for views, post_pks in by_count.items():
+            BlogPostDailyViews.objects.filter(post_id__in=post_pks, date=day).update(views=F('views') + views)
+
+
+view_counter = ViewCounter(
+    interval=getattr(settings, 'BLOG_VIEW_FLUSH_INTERVAL', 30),
+    max_pending=getattr(settings, 'BLOG_VIEW_FLUSH_THRESHOLD', 500),
+    background=True,
+)
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        view_counter.flush()
+    except Exception:
+        pass
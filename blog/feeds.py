@@ -0,0 +1,78 @@
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+from django.utils.translation import gettext as _
+
+from core.translation import localized_field
+from .models import BlogCategory, BlogPost
+
+
+class LatestPostsFeed(Feed):
+    """Latest published blog posts"""
+
+    def title(self):
+        return _('Bait ul Rizq Blog')
+
+    def description(self):
+        return _('Success stories, updates, and news from our community')
+
+    def link(self):
+        return reverse('blog:blog_list')
+
+    def posts(self):
+        return BlogPost.objects.filter(is_published=True).select_related('category').localized().order_by(
+            '-published_date'
+        )
+
+    def items(self):
+        return self.posts()[:20]
+
+    def item_title(self, item):
+        return item.localized_title
+
+    def item_description(self, item):
+        excerpt = item.localized_excerpt
+        if excerpt:
+            return excerpt
+        return Truncator(strip_tags(localized_field(item, 'content'))).words(60)
+
+    def item_link(self, item):
+        return reverse('blog:blog_detail', kwargs={'slug': item.slug})
+
+    def item_pubdate(self, item):
+        return item.published_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_categories(self, item):
+        return [item.category.localized_name] if item.category else []
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class CategoryPostsFeed(LatestPostsFeed):
+    """Latest published posts in one category"""
+
+    def get_object(self, request, slug):
+        return get_object_or_404(BlogCategory, slug=slug)
+
+    def title(self, obj):
+        return _('Bait ul Rizq Blog: %(category)s') % {'category': obj.localized_name}
+
+    def description(self, obj):
+        return obj.description or super().description()
+
+    def items(self, obj):
+        return self.posts().filter(category=obj)[:20]
+
+
+class CategoryPostsAtomFeed(CategoryPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = CategoryPostsFeed.description
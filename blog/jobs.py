@@ -0,0 +1,9 @@
+"""Background jobs of the blog app (run by ``manage.py run_worker``)"""
+from jobs.queue import job
+from .related import related_posts
+
+
+@job(merge=True)
+def update_related_posts(pks, using):
+    """Recompute the recommendations touching the posts ``pks``"""
+    related_posts.refresh(pks, using=using)
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BlogPostDailyViews",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Date")),
+                ("views", models.PositiveIntegerField(default=0, verbose_name="Views")),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_views",
+                        to="blog.blogpost",
+                        verbose_name="Post",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Daily Post Views",
+                "verbose_name_plural": "Daily Post Views",
+                "ordering": ["-date"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("post", "date"), name="blog_daily_views_post_date_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:45
+
+from django.db import migrations
+
+from core.routers import run_python_where_migrated
+
+
+def build_search_index(apps, schema_editor):
+    from blog.search import create_index, index_posts
+
+    BlogPost = apps.get_model("blog", "BlogPost")
+    db_alias = schema_editor.connection.alias
+    create_index(schema_editor)
+    index_posts(BlogPost.objects.using(db_alias).iterator(), using=db_alias)
+
+
+def drop_search_index(apps, schema_editor):
+    from blog.search import drop_index
+
+    drop_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0003_blogpostdailyviews"),
+    ]
+
+    operations = [
+        run_python_where_migrated("blogpost", build_search_index, drop_search_index),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:35
+
+from django.db import migrations, models
+
+from core.routers import run_python_where_migrated
+
+
+def render_content(apps, schema_editor):
+    from core.richtext import render_rich_text
+
+    BlogPost = apps.get_model("blog", "BlogPost")
+    db_alias = schema_editor.connection.alias
+    posts = list(BlogPost.objects.using(db_alias).only("content", "content_ur"))
+    for post in posts:
+        post.content_rendered = render_rich_text(post.content)
+        post.content_ur_rendered = render_rich_text(post.content_ur)
+    BlogPost.objects.using(db_alias).bulk_update(
+        posts, ["content_rendered", "content_ur_rendered"], batch_size=200
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0004_blogpost_fts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blogpost",
+            name="content_rendered",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="content_ur_rendered",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        run_python_where_migrated("blogpost", render_content),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0005_rendered_content"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedPost",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField(verbose_name="Similarity")),
+                ("rank", models.PositiveSmallIntegerField(verbose_name="Rank")),
+                (
+                    "source",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_entries",
+                        to="blog.blogpost",
+                        verbose_name="Post",
+                    ),
+                ),
+                (
+                    "target",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_from",
+                        to="blog.blogpost",
+                        verbose_name="Related Post",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Related Post",
+                "verbose_name_plural": "Related Posts",
+                "ordering": ["source", "rank"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("source", "rank"), name="blog_related_post_rank_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
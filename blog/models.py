@@ -2,6 +2,7 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
 from ckeditor.fields import RichTextField
+from core.translation import LocalizedQuerySet, TranslatedField
 
 
 class BlogCategory(models.Model):
@@ -12,6 +13,10 @@ class BlogCategory(models.Model):
     slug = models.SlugField(unique=True, verbose_name=_("Slug"))
     description = models.TextField(blank=True, verbose_name=_("Description"))
 
+    localized_name = TranslatedField('name')
+
+    objects = LocalizedQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Blog Category")
         verbose_name_plural = _("Blog Categories")
@@ -21,6 +26,21 @@ class BlogCategory(models.Model):
         return self.name
 
 
+# Columns rendered by blog post cards (home page and blog list)
+BLOG_CARD_FIELDS = [
+    'title', 'title_ur', 'slug', 'excerpt', 'excerpt_ur', 'featured_image', 'published_date',
+    'category__name', 'category__name_ur', 'category__slug',
+]
+
+
+class BlogPostQuerySet(LocalizedQuerySet):
+    """Queryset helpers for blog posts"""
+
+    def for_cards(self):
+        """Only the card columns, leaving the rich-text bodies unread"""
+        return self.select_related('category').only(*BLOG_CARD_FIELDS)
+
+
 class BlogPost(models.Model):
     """Blog posts for updates and stories"""
 
@@ -59,6 +79,9 @@ class BlogPost(models.Model):
 
     content = RichTextField(verbose_name=_("Content"))
     content_ur = RichTextField(blank=True, verbose_name=_("Content (Urdu)"))
+    # Sanitized, display-ready HTML, rendered on save (see core.richtext)
+    content_rendered = models.TextField(blank=True, editable=False)
+    content_ur_rendered = models.TextField(blank=True, editable=False)
 
     featured_image = models.ImageField(
         upload_to='blog/',
@@ -84,6 +107,12 @@ class BlogPost(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    localized_title = TranslatedField('title')
+    localized_excerpt = TranslatedField('excerpt')
+    localized_content = TranslatedField('content_rendered', 'content_ur_rendered')
+
+    objects = BlogPostQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Blog Post")
         verbose_name_plural = _("Blog Posts")
@@ -92,7 +121,71 @@ class BlogPost(models.Model):
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'content', 'content_ur'} & set(update_fields):
+            from core.richtext import render_rich_text
+            self.content_rendered = render_rich_text(self.content)
+            self.content_ur_rendered = render_rich_text(self.content_ur)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'content_rendered', 'content_ur_rendered'}
+        super().save(*args, **kwargs)
+
     def increment_views(self):
-        """Increment view count"""
-        self.views_count += 1
-        self.save(update_fields=['views_count'])
+        """Count a view; buffered and written in batches by blog.counters"""
+        from .counters import view_counter
+        view_counter.record(self.pk)
+
+
+class RelatedPost(models.Model):
+    """A post recommended on another post's page (see blog.related)"""
+
+    source = models.ForeignKey(
+        BlogPost,
+        on_delete=models.CASCADE,
+        related_name='related_entries',
+        verbose_name=_("Post")
+    )
+    target = models.ForeignKey(
+        BlogPost,
+        on_delete=models.CASCADE,
+        related_name='related_from',
+        verbose_name=_("Related Post")
+    )
+    score = models.FloatField(verbose_name=_("Similarity"))
+    rank = models.PositiveSmallIntegerField(verbose_name=_("Rank"))
+
+    class Meta:
+        verbose_name = _("Related Post")
+        verbose_name_plural = _("Related Posts")
+        ordering = ['source', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'rank'], name='blog_related_post_rank_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.source} -> {self.target}"
+
+
+class BlogPostDailyViews(models.Model):
+    """Views of a blog post on one day"""
+
+    post = models.ForeignKey(
+        BlogPost,
+        on_delete=models.CASCADE,
+        related_name='daily_views',
+        verbose_name=_("Post")
+    )
+    date = models.DateField(verbose_name=_("Date"))
+    views = models.PositiveIntegerField(default=0, verbose_name=_("Views"))
+
+    class Meta:
+        verbose_name = _("Daily Post Views")
+        verbose_name_plural = _("Daily Post Views")
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'date'], name='blog_daily_views_post_date_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.post} - {self.date}: {self.views}"
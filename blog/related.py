@@ -0,0 +1,26 @@
+"""Related-post recommendations (see core.recommendations)"""
+from html import unescape
+
+from django.utils.html import strip_tags
+
+from core.recommendations import Recommender
+
+
+# Columns a post's similarity is computed from, and how much each counts
+RELATED_FIELDS = {
+    'title': 3, 'title_ur': 3, 'category__name': 2, 'category__name_ur': 2,
+    'excerpt': 2, 'excerpt_ur': 2, 'content': 1, 'content_ur': 1,
+}
+
+
+def _documents(using):
+    from .models import BlogPost
+    rows = BlogPost.objects.using(using).filter(is_published=True).values_list('pk', *RELATED_FIELDS)
+    weights = list(RELATED_FIELDS.values())
+    return {
+        pk: [(unescape(strip_tags(text or '')), weight) for text, weight in zip(texts, weights)]
+        for pk, *texts in rows.iterator(chunk_size=1000)
+    }
+
+
+related_posts = Recommender('blog.RelatedPost', _documents)
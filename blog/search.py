@@ -0,0 +1,132 @@
+"""Full-text search over blog posts in English and Urdu.
+
+On SQLite the posts are indexed in an FTS5 table kept current by signals;
+other databases fall back to ``icontains`` over titles and excerpts.
+"""
+import re
+from html import unescape
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Case, IntegerField, Q, When
+from django.utils.html import escape, strip_tags
+from django.utils.safestring import mark_safe
+
+
+FTS_TABLE = 'blog_blogpost_fts'
+FTS_COLUMNS = ['title', 'title_ur', 'excerpt', 'excerpt_ur', 'content', 'content_ur']
+# bm25 weights, in FTS_COLUMNS order: titles count most, bodies least
+FTS_WEIGHTS = [10.0, 10.0, 4.0, 4.0, 1.0, 1.0]
+
+# Placeholders marking matches in snippets until they are escaped
+_MATCH_START, _MATCH_END = '\x02', '\x03'
+
+
+def fts_available(using=DEFAULT_DB_ALIAS):
+    """Whether the database behind ``using`` holds the FTS5 index"""
+    return connections[using].vendor == 'sqlite'
+
+
+def create_index(schema_editor):
+    """Create the FTS5 table (SQLite only)"""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"{', '.join(FTS_COLUMNS)}, tokenize='unicode61 remove_diacritics 2')"
+    )
+
+
+def drop_index(schema_editor):
+    """Drop the FTS5 table"""
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def _document(post):
+    # Bodies are rich text; index what a reader sees
+    return [
+        post.title, post.title_ur, post.excerpt, post.excerpt_ur,
+        unescape(strip_tags(post.content)), unescape(strip_tags(post.content_ur)),
+    ]
+
+
+def index_posts(posts, using=DEFAULT_DB_ALIAS):
+    """(Re)index posts; called on save and to rebuild the index"""
+    if not fts_available(using):
+        return
+    rows = [[post.pk, *_document(post)] for post in posts]
+    with connections[using].cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [[row[0]] for row in rows])
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)}) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+            rows,
+        )
+
+
+def unindex_post(pk, using=DEFAULT_DB_ALIAS):
+    """Remove a deleted post from the index"""
+    if fts_available(using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [pk])
+
+
+def clear_index(using=DEFAULT_DB_ALIAS):
+    """Empty the index (before the posts themselves are bulk deleted)"""
+    if fts_available(using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+
+
+def _match_expression(query):
+    # Every word must match, as a prefix; quoting keeps FTS syntax out of user input
+    words = re.findall(r'\w+', query)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search(query, limit=200, using=DEFAULT_DB_ALIAS):
+    """Ranked ``[(post pk, snippet)]`` for a search string, best first"""
+    expression = _match_expression(query)
+    if not expression or not fts_available(using):
+        return []
+    weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, snippet({FTS_TABLE}, -1, %s, %s, '…', 24) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s",
+            [_MATCH_START, _MATCH_END, expression, limit],
+        )
+        return cursor.fetchall()
+
+
+def highlight(snippet):
+    """Escape a snippet and wrap its matches in <mark>"""
+    return mark_safe(escape(snippet).replace(_MATCH_START, '<mark>').replace(_MATCH_END, '</mark>'))
+
+
+def search_posts(queryset, query):
+    """Narrow ``queryset`` to posts matching ``query``, best match first.
+
+    Returns the queryset and a ``{post pk: highlighted snippet}`` dict
+    (empty on the fallback path, where the excerpt serves as the snippet).
+    """
+    if not fts_available(queryset.db):
+        words = re.findall(r'\w+', query)
+        if not words:
+            return queryset.none(), {}
+        condition = Q()
+        for word in words:
+            condition &= (
+                Q(title__icontains=word) | Q(title_ur__icontains=word)
+                | Q(excerpt__icontains=word) | Q(excerpt_ur__icontains=word)
+            )
+        return queryset.filter(condition), {}
+
+    results = search(query, using=queryset.db)
+    if not results:
+        return queryset.none(), {}
+    ranking = Case(
+        *[When(pk=pk, then=position) for position, (pk, _) in enumerate(results)],
+        output_field=IntegerField(),
+    )
+    snippets = {pk: highlight(snippet) for pk, snippet in results}
+    return queryset.filter(pk__in=snippets).annotate(search_rank=ranking).order_by('search_rank'), snippets
@@ -0,0 +1,72 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from core.feeds import touch_feeds
+from core.pagecache import expire_pages
+from .jobs import update_related_posts
+from .models import BlogCategory, BlogPost, RelatedPost
+from .search import index_posts, unindex_post
+
+
+# Saves touching any of these can change which posts are related
+RELATED_POST_FIELDS = {
+    'title', 'title_ur', 'excerpt', 'excerpt_ur', 'content', 'content_ur', 'category', 'is_published',
+}
+
+
+def _refresh_related(pks, using):
+    # Recomputing similarities reads every post: left to a worker, with the posts changed
+    # meanwhile merged into one pending job per database
+    def enqueue():
+        update_related_posts.enqueue(list(pks), using, dedup_key=f'related-posts:{using}')
+
+    transaction.on_commit(enqueue, using=using, robust=True)
+
+
+@receiver(post_save, sender=BlogPost)
+def index_saved_post(sender, instance, raw=False, using=None, **kwargs):
+    """Keep the search index current with every save"""
+    if not raw:
+        index_posts([instance], using=using)
+
+
+@receiver(post_delete, sender=BlogPost)
+def unindex_deleted_post(sender, instance, using=None, **kwargs):
+    """Drop deleted posts from the search index"""
+    unindex_post(instance.pk, using=using)
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_save, sender=BlogCategory)
+@receiver(post_delete, sender=BlogCategory)
+def expire_blog_feeds(sender, raw=False, using=None, **kwargs):
+    """Re-render the blog feeds once a post or category change is committed"""
+    if not raw:
+        transaction.on_commit(lambda: touch_feeds('blog'), using=using)
+
+
+@receiver(post_save, sender=BlogPost)
+def refresh_related_posts(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    """Update recommendations once a change to a post's text or visibility is committed"""
+    if not raw and (update_fields is None or RELATED_POST_FIELDS & set(update_fields)):
+        _refresh_related([instance.pk], using)
+
+
+@receiver(pre_delete, sender=BlogPost)
+def refill_related_posts(sender, instance, using=None, **kwargs):
+    """Refill the lists a deleted post is about to drop out of"""
+    sources = list(RelatedPost.objects.using(using).filter(target=instance).values_list('source_id', flat=True))
+    if sources:
+        _refresh_related(sources, using)
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_save, sender=BlogCategory)
+@receiver(post_delete, sender=BlogCategory)
+def expire_blog_pages(sender, raw=False, using=None, **kwargs):
+    """Re-render cached blog pages (and the home page) once a change is committed"""
+    if not raw:
+        expire_pages('blog', using=using)
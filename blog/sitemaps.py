@@ -0,0 +1,20 @@
+from django.urls import reverse
+
+from core.sitemaps import BilingualSitemap
+from .models import BlogPost
+
+
+class BlogPostSitemap(BilingualSitemap):
+    """Published blog posts"""
+
+    changefreq = 'monthly'
+    stamp = 'blog'
+
+    def items(self):
+        return BlogPost.objects.filter(is_published=True).only('slug', 'updated_at').order_by('pk')
+
+    def location(self, item):
+        return reverse('blog:blog_detail', args=[item.slug])
+
+    def lastmod_querysets(self):
+        return [BlogPost.objects.filter(is_published=True)]
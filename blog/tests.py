@@ -1,3 +1,281 @@
-from django.test import TestCase
+import io
+import threading
+from datetime import date
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone, translation
+
+from core.models import CustomUser
+from core.test_runner import run_in_new_process
+from jobs.models import Job
+
+from .counters import ViewCounter, view_counter
+from .models import BlogCategory, BlogPost, BlogPostDailyViews, RelatedPost
+from .related import related_posts
+from .search import search_posts
+from .views import BlogDetailView
+
+
+class ViewCounterTests(TestCase):
+    """Buffered post view counting"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.posts = [
+            BlogPost.objects.create(title=f'Post {i}', slug=f'post-{i}', content='Text', is_published=True)
+            for i in range(2)
+        ]
+
+    def test_views_are_buffered_until_flushed(self):
+        counter = ViewCounter(interval=3600, max_pending=1000)
+        with self.assertNumQueries(0):
+            for post in (self.posts[0], self.posts[0], self.posts[1]):
+                counter.record(post.pk)
+        self.assertEqual(counter.pending(self.posts[0].pk), 2)
+
+        self.assertEqual(counter.flush(), 3)
+        counter.record(self.posts[0].pk)
+        counter.flush()
+        self.assertEqual(BlogPost.objects.get(pk=self.posts[0].pk).views_count, 3)
+        daily = BlogPostDailyViews.objects.get(post=self.posts[1])
+        self.assertEqual((daily.date, daily.views), (timezone.localdate(), 1))
+
+    def test_days_are_not_mixed(self):
+        counter = ViewCounter(interval=3600, max_pending=1000)
+        with mock.patch('blog.counters.timezone.localdate', return_value=date(2025, 1, 1)):
+            counter.record(self.posts[0].pk)
+        with mock.patch('blog.counters.timezone.localdate', return_value=date(2025, 1, 2)):
+            counter.record(self.posts[0].pk)
+        counter.flush()
+        self.assertEqual(
+            list(BlogPostDailyViews.objects.order_by('date').values_list('date', 'views')),
+            [(date(2025, 1, 1), 1), (date(2025, 1, 2), 1)],
+        )
+
+    @override_settings(BLOG_VIEW_FLUSH_IN_BACKGROUND=True)
+    def test_idle_processes_flush_in_the_background(self):
+        counter = ViewCounter(interval=0.2, max_pending=1000, background=True)
+        self.addCleanup(counter.stop)
+        flushed = threading.Event()
+        with mock.patch('blog.counters.write_views', side_effect=lambda counts, day: flushed.set()) as write:
+            counter.record(self.posts[0].pk)
+            self.assertTrue(flushed.wait(5))
+        self.assertEqual(write.call_args.args[0], {self.posts[0].pk: 1})
+        self.assertEqual(counter.pending(), 0)
+
+    def test_detail_view_does_not_write(self):
+        view_counter.flush()
+        post = self.posts[0]
+        view = BlogDetailView()
+        view.setup(RequestFactory().get('/'), slug=post.slug)
+        with self.assertNumQueries(1):
+            async_to_sync(view.aget_object)()
+        self.assertEqual(view_counter.pending(post.pk), 1)
+        self.assertEqual(BlogPost.objects.get(pk=post.pk).views_count, 0)
+
+
+class BlogPostCardTests(TestCase):
+    """Lean list querysets"""
+
+    def test_cards_leave_bodies_unread(self):
+        category = BlogCategory.objects.create(name='Stories', slug='stories')
+        BlogPost.objects.create(title='Post', slug='post', category=category, content='Long text ' * 1000)
+        post = BlogPost.objects.for_cards().get()
+        self.assertTrue({'content', 'content_ur', 'author_id'} <= post.get_deferred_fields())
+        with self.assertNumQueries(0):
+            self.assertEqual(str(post.category), 'Stories')
+
+
+class LocalizedFieldTests(TestCase):
+    """Loading only the active language's text"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = BlogCategory.objects.create(name='Stories', name_ur='کہانیاں', slug='stories')
+        BlogPost.objects.create(
+            title='Shop opens', title_ur='دکان کھل گئی', slug='shop', category=cls.category,
+            content='<p>English body</p>', content_ur='<p>اردو متن</p>', is_published=True,
+        )
+        BlogPost.objects.create(title='Untranslated', slug='untranslated', content='<p>Only English</p>')
+
+    def test_urdu_queries_read_one_resolved_column(self):
+        with translation.override('ur'):
+            posts = {post.slug: post for post in BlogPost.objects.localized()}
+        shop = posts['shop']
+        self.assertTrue({'title', 'title_ur', 'content_rendered', 'content_ur_rendered'} <= shop.get_deferred_fields())
+        with self.assertNumQueries(0):
+            self.assertEqual(shop.localized_title, 'دکان کھل گئی')
+            self.assertEqual(shop.localized_content, '<p>اردو متن</p>')
+            # Blank Urdu columns fall back to English
+            self.assertEqual(posts['untranslated'].localized_content, '<p>Only English</p>')
+
+    def test_english_queries_leave_urdu_unread(self):
+        with translation.override('en'):
+            shop = BlogPost.objects.localized().get(slug='shop')
+            self.assertEqual(shop.localized_title, 'Shop opens')
+        self.assertTrue({'title_ur', 'excerpt_ur', 'content_ur_rendered'} <= shop.get_deferred_fields())
+        self.assertNotIn('title', shop.get_deferred_fields())
+
+    def test_fully_loaded_instances_follow_the_active_language(self):
+        post = BlogPost.objects.get(slug='shop')
+        with translation.override('ur'):
+            self.assertEqual(post.localized_title, 'دکان کھل گئی')
+            self.assertEqual(self.category.localized_name, 'کہانیاں')
+        self.assertEqual(post.localized_title, 'Shop opens')
+
+
+class BlogSearchTests(TestCase):
+    """Full-text search index"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.title_match = BlogPost.objects.create(
+            title='Tailoring shop opens', slug='tailoring', content='<p>A new shop.</p>', is_published=True
+        )
+        cls.body_match = BlogPost.objects.create(
+            title='Monthly update', slug='update', is_published=True,
+            content='<p>Three families started <b>tailoring</b> work &amp; one a bakery.</p>',
+            content_ur='<p>تین خاندانوں نے سلائی کا کام شروع کیا</p>',
+        )
+
+    def search(self, query):
+        posts, snippets = search_posts(BlogPost.objects.all(), query)
+        return list(posts), snippets
+
+    def test_ranked_bilingual_results_with_snippets(self):
+        posts, snippets = self.search('tailor')
+        self.assertEqual(posts, [self.title_match, self.body_match])
+        self.assertIn('<mark>tailoring</mark> work &amp; one', snippets[self.body_match.pk])
+        self.assertEqual(self.search('سلائی')[0], [self.body_match])
+        self.assertEqual(self.search('"<script>" OR'), ([], {}))
+
+    def test_index_follows_saves_and_deletes(self):
+        self.body_match.content = '<p>A bakery opened.</p>'
+        self.body_match.save()
+        self.assertEqual(self.search('bakery')[0], [self.body_match])
+        self.title_match.delete()
+        self.assertEqual(self.search('shop'), ([], {}))
+
+    def test_admin_search_uses_index(self):
+        admin_user = CustomUser.objects.create_superuser('admin', 'admin@example.com', 'admin123')
+        self.client.force_login(admin_user)
+        response = self.client.get(reverse('admin:blog_blogpost_changelist'), {'q': 'bakery'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.body_match])
+
+
+class RelatedPostTests(TestCase):
+    """Precomputed related posts"""
+
+    @classmethod
+    def setUpTestData(cls):
+        texts = {
+            'tailoring': ('Tailoring shop opens', '<p>Sewing machines for the tailoring shop.</p>', True),
+            'sewing': ('Sewing classes', '<p>Women learn tailoring on sewing machines.</p>', True),
+            'bakery': ('Bakery opens', '<p>Fresh bread from a new oven.</p>', True),
+            'bread': ('Bread for the bazaar', '<p>The bakery oven bakes bread daily.</p>', True),
+            'draft': ('Tailoring draft', '<p>Sewing machines and tailoring.</p>', False),
+        }
+        cls.posts = {
+            slug: BlogPost.objects.create(title=title, slug=slug, content=content, is_published=published)
+            for slug, (title, content, published) in texts.items()
+        }
+
+    def related(self, slug):
+        return list(
+            RelatedPost.objects.filter(source=self.posts[slug]).values_list('target__slug', flat=True)
+        )
+
+    def test_rebuild_ranks_similar_published_posts(self):
+        self.assertEqual(related_posts.rebuild(), 4)
+        self.assertEqual(self.related('tailoring')[0], 'sewing')
+        self.assertEqual(self.related('bakery')[0], 'bread')
+        self.assertFalse(RelatedPost.objects.filter(target=self.posts['draft']).exists())
+
+    def test_changes_refresh_affected_lists(self):
+        related_posts.rebuild()
+        with self.captureOnCommitCallbacks(execute=True):
+            draft = self.posts['draft']
+            draft.is_published = True
+            draft.save(update_fields=['is_published'])
+        call_command('run_worker', '--burst', stdout=io.StringIO())
+        self.assertIn('draft', self.related('tailoring'))
+        self.assertEqual(self.related('draft')[0], 'tailoring')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.posts['bread'].delete()
+            self.posts['sewing'].save()
+        # Every list to refill, and the edited post, in one job
+        self.assertEqual(Job.objects.filter(status=Job.PENDING).count(), 1)
+        call_command('run_worker', '--burst', stdout=io.StringIO())
+        self.assertNotIn('bread', self.related('bakery'))
+
+    def test_detail_page_reads_recommendations_in_one_query(self):
+        related_posts.rebuild()
+        view = BlogDetailView()
+        view.setup(RequestFactory().get('/'), slug='tailoring')
+        view.object = self.posts['tailoring']
+        with self.assertNumQueries(1):
+            context = async_to_sync(view.aget_context_data)(object=view.object)
+        self.assertEqual(context['related_posts'][0].slug, 'sewing')
+
+
+class FeedTests(TestCase):
+    """Cached RSS/Atom feeds"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = BlogCategory.objects.create(name='Stories', name_ur='کہانیاں', slug='stories')
+        BlogPost.objects.create(
+            title='First shop', title_ur='پہلی دکان', slug='first-shop', category=cls.category,
+            content='Text', is_published=True, published_date=timezone.now(),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_feed_is_cached_and_answers_conditional_requests(self):
+        url = reverse('blog:blog_feed')
+        response = self.client.get(url)
+        self.assertContains(response, 'First shop')
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(not_modified.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            BlogPost.objects.create(
+                title='Second shop', slug='second-shop', content='Text', is_published=True,
+                published_date=timezone.now(),
+            )
+            # Not expired before the commit: it would be rebuilt from the old rows
+            self.assertEqual(self.client.get(url).content, cached.content)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertContains(response, 'Second shop')
+
+    def test_unknown_query_parameters_are_not_cached(self):
+        url = reverse('blog:blog_feed')
+        self.client.get(url)
+        with mock.patch.object(cache, 'set') as cache_set:
+            response = self.client.get(url, {'x': 'random'})
+        self.assertContains(response, 'First shop')
+        cache_set.assert_not_called()
+
+    def test_changes_announced_by_another_process_reach_the_feed(self):
+        url = reverse('blog:blog_feed')
+        self.client.get(url)
+        BlogPost.objects.filter(slug='first-shop').update(title='First tailor')
+        run_in_new_process("from core.feeds import touch_feeds; touch_feeds('blog')")
+        self.assertContains(self.client.get(url), 'First tailor')
+
+    def test_category_and_urdu_feeds(self):
+        with translation.override('ur'):
+            response = self.client.get(reverse('blog:category_atom_feed', kwargs={'slug': 'stories'}))
+        self.assertContains(response, 'پہلی دکان')
+        self.assertContains(response, 'کہانیاں')
+        self.assertEqual(self.client.get(reverse('blog:category_feed', kwargs={'slug': 'missing'})).status_code, 404)
@@ -1,9 +1,19 @@
 from django.urls import path
-from . import views
+from core.feeds import cached_feed
+from . import feeds, views
 
 app_name = 'blog'
 
 urlpatterns = [
     path('', views.BlogListView.as_view(), name='blog_list'),
+    path('search/', views.BlogSearchView.as_view(), name='blog_search'),
+    path('feed/', cached_feed(feeds.LatestPostsFeed(), 'blog'), name='blog_feed'),
+    path('feed/atom/', cached_feed(feeds.LatestPostsAtomFeed(), 'blog'), name='blog_atom_feed'),
+    path('category/<slug:slug>/feed/', cached_feed(feeds.CategoryPostsFeed(), 'blog'), name='category_feed'),
+    path(
+        'category/<slug:slug>/feed/atom/',
+        cached_feed(feeds.CategoryPostsAtomFeed(), 'blog'),
+        name='category_atom_feed'
+    ),
     path('<slug:slug>/', views.BlogDetailView.as_view(), name='blog_detail'),
 ]
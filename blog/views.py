@@ -1,29 +1,77 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
-from django.views.generic import ListView, DetailView
+from django.views.generic import ListView
+from core.asyncviews import AsyncDetailView, AsyncListView, alist
+from .counters import view_counter
 from .models import BlogPost
+from .search import search_posts
 
 
-class BlogListView(ListView):
+class BlogListView(AsyncListView):
     """List all published blog posts"""
     model = BlogPost
     template_name = 'blog/blog_list.html'
     context_object_name = 'posts'
     paginate_by = 10
+    page_cache_tags = ('blog', 'pages')
+    # Count, page with categories, navigation links
+    query_budget = 3
 
     def get_queryset(self):
-        return BlogPost.objects.filter(is_published=True).order_by('-published_date')
+        return BlogPost.objects.filter(is_published=True).for_cards().localized().order_by('-published_date')
 
 
-class BlogDetailView(DetailView):
+class BlogSearchView(ListView):
+    """Full-text search over published posts, best match first"""
+    model = BlogPost
+    template_name = 'blog/blog_search.html'
+    context_object_name = 'posts'
+    paginate_by = 10
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        posts, self.snippets = search_posts(
+            BlogPost.objects.filter(is_published=True).for_cards().localized(), self.query
+        )
+        return posts
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        for post in context['posts']:
+            post.search_snippet = self.snippets.get(post.pk)
+        context['query'] = self.query
+        return context
+
+
+class BlogDetailView(AsyncDetailView):
     """Blog post detail page"""
     model = BlogPost
     template_name = 'blog/blog_detail.html'
     context_object_name = 'post'
+    page_cache_tags = ('blog', 'pages')
+    # Post, its category, related posts, navigation links
+    query_budget = 4
+
+    @staticmethod
+    def page_cache_hit(request, pk):
+        # Views of cached pages count too
+        view_counter.record(pk)
 
     def get_queryset(self):
-        return BlogPost.objects.filter(is_published=True)
+        # The page shows the pre-rendered HTML, never the editor source
+        return BlogPost.objects.filter(is_published=True).defer('content', 'content_ur').localized()
 
-    def get_object(self, queryset=None):
-        obj = super().get_object(queryset)
-        obj.increment_views()
+    async def aget_object(self, queryset=None):
+        obj = await super().aget_object(queryset)
+        # Buffered, but now and then the buffer is written out
+        await sync_to_async(obj.increment_views)()
+        self.request.page_cache_data = obj.pk
         return obj
+
+    async def aget_context_data(self, **kwargs):
+        context = self.get_context_data(**kwargs)
+        # Precomputed by blog.related; one query on the (source, rank) index
+        context['related_posts'] = await alist(BlogPost.objects.filter(
+            related_from__source=self.object, is_published=True
+        ).for_cards().localized().order_by('related_from__rank'))
+        return context
@@ -37,6 +37,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.sitemaps",
     # Third-party apps
     "crispy_forms",
     "crispy_bootstrap5",
@@ -48,16 +49,20 @@ INSTALLED_APPS = [
     "projects",
     "blog",
     "pages",
+    "jobs",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.QueryInstrumentationMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",  # For i18n
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.CommunityDatabaseMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
+    "core.middleware.PageCacheMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
@@ -75,6 +80,7 @@ TEMPLATES = [
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
                 "django.template.context_processors.i18n",
+                "pages.context_processors.navigation_pages",
             ],
         },
     },
@@ -93,6 +99,33 @@ DATABASES = {
     }
 }
 
+# Optional per-community databases (see core/routers.py). To split the
+# International and Pakistani data, add the aliases to DATABASES, e.g.
+#   DATABASES["intl"] = {"ENGINE": "django.db.backends.sqlite3", "NAME": BASE_DIR / "intl.sqlite3"}
+#   DATABASES["pak"] = {"ENGINE": "django.db.backends.sqlite3", "NAME": BASE_DIR / "pak.sqlite3"}
+#   COMMUNITY_DATABASES = {"INTL": "intl", "PAK": "pak"}
+# and run `manage.py migrate --database=<alias>` for each of them. Each database
+# numbers its rows from its own pk range, taken from its position here: add new
+# databases at the end and never reorder them.
+COMMUNITY_DATABASES = {}
+
+DATABASE_ROUTERS = ["core.routers.CommunityRouter"]
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Shared by every process of the site: cached pages, feeds and sitemaps are
+# expired by changing version keys here (core.pagecache, core.feeds,
+# pages.navigation), which all processes must see. Point it at Redis or
+# Memcached when the site runs on more than one host.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "cache",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -141,6 +174,16 @@ STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_DIRS = [BASE_DIR / "static"]
 
+# Third-party CSS/JS/fonts are self-hosted under static/vendor (`manage.py vendor_assets`);
+# collectstatic fingerprints every file and writes .gz/.br copies next to it
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "core.staticfiles.CompressedManifestStaticFilesStorage"},
+}
+# Serve STATIC_ROOT from Django (precompressed, fingerprinted names cached for a year)
+# when no web server in front of it does
+SERVE_STATIC = False
+
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
@@ -165,3 +208,85 @@ CKEDITOR_CONFIGS = {
 
 # Custom User Model
 AUTH_USER_MODEL = 'core.CustomUser'
+
+# Reporting currency for donor analytics and the rate from each donation currency
+BASE_CURRENCY = 'USD'
+EXCHANGE_RATES = {
+    'USD': '1',
+    'PKR': '0.0036',
+    'EUR': '1.08',
+    'GBP': '1.27',
+}
+
+# Donor lookup protection
+# Seconds before a process reloads its in-memory donor ID index
+DONOR_ID_INDEX_TTL = 300
+# IDs missing from the index are checked in the database at most this many times in a burst,
+# refilled per second, per process (donors created by other processes are found before the reload)
+DONOR_ID_FALLBACK_BURST = 20
+DONOR_ID_FALLBACK_RATE = 1.0
+# Per-IP token bucket: burst size and tokens refilled per second
+DONOR_LOOKUP_BURST = 10
+DONOR_LOOKUP_RATE = 0.2
+
+# Volunteer matching
+# Seconds before a process reloads its in-memory skill index
+VOLUNTEER_SKILL_INDEX_TTL = 300
+# Seconds a project's ranked volunteer shortlist stays cached
+VOLUNTEER_MATCH_CACHE_TIMEOUT = 3600
+
+# Blog view counting: buffered views are written every interval (seconds)
+# or once this many are pending in a process
+BLOG_VIEW_FLUSH_INTERVAL = 30
+BLOG_VIEW_FLUSH_THRESHOLD = 500
+# Also flush every interval from a thread in each process, whether or not requests come
+BLOG_VIEW_FLUSH_IN_BACKGROUND = True
+
+# Seconds a rendered RSS/Atom feed is kept; feeds are also re-rendered on every publish
+FEED_CACHE_TIMEOUT = 86400
+# Seconds a rendered sitemap section is kept; sections are also re-rendered when their content changes
+SITEMAP_CACHE_TIMEOUT = 86400
+
+# Seconds an anonymous visitor's page is kept; pages are also re-rendered when their content changes
+PAGE_CACHE_TIMEOUT = 600
+
+# Related posts/projects kept per item (rebuild with `manage.py build_related`)
+RELATED_CONTENT_COUNT = 4
+
+# Per-request query/template timings (Server-Timing header and core.instrumentation log);
+# off unless DEBUG, as every request pays for it. Budget overruns are logged as warnings.
+QUERY_INSTRUMENTATION = DEBUG
+# Raise instead of logging when a view exceeds its query_budget (always on under `manage.py test`)
+QUERY_BUDGET_ENFORCE = False
+TEST_RUNNER = "core.test_runner.QueryBudgetTestRunner"
+
+# Slow-query log (see core.slowqueries): off while None, otherwise statements taking at least
+# this many milliseconds are written with their view, caller and query plan (`manage.py slow_queries`)
+SLOW_QUERY_THRESHOLD_MS = None
+SLOW_QUERY_LOG = BASE_DIR / "logs" / "slow_queries.log"
+# Samples kept per statement: a burst of SLOW_QUERY_BURST, then one every SLOW_QUERY_SAMPLE_INTERVAL seconds
+SLOW_QUERY_BURST = 3
+SLOW_QUERY_SAMPLE_INTERVAL = 60
+
+# Background jobs (jobs app, run by `manage.py run_worker`): seconds an idle worker waits between polls
+JOBS_POLL_INTERVAL = 1.0
+# Seconds before a failed job's first retry, doubling per attempt up to JOBS_RETRY_MAX_DELAY
+JOBS_RETRY_DELAY = 10
+JOBS_RETRY_MAX_DELAY = 3600
+# Seconds a claimed job may run before it is assumed lost with its worker and queued again
+JOBS_LEASE = 600
+# Days finished jobs are kept (failed ones are kept until deleted)
+JOBS_KEEP_DAYS = 7
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        # Per-request lines are DEBUG records
+        "core.instrumentation": {"handlers": ["console"], "level": "DEBUG" if DEBUG else "INFO", "propagate": False},
+        "jobs": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
@@ -16,20 +16,34 @@ Including another URLconf
 """
 
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.conf.urls.i18n import i18n_patterns
 
+from blog.sitemaps import BlogPostSitemap
+from core.sitemaps import StaticViewSitemap, sitemap_urls
+from core.staticfiles import serve as serve_static
+from pages.sitemaps import PageSitemap
+from projects.sitemaps import ProjectSitemap
+
 # Customize admin site
 admin.site.site_header = "Bait ul Rizq Administration"
 admin.site.site_title = "Bait ul Rizq Admin"
 admin.site.index_title = "Welcome to Bait ul Rizq Management System"
 
+sitemaps = {
+    'static': StaticViewSitemap,
+    'projects': ProjectSitemap,
+    'blog': BlogPostSitemap,
+    'pages': PageSitemap,
+}
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path('ckeditor/', include('ckeditor_uploader.urls')),
     path('i18n/', include('django.conf.urls.i18n')),
+    *sitemap_urls(sitemaps),
 ]
 
 # Add i18n patterns for language selection
@@ -41,6 +55,9 @@ urlpatterns += i18n_patterns(
     prefix_default_language=False
 )
 
+if settings.SERVE_STATIC:
+    urlpatterns += [re_path(rf'^{settings.STATIC_URL.strip("/")}/(?P<path>.+)$', serve_static)]
+
 # Serve media files in development
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,7 +1,11 @@
-from django.contrib import admin
+from django.conf import settings
+from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
-from .models import Community, CustomUser, Donor, Volunteer
+from .dedup import merge_donors
+from .scoping import CommunityScopedAdminMixin
+from .models import Community, CustomUser, Donor, DonorStats, Volunteer
 
 
 @admin.register(Community)
@@ -23,7 +27,7 @@ class CommunityAdmin(admin.ModelAdmin):
 
 
 @admin.register(CustomUser)
-class CustomUserAdmin(UserAdmin):
+class CustomUserAdmin(CommunityScopedAdminMixin, UserAdmin):
     list_display = ['username', 'email', 'first_name', 'last_name', 'role', 'community', 'is_staff']
     list_filter = ['role', 'community', 'is_staff', 'is_superuser', 'is_active']
     search_fields = ['username', 'first_name', 'last_name', 'email']
@@ -40,23 +44,59 @@ class CustomUserAdmin(UserAdmin):
         }),
     )
 
-    def get_queryset(self, request):
-        """Restrict queryset based on user role"""
-        qs = super().get_queryset(request)
-        if request.user.is_superuser or request.user.role == 'DIRECTOR':
-            return qs
-        # Managers only see their community
-        if request.user.community:
-            return qs.filter(community=request.user.community)
-        return qs.none()
+
+class CohortFilter(admin.SimpleListFilter):
+    """Filter donors by the month of their first donation"""
+    title = _("cohort")
+    parameter_name = 'cohort'
+
+    def lookups(self, request, model_admin):
+        months = DonorStats.objects.exclude(cohort_month=None).dates('cohort_month', 'month', order='DESC')
+        return [(month.isoformat(), month.strftime('%B %Y')) for month in months]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(stats__cohort_month=self.value())
+        return queryset
+
+
+class FrequencyFilter(admin.SimpleListFilter):
+    """Filter donors by how often they have given"""
+    title = _("donation frequency")
+    parameter_name = 'frequency'
+
+    BUCKETS = {
+        # Donors who never gave may have no stats row at all
+        'none': Q(stats__isnull=True) | Q(stats__donation_count=0),
+        'once': Q(stats__donation_count=1),
+        'repeat': Q(stats__donation_count__range=(2, 5)),
+        'loyal': Q(stats__donation_count__gte=6),
+    }
+
+    def lookups(self, request, model_admin):
+        return [
+            ('none', _("No donations")),
+            ('once', _("One donation")),
+            ('repeat', _("2-5 donations")),
+            ('loyal', _("6 or more donations")),
+        ]
+
+    def queryset(self, request, queryset):
+        if self.value() in self.BUCKETS:
+            return queryset.filter(self.BUCKETS[self.value()])
+        return queryset
 
 
 @admin.register(Donor)
-class DonorAdmin(admin.ModelAdmin):
-    list_display = ['donor_id', 'name', 'email', 'phone', 'community', 'total_donated', 'is_anonymous', 'created_at']
-    list_filter = ['community', 'is_anonymous', 'created_at']
+class DonorAdmin(CommunityScopedAdminMixin, admin.ModelAdmin):
+    list_display = ['donor_id', 'name', 'email', 'phone', 'community', 'lifetime_total',
+                    'donation_count', 'last_donation_date', 'cohort_month', 'is_anonymous', 'created_at']
+    list_filter = ['community', 'is_anonymous', ('stats__last_donation_date', admin.DateFieldListFilter),
+                   FrequencyFilter, CohortFilter, 'created_at']
+    list_select_related = ['community', 'stats']
     search_fields = ['donor_id', 'name', 'email', 'phone']
     readonly_fields = ['donor_id', 'created_at', 'updated_at', 'total_donated']
+    actions = ['merge_selected_donors']
 
     fieldsets = (
         (_('Donor ID'), {
@@ -80,24 +120,55 @@ class DonorAdmin(admin.ModelAdmin):
         }),
     )
 
-    def get_queryset(self, request):
-        """Restrict queryset based on user role"""
-        qs = super().get_queryset(request)
-        if request.user.is_superuser or request.user.role == 'DIRECTOR':
-            return qs
-        # Managers only see their community
-        if request.user.community:
-            return qs.filter(community=request.user.community)
-        return qs.none()
-
     def total_donated(self, obj):
         """Display total donated amount"""
         return f"${obj.total_donated():,.2f}"
     total_donated.short_description = _("Total Donated")
 
+    @admin.display(description=_("Lifetime Total"), ordering='stats__lifetime_total')
+    def lifetime_total(self, obj):
+        """Display precomputed lifetime total in the base currency"""
+        stats = getattr(obj, 'stats', None)
+        return f"{stats.lifetime_total if stats else 0:,.2f} {settings.BASE_CURRENCY}"
+
+    @admin.display(description=_("Donations"), ordering='stats__donation_count')
+    def donation_count(self, obj):
+        stats = getattr(obj, 'stats', None)
+        return stats.donation_count if stats else 0
+
+    @admin.display(description=_("Last Donation"), ordering='stats__last_donation_date')
+    def last_donation_date(self, obj):
+        stats = getattr(obj, 'stats', None)
+        return stats.last_donation_date if stats else None
+
+    @admin.display(description=_("Cohort"), ordering='stats__cohort_month')
+    def cohort_month(self, obj):
+        stats = getattr(obj, 'stats', None)
+        return stats.cohort_month.strftime('%Y-%m') if stats and stats.cohort_month else None
+
+    @admin.action(description=_("Merge selected donors"), permissions=['change', 'delete'])
+    def merge_selected_donors(self, request, queryset):
+        """Merge duplicates into the oldest selected donor, keeping its donor ID"""
+        donors = list(queryset.order_by('created_at', 'pk'))
+        if len(donors) < 2:
+            self.message_user(request, _("Select at least two donors to merge."), messages.WARNING)
+            return
+        if len({donor.community_id for donor in donors}) > 1:
+            self.message_user(request, _("Donors from different communities cannot be merged."), messages.ERROR)
+            return
+        survivor, duplicates = donors[0], donors[1:]
+        moved = merge_donors(survivor, duplicates)
+        self.message_user(
+            request,
+            _("Merged %(count)d donors into %(donor)s and moved %(moved)d donations.") % {
+                'count': len(duplicates), 'donor': survivor, 'moved': moved
+            },
+            messages.SUCCESS
+        )
+
 
 @admin.register(Volunteer)
-class VolunteerAdmin(admin.ModelAdmin):
+class VolunteerAdmin(CommunityScopedAdminMixin, admin.ModelAdmin):
     list_display = ['name', 'email', 'phone', 'community', 'is_approved', 'created_at']
     list_filter = ['community', 'is_approved', 'created_at']
     search_fields = ['name', 'email', 'phone']
@@ -119,13 +190,3 @@ class VolunteerAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
-
-    def get_queryset(self, request):
-        """Restrict queryset based on user role"""
-        qs = super().get_queryset(request)
-        if request.user.is_superuser or request.user.role == 'DIRECTOR':
-            return qs
-        # Managers only see their community
-        if request.user.community:
-            return qs.filter(community=request.user.community)
-        return qs.none()
@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
+        from .slowqueries import install
+
+        if getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', None) is not None:
+            connection_created.connect(install, dispatch_uid='core.slowqueries')
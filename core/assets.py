@@ -0,0 +1,96 @@
+"""Third-party front-end assets served from our own static files.
+
+``VENDOR_ASSETS`` maps the names templates use (``{% vendor_static 'bootstrap_css' %}``)
+to a path under ``static/vendor/`` and the CDN URL it is downloaded from by
+``manage.py vendor_assets``. Until an asset has been vendored, templates
+keep linking the CDN copy.
+"""
+import re
+from functools import lru_cache
+from urllib.parse import urljoin, urlsplit
+from urllib.request import Request, urlopen
+
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+
+
+VENDOR_DIR = 'vendor'
+
+VENDOR_ASSETS = {
+    'bootstrap_css': (
+        'vendor/bootstrap/bootstrap.min.css',
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    ),
+    'bootstrap_js': (
+        'vendor/bootstrap/bootstrap.bundle.min.js',
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+    ),
+    'bootstrap_icons_css': (
+        'vendor/bootstrap-icons/bootstrap-icons.css',
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.10.0/font/bootstrap-icons.css',
+    ),
+    'fonts_css': (
+        'vendor/fonts/fonts.css',
+        'https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700'
+        '&family=Noto+Nastaliq+Urdu:wght@400;500;600;700&display=swap',
+    ),
+    'aos_css': ('vendor/aos/aos.css', 'https://unpkg.com/aos@2.3.1/dist/aos.css'),
+    'aos_js': ('vendor/aos/aos.js', 'https://unpkg.com/aos@2.3.1/dist/aos.js'),
+}
+
+# Font files whose glyphs are subset to the text the site actually shows
+SUBSET_FONT_PATTERN = re.compile(r'notonastaliqurdu', re.I)
+
+# Google Fonts picks the font format from the User-Agent; this one gets WOFF2
+_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/120.0 Safari/537.36'
+)
+
+_CSS_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+_SOURCE_MAP = re.compile(r'\n?/[*/]# sourceMappingURL=[^\n]*')
+
+
+@lru_cache(maxsize=None)
+def vendor_url(name):
+    """Static URL of a vendored asset, or its CDN URL while it has not been vendored"""
+    path, cdn_url = VENDOR_ASSETS[name]
+    return static(path) if finders.find(path) else cdn_url
+
+
+def download(url):
+    """Body of ``url``"""
+    with urlopen(Request(url, headers={'User-Agent': _USER_AGENT}), timeout=60) as response:
+        return response.read()
+
+
+def strip_source_maps(text):
+    """Drop sourceMappingURL comments (the maps are not vendored)"""
+    return _SOURCE_MAP.sub('', text)
+
+
+def localize_css(css, css_url, css_path):
+    """Rewrite a stylesheet's ``url()``s to files next to it.
+
+    Returns the rewritten CSS and ``{local static path: remote URL}`` of the
+    files it now refers to. Query strings (cache busters) are dropped; file
+    names are fingerprinted by the static files storage instead.
+    """
+    directory = css_path.rsplit('/', 1)[0]
+    files = {}
+
+    def rewrite(match):
+        target = match.group(2)
+        if target.startswith('data:'):
+            return match.group(0)
+        remote = urljoin(css_url, target)
+        parts = [part for part in urlsplit(remote).path.split('/') if part]
+        # Same-host files keep their place relative to the stylesheet; others go in a flat folder
+        if urlsplit(remote).netloc == urlsplit(css_url).netloc and not target.startswith(('http:', 'https:', '//')):
+            relative = urlsplit(target).path.lstrip('./')
+        else:
+            relative = 'files/' + '-'.join(parts[-3:])
+        files[f'{directory}/{relative}'] = remote
+        return f'url("{relative}")'
+
+    return _CSS_URL.sub(rewrite, css), files
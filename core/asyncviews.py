@@ -0,0 +1,104 @@
+"""Async versions of the generic list and detail views.
+
+Under ASGI (config/asgi.py) an async view runs on the event loop instead
+of holding a worker thread for the whole request. ``AsyncListView`` and
+``AsyncDetailView`` keep the generic views' attributes, context and
+templates, but load their data in ``get`` with the async ORM: subclasses
+put their queries in ``aget_object_list`` / ``aget_object`` /
+``aget_context_data`` and hand ``get_context_data`` objects that are
+already loaded. Templates still render in a thread, so anything they load
+lazily works, but it runs one query at a time there.
+
+Independent queries are awaited together with ``asyncio.gather``. The
+async ORM runs statements in the request's database thread, so they
+still reach one connection in turn; what they stop doing is tying up a
+thread while the database works. The custom middleware in
+core.middleware is async-capable for the same reason: a single sync
+middleware would put the whole request back on a thread.
+
+Under WSGI (and the test client) Django runs these views to completion
+in the request's thread, with the same queries.
+"""
+from django.http import Http404
+from django.utils.translation import gettext as _
+from django.views.generic import DetailView, ListView
+
+
+async def alist(queryset):
+    """Evaluate a queryset (with its prefetches) without blocking the event loop"""
+    return [obj async for obj in queryset]
+
+
+class AsyncListView(ListView):
+    """ListView whose page is counted and loaded with the async ORM"""
+
+    async def aget_object_list(self):
+        """The objects to paginate: a queryset (or core.routers.FannedOutQuerySet), or a list already loaded"""
+        return self.get_queryset()
+
+    async def get(self, request, *args, **kwargs):
+        self.object_list = await self.aget_object_list()
+        page_size = self.get_paginate_by(self.object_list)
+        if page_size:
+            if hasattr(self.object_list, 'acount'):
+                self._count = await self.object_list.acount()
+            # No query: the count is known and the page is a sliced queryset
+            self._page = super().paginate_queryset(self.object_list, page_size)
+            paginator, page, objects, is_paginated = self._page
+            if hasattr(objects, '__aiter__'):
+                page.object_list = await alist(objects)
+                self._page = (paginator, page, page.object_list, is_paginated)
+            empty = not paginator.count
+        else:
+            if hasattr(self.object_list, '__aiter__'):
+                self.object_list = await alist(self.object_list)
+            empty = not self.object_list
+        if empty and not self.get_allow_empty():
+            raise Http404(_('Empty list and “%(class_name)s.allow_empty” is False.') % {
+                'class_name': self.__class__.__name__,
+            })
+        return self.render_to_response(self.get_context_data())
+
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        paginator = super().get_paginator(queryset, per_page, orphans, allow_empty_first_page, **kwargs)
+        if hasattr(self, '_count'):
+            paginator.count = self._count
+        return paginator
+
+    def paginate_queryset(self, queryset, page_size):
+        # Loaded by get()
+        return self._page
+
+
+class AsyncDetailView(DetailView):
+    """DetailView whose object and extra context are loaded with the async ORM"""
+
+    async def aget_object(self, queryset=None):
+        """``get_object`` with the async ORM"""
+        if queryset is None:
+            queryset = self.get_queryset()
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        slug = self.kwargs.get(self.slug_url_kwarg)
+        if pk is not None:
+            queryset = queryset.filter(pk=pk)
+        if slug is not None and (pk is None or self.query_pk_and_slug):
+            queryset = queryset.filter(**{self.get_slug_field(): slug})
+        if pk is None and slug is None:
+            raise AttributeError(
+                f'Generic detail view {self.__class__.__name__} must be called with either an object pk or a slug '
+                f'in the URLconf.'
+            )
+        try:
+            return await queryset.aget()
+        except queryset.model.DoesNotExist:
+            raise Http404(_('No %(verbose_name)s found matching the query') % {
+                'verbose_name': queryset.model._meta.verbose_name,
+            })
+
+    async def aget_context_data(self, **kwargs):
+        """``get_context_data`` plus whatever else the page loads"""
+        return self.get_context_data(**kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return self.render_to_response(await self.aget_context_data(object=self.object))
@@ -0,0 +1,134 @@
+"""End-to-end benchmarks of public pages and admin changelists.
+
+Each scenario is one request driven through the Django test client against
+a generated dataset (see ``manage.py benchmark``). For every scenario the
+harness records latency percentiles over repeated requests, the queries
+one request runs and the peak memory Python allocates while serving it.
+
+Results are plain JSON. ``compare`` checks them against a committed
+baseline: a scenario that starts failing or runs any extra query is a
+regression, latency and memory only once they exceed the baseline by more
+than a tolerance.
+"""
+import statistics
+import time
+import tracemalloc
+from contextlib import ExitStack
+
+from django.db import connections
+from django.urls import reverse
+
+from .instrumentation import QueryRecorder
+from .lookup import lookup_throttle
+
+# Latency differences below this many milliseconds are noise, whatever the ratio
+LATENCY_FLOOR_MS = 1.0
+
+
+class Scenario:
+    """A named request; ``url`` is called with the dataset's fixtures"""
+
+    def __init__(self, name, url, method='get', data=None, admin=False):
+        self.name = name
+        self.url = url
+        self.method = method
+        self.data = data
+        self.admin = admin
+
+
+SCENARIOS = [
+    Scenario('home', lambda fixtures: reverse('core:home')),
+    Scenario('project_list', lambda fixtures: reverse('projects:project_list')),
+    Scenario('project_list_last_page', lambda fixtures: reverse('projects:project_list') + '?page=last'),
+    Scenario('project_detail', lambda fixtures: reverse('projects:project_detail', args=[fixtures['project']])),
+    Scenario('donor_lookup', lambda fixtures: reverse('core:donor_lookup')),
+    Scenario(
+        'donor_detail',
+        lambda fixtures: reverse('core:donor_detail', kwargs={'donor_id': fixtures['donor_id']})
+    ),
+    Scenario('blog_list', lambda fixtures: reverse('blog:blog_list')),
+    Scenario('blog_detail', lambda fixtures: reverse('blog:blog_detail', args=[fixtures['post']])),
+    Scenario('admin_donations', lambda fixtures: reverse('admin:donations_donation_changelist'), admin=True),
+    Scenario('admin_donors', lambda fixtures: reverse('admin:core_donor_changelist'), admin=True),
+    Scenario('admin_projects', lambda fixtures: reverse('admin:projects_project_changelist'), admin=True),
+    Scenario('admin_allocations', lambda fixtures: reverse('admin:donations_donationallocation_changelist'), admin=True),
+]
+
+
+def percentile(samples, fraction):
+    """Value below which ``fraction`` of the samples fall (linear interpolation)"""
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _request(client, scenario, url):
+    # The lookup throttle would start refusing a benchmark's repeated requests
+    lookup_throttle.reset()
+    response = getattr(client, scenario.method)(url, scenario.data)
+    if response.status_code != 200:
+        raise AssertionError(f'{url} answered {response.status_code}')
+    return response
+
+
+def run_scenario(client, scenario, fixtures, iterations, warmup=2):
+    """Measure one scenario; returns its result dict"""
+    url = scenario.url(fixtures)
+    for _ in range(warmup):
+        _request(client, scenario, url)
+
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        _request(client, scenario, url)
+
+    tracemalloc.start()
+    try:
+        _request(client, scenario, url)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        _request(client, scenario, url)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'url': url,
+        'queries': recorder.count,
+        'duplicate_queries': sum(runs - 1 for runs in recorder.fingerprints.values()),
+        'p50_ms': round(percentile(samples, 0.5), 2),
+        'p90_ms': round(percentile(samples, 0.9), 2),
+        'p99_ms': round(percentile(samples, 0.99), 2),
+        'max_ms': round(max(samples), 2),
+        'mean_ms': round(statistics.fmean(samples), 2),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline, latency_tolerance=0.25, memory_tolerance=0.25, query_tolerance=0):
+    """Regressions of ``results`` against ``baseline``: ``[(scenario, metric, baseline, current)]``"""
+    regressions = []
+    for name, current in results['scenarios'].items():
+        before = baseline['scenarios'].get(name)
+        # New scenarios, and ones that already failed in the baseline, have nothing to compare
+        if not before or 'error' in before:
+            continue
+        if 'error' in current:
+            # A page that used to be served and now fails is the worst regression of all
+            regressions.append((name, 'error', 'ok', current['error']))
+            continue
+        if current['queries'] > before['queries'] + query_tolerance:
+            regressions.append((name, 'queries', before['queries'], current['queries']))
+        for metric in ('p50_ms', 'p90_ms'):
+            if (current[metric] > before[metric] * (1 + latency_tolerance)
+                    and current[metric] - before[metric] > LATENCY_FLOOR_MS):
+                regressions.append((name, metric, before[metric], current[metric]))
+        if current['peak_memory_kb'] > before['peak_memory_kb'] * (1 + memory_tolerance):
+            regressions.append((name, 'peak_memory_kb', before['peak_memory_kb'], current['peak_memory_kb']))
+    return regressions
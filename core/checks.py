@@ -0,0 +1,47 @@
+"""System checks for community databases (see core.routers)"""
+from django.core.checks import Error, Tags, Warning, register
+from django.db import DatabaseError, connections
+from django.db.models import Max, Min
+
+from .routers import community_databases, pk_range, routing_enabled, sequence_value, sequenced_models
+
+
+@register(Tags.database)
+def check_community_pk_ranges(app_configs, databases=None, **kwargs):
+    """Partitioned rows must keep to their database's pk range, or pks name two rows"""
+    if not routing_enabled() or not databases:
+        return []
+    messages = []
+    for alias in community_databases():
+        if alias not in databases:
+            continue
+        first, last = pk_range(alias)
+        connection = connections[alias]
+        try:
+            tables = set(connection.introspection.table_names())
+        except DatabaseError:
+            continue
+        for model in sequenced_models():
+            table = model._meta.db_table
+            if table not in tables:
+                continue
+            low, high = model._base_manager.using(alias).aggregate(low=Min('pk'), high=Max('pk')).values()
+            if low is not None and (low < first or high > last):
+                messages.append(Error(
+                    f"{model._meta.label} rows in database '{alias}' have primary keys {low} to {high}, "
+                    f"outside its range {first} to {last}.",
+                    hint='Each community database numbers its rows from its own range so a pk names one row; '
+                         'renumber these rows, and keep the order of COMMUNITY_DATABASES.',
+                    obj=model,
+                    id='core.E001',
+                ))
+                continue
+            value = sequence_value(connection, table, model._meta.pk.column)
+            if value is not None and value < first - 1:
+                messages.append(Warning(
+                    f"New {model._meta.label} rows in database '{alias}' would be numbered below its range.",
+                    hint=f'Run manage.py migrate --database={alias}.',
+                    obj=model,
+                    id='core.W001',
+                ))
+    return messages
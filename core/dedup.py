@@ -0,0 +1,189 @@
+"""Blocking keys, duplicate clustering and merging for donors"""
+import re
+import unicodedata
+
+from django.db import transaction
+
+
+SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'),
+    **dict.fromkeys('cgjkqsxz', '2'),
+    **dict.fromkeys('dt', '3'),
+    'l': '4',
+    **dict.fromkeys('mn', '5'),
+    'r': '6',
+}
+
+# Fields copied from a merged duplicate when the survivor leaves them blank
+MERGE_FILL_FIELDS = ['email', 'phone', 'address']
+
+
+def normalize_email(email):
+    """Lowercased, trimmed email address"""
+    return (email or '').strip().lower()
+
+
+def normalize_phone(phone):
+    """Digits of a phone number in national form, e.g. +92 300 1234567 -> 03001234567"""
+    digits = re.sub(r'\D', '', phone or '')
+    if digits.startswith('00'):
+        digits = digits[2:]
+    if digits.startswith('92') and len(digits) == 12:
+        digits = '0' + digits[2:]
+    # Too short to tell two people apart
+    return digits if len(digits) >= 7 else ''
+
+
+def soundex(word):
+    """American Soundex code of an ASCII word (empty if it has no letters)"""
+    letters = [c for c in word.lower() if 'a' <= c <= 'z']
+    if not letters:
+        return ''
+    code = letters[0].upper()
+    previous = SOUNDEX_CODES.get(letters[0], '')
+    for letter in letters[1:]:
+        digit = SOUNDEX_CODES.get(letter, '')
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w do not separate letters with the same code
+        if letter not in 'hw':
+            previous = digit
+    return code.ljust(4, '0')
+
+
+def name_key(name):
+    """Order-insensitive phonetic key of a full name.
+
+    Latin-script tokens are reduced to Soundex; other scripts (e.g. Urdu)
+    are kept as normalized text.
+    """
+    tokens = []
+    for token in unicodedata.normalize('NFKC', name or '').lower().split():
+        token = token.strip('.,-')
+        if not token:
+            continue
+        ascii_token = unicodedata.normalize('NFKD', token).encode('ascii', 'ignore').decode()
+        tokens.append(soundex(ascii_token) if ascii_token.isalpha() else token)
+    return ' '.join(sorted(tokens))[:200]
+
+
+def blocking_keys(name, email, phone):
+    """Return the (name_key, email_key, phone_key) triple for donor details"""
+    return name_key(name), normalize_email(email), normalize_phone(phone)
+
+
+def find_matching_donor(community, name='', email='', phone=''):
+    """Oldest donor of ``community`` sharing the normalized email, else the phone and name key.
+
+    A phone number alone is not enough: households and shops share one.
+    """
+    from .models import Donor
+    donors = Donor.objects.filter(community=community).order_by('created_at', 'pk')
+    email_key = normalize_email(email)
+    if email_key:
+        donor = donors.filter(email_key=email_key).first()
+        if donor:
+            return donor
+    phone_key, key = normalize_phone(phone), name_key(name)
+    if phone_key and key:
+        return donors.filter(phone_key=phone_key, name_key=key).first()
+    return None
+
+
+class _DisjointSet:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        root = self.parent.setdefault(item, item)
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while item != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            self.parent[max(first, second)] = min(first, second)
+
+
+def find_duplicate_clusters(queryset=None, keys=('email', 'phone')):
+    """Group donors sharing any of the given blocking keys.
+
+    Each key is streamed from the database sorted by its indexed column, so
+    only donors with a non-blank key are read and neighbours sharing a value
+    are adjacent; clusters are joined across keys with a disjoint set. Name
+    keys only match within a community. Returns a list of donor pk lists,
+    largest first.
+    """
+    from .models import Donor
+    if queryset is None:
+        queryset = Donor.objects.all()
+
+    columns = {
+        'email': ['email_key'],
+        'phone': ['phone_key'],
+        'name': ['community_id', 'name_key'],
+    }
+    clusters = _DisjointSet()
+    for key in keys:
+        fields = columns[key]
+        rows = (
+            queryset.exclude(**{fields[-1]: ''})
+            .order_by(*fields, 'pk')
+            .values_list(*fields, 'pk')
+            .iterator(chunk_size=5000)
+        )
+        previous_value, previous_pk = None, None
+        for *value, pk in rows:
+            if value == previous_value:
+                clusters.union(previous_pk, pk)
+            previous_value, previous_pk = value, pk
+
+    groups = {}
+    for pk in list(clusters.parent):
+        groups.setdefault(clusters.find(pk), []).append(pk)
+    return sorted(
+        (sorted(members) for members in groups.values() if len(members) > 1),
+        key=lambda members: (-len(members), members[0]),
+    )
+
+
+def merge_donors(survivor, duplicates):
+    """Fold duplicate donors into ``survivor``, which keeps its donor_id.
+
+    Donations are reassigned with a single UPDATE, blank contact fields are
+    filled from the duplicates and the duplicates are deleted. Returns the
+    number of donations moved.
+    """
+    from donations.models import Donation
+    from .models import Donor, DonorStats
+
+    duplicates = [donor for donor in duplicates if donor.pk != survivor.pk]
+    if not duplicates:
+        return 0
+    duplicate_pks = [donor.pk for donor in duplicates]
+    using = survivor._state.db
+
+    with transaction.atomic(using=using):
+        moved = Donation.objects.using(using).filter(donor_id__in=duplicate_pks).update(
+            donor=survivor, community_id=survivor.community_id
+        )
+
+        for field in MERGE_FILL_FIELDS:
+            if not getattr(survivor, field):
+                for donor in duplicates:
+                    if getattr(donor, field):
+                        setattr(survivor, field, getattr(donor, field))
+                        break
+        merged_ids = ', '.join(donor.donor_id for donor in duplicates)
+        survivor.notes = '\n'.join(filter(None, [survivor.notes, f"Merged donor IDs: {merged_ids}"]))
+        survivor.save()
+
+        Donor.objects.using(using).filter(pk__in=duplicate_pks).delete()
+        # Donations were moved with update(), which sends no signals
+        DonorStats.refresh_for(survivor.pk, using=using)
+    return moved
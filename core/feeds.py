@@ -0,0 +1,84 @@
+"""Cached syndication feed (and sitemap) responses.
+
+Each section of the site (``'blog'``, ``'projects'``, ``'pages'``) has a
+stamp in the cache: the time its content last changed. The cache is shared
+by every process (see CACHES), so a change saved in one process expires
+the feeds all of them serve. Responses are
+rendered once per stamp and URL (the URL carries the language prefix), and
+conditional requests are answered from the stamp alone, without touching
+the database.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils import timezone
+from django.views.decorators.http import condition
+
+
+def _stamp_key(section):
+    return f'feeds:{section}:stamp'
+
+
+def feed_stamp(section):
+    """When a section last changed (first use counts as a change)"""
+    stamp = cache.get(_stamp_key(section))
+    if stamp is None:
+        cache.add(_stamp_key(section), timezone.now(), None)
+        stamp = cache.get(_stamp_key(section))
+    return stamp
+
+
+def touch_feeds(section):
+    """Expire a section's cached feeds and sitemaps; call whenever its content is published or changed"""
+    cache.set(_stamp_key(section), timezone.now(), None)
+
+
+def cached_view(view, sections, timeout, params=()):
+    """Serve a view's responses from the cache until one of ``sections`` changes.
+
+    Responses are kept per absolute URL (language prefix included) and the
+    values of the query ``params`` the view reads, and answered with
+    ETag/Last-Modified taken from the stamps. Requests with any other
+    parameter are passed to the view uncached, so made-up query strings
+    cannot fill the cache.
+    """
+
+    def last_modified(request, *args, **kwargs):
+        # Whole seconds only (HTTP dates); the ETag tells changes within a second apart
+        return max((feed_stamp(section) for section in sections), default=None)
+
+    def etag(request, *args, **kwargs):
+        stamps = ':'.join(feed_stamp(section).isoformat() for section in sections)
+        values = ':'.join(request.GET.get(param, '') for param in params)
+        return hashlib.md5(f'{stamps}:{request.build_absolute_uri(request.path)}:{values}'.encode()).hexdigest()
+
+    @condition(etag_func=etag, last_modified_func=last_modified)
+    def conditional(request, *args, **kwargs):
+        key = f'cached-view:{etag(request)}'
+        entry = cache.get(key)
+        if entry is None:
+            response = view(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            if response.status_code != 200:
+                return response
+            # Validators are set from the stamps, not by the view
+            headers = {name: value for name, value in response.items() if name not in ('ETag', 'Last-Modified')}
+            entry = (response.content, headers)
+            cache.set(key, entry, timeout)
+        content, headers = entry
+        return HttpResponse(content, headers=headers)
+
+    def cached(request, *args, **kwargs):
+        if set(request.GET) - set(params):
+            return view(request, *args, **kwargs)
+        return conditional(request, *args, **kwargs)
+
+    return cached
+
+
+def cached_feed(feed, section):
+    """Wrap a Feed instance in a view serving it from the cache with ETag/Last-Modified"""
+    return cached_view(feed, [section], getattr(settings, 'FEED_CACHE_TIMEOUT', 86400))
@@ -0,0 +1,83 @@
+"""Per-request query counts, SQL time and template time.
+
+When QUERY_INSTRUMENTATION is set (by default only with DEBUG),
+``core.middleware.QueryInstrumentationMiddleware`` wraps every database
+connection with a ``QueryRecorder`` for the length of a request, then
+reports what it saw in a ``Server-Timing`` header (shown by browser dev
+tools) and one JSON DEBUG line on the ``core.instrumentation`` logger.
+
+Statements are grouped by fingerprint (the SQL with its literals and
+``IN`` lists collapsed): a fingerprint run many times in one request is
+usually an N+1 loop.
+
+Views may declare a ``query_budget``: the most queries the view and its
+template may run. Going over it is logged as a warning, and raises
+``QueryBudgetExceeded`` while QUERY_BUDGET_ENFORCE is set (as it is for
+the test suite, see core.test_runner). Views reading every community
+database (core.routers) also declare ``fan_out_queries``, the queries
+they repeat on each: the budget counts them once, for one database.
+"""
+import json
+import logging
+import re
+import time
+from collections import Counter
+
+logger = logging.getLogger('core.instrumentation')
+
+# Fingerprints repeated at least this often are reported
+DUPLICATE_THRESHOLD = 2
+
+_IN_LIST = re.compile(r'\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(Exception):
+    """A view ran more queries than its query_budget allows"""
+
+
+def fingerprint(sql):
+    """The shape of a statement, the same for every parameter value"""
+    sql = _LITERAL.sub('?', sql)
+    return _SPACE.sub(' ', _IN_LIST.sub('(...)', sql)).strip()
+
+
+class QueryRecorder:
+    """Execute wrapper counting and timing the statements it sees"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def duplicates(self, limit=5):
+        """``{fingerprint: runs}`` of the most repeated statements"""
+        return {
+            sql: runs for sql, runs in self.fingerprints.most_common(limit) if runs >= DUPLICATE_THRESHOLD
+        }
+
+
+def server_timing(metrics):
+    """``Server-Timing`` value for ``[(name, seconds, description), ...]``"""
+    entries = []
+    for name, seconds, description in metrics:
+        entry = f'{name};dur={seconds * 1000:.2f}'
+        if description:
+            entry += f';desc="{description}"'
+        entries.append(entry)
+    return ', '.join(entries)
+
+
+def log_request(record):
+    """Write one request's measurements as a JSON log line"""
+    logger.debug(json.dumps(record, ensure_ascii=False, sort_keys=True), extra={'instrumentation': record})
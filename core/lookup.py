@@ -0,0 +1,171 @@
+"""In-process guards for the public donor lookup pages"""
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+
+from django.conf import settings
+
+
+DONOR_ID_LENGTH = 9
+
+
+def is_well_formed_donor_id(donor_id):
+    """Check that a value looks like a 9-digit donor ID"""
+    return (
+        isinstance(donor_id, str)
+        and len(donor_id) == DONOR_ID_LENGTH
+        and donor_id.isascii()
+        and donor_id.isdigit()
+    )
+
+
+class DonorIdIndex:
+    """Sorted compact array of every valid donor ID, held per process.
+
+    IDs are fixed-width digit strings, so they are stored as unsigned ints
+    (4 bytes each) and probed with a binary search. The index is loaded on
+    the first lookup in each process. Donors created or deleted in this
+    process update it through signals; the whole index is reloaded after
+    ``ttl`` seconds to pick up writes made by other processes. Until then,
+    an ID missing from the index is looked up in the database (one indexed
+    query per community database) as long as ``fallback_throttle`` allows,
+    so a donor created by another process is found at once.
+    """
+
+    def __init__(self, ttl, fallback_throttle):
+        self.ttl = ttl
+        self.fallback_throttle = fallback_throttle
+        self._ids = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def load(self):
+        """(Re)build the index with a single query per community database"""
+        from .models import Donor
+        from .routers import fan_out
+        ids = array('I', sorted(
+            int(donor_id) for donor_id in fan_out(Donor.objects.values_list('donor_id', flat=True))
+        ))
+        with self._lock:
+            self._ids = ids
+            self._loaded_at = time.monotonic()
+
+    def clear(self):
+        """Drop the index so the next lookup reloads it"""
+        with self._lock:
+            self._ids = None
+
+    def _current(self):
+        if self._ids is None or time.monotonic() - self._loaded_at > self.ttl:
+            self.load()
+        return self._ids
+
+    @staticmethod
+    def _holds(ids, donor_id):
+        value = int(donor_id)
+        position = bisect_left(ids, value)
+        return position < len(ids) and ids[position] == value
+
+    def __contains__(self, donor_id):
+        if not is_well_formed_donor_id(donor_id):
+            return False
+        if self._holds(self._current(), donor_id):
+            return True
+        # Guessing IDs must not turn into a query per guess
+        if not self.fallback_throttle.allow('database') or not self._exists(donor_id):
+            return False
+        self.add(donor_id)
+        return True
+
+    def loaded_contains(self, donor_id):
+        """Whether the index as currently loaded holds ``donor_id``: never loads it or queries"""
+        ids = self._ids
+        return ids is not None and is_well_formed_donor_id(donor_id) and self._holds(ids, donor_id)
+
+    def _exists(self, donor_id):
+        from .models import Donor
+        from .routers import community_databases
+        return any(
+            Donor.objects.using(alias).filter(donor_id=donor_id).exists() for alias in community_databases()
+        )
+
+    def add(self, donor_id):
+        """Record a newly created donor ID"""
+        with self._lock:
+            if self._ids is None or not is_well_formed_donor_id(donor_id):
+                return
+            value = int(donor_id)
+            position = bisect_left(self._ids, value)
+            if position == len(self._ids) or self._ids[position] != value:
+                insort(self._ids, value)
+
+    def discard(self, donor_id):
+        """Forget a deleted donor ID"""
+        with self._lock:
+            if self._ids is None or not is_well_formed_donor_id(donor_id):
+                return
+            value = int(donor_id)
+            position = bisect_left(self._ids, value)
+            if position < len(self._ids) and self._ids[position] == value:
+                del self._ids[position]
+
+
+class TokenBucketThrottle:
+    """Per-client token bucket: ``capacity`` requests, refilled at ``rate`` per second"""
+
+    def __init__(self, capacity, rate, max_clients=10000):
+        self.capacity = capacity
+        self.rate = rate
+        self.max_clients = max_clients
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key):
+        """Take a token for ``key``; return False when the bucket is empty"""
+        now = time.monotonic()
+        with self._lock:
+            if len(self._buckets) >= self.max_clients:
+                self._prune(now)
+            tokens, updated = self._buckets.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return False
+            self._buckets[key] = (tokens - 1, now)
+            return True
+
+    def reset(self):
+        """Forget every client"""
+        with self._lock:
+            self._buckets.clear()
+
+    def _prune(self, now):
+        # Buckets idle long enough to be full again carry no state
+        refill_time = self.capacity / self.rate
+        self._buckets = {
+            key: (tokens, updated)
+            for key, (tokens, updated) in self._buckets.items()
+            if now - updated < refill_time
+        }
+        if len(self._buckets) >= self.max_clients:
+            self._buckets.clear()
+
+
+def client_ip(request):
+    """Address used to key the lookup throttle"""
+    return request.META.get('REMOTE_ADDR', '')
+
+
+donor_ids = DonorIdIndex(
+    ttl=getattr(settings, 'DONOR_ID_INDEX_TTL', 300),
+    fallback_throttle=TokenBucketThrottle(
+        capacity=getattr(settings, 'DONOR_ID_FALLBACK_BURST', 20),
+        rate=getattr(settings, 'DONOR_ID_FALLBACK_RATE', 1.0),
+    ),
+)
+
+lookup_throttle = TokenBucketThrottle(
+    capacity=getattr(settings, 'DONOR_LOOKUP_BURST', 10),
+    rate=getattr(settings, 'DONOR_LOOKUP_RATE', 0.2),
+)
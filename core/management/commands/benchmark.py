@@ -0,0 +1,181 @@
+"""Django management command to benchmark public pages and admin changelists"""
+import io
+import json
+import logging
+import platform
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.runner import DiscoverRunner
+
+from blog.models import BlogPost
+from core.benchmarks import SCENARIOS, compare, run_scenario
+from core.models import CustomUser, DonorStats
+from core.routers import fan_out
+from projects.models import Project
+
+
+BENCHMARK_DIR = Path(settings.BASE_DIR) / 'benchmarks'
+
+
+class Command(BaseCommand):
+    help = (
+        'Load a generated dataset into a throwaway test database, measure latency, queries and memory '
+        'of the public pages and admin changelists, and compare them with the committed baseline'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=20000, help='Donations in the generated dataset')
+        parser.add_argument('--seed', type=int, default=42, help='Seed of the generated dataset')
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per scenario')
+        parser.add_argument(
+            '--only',
+            nargs='+',
+            choices=[scenario.name for scenario in SCENARIOS],
+            help='Run just these scenarios'
+        )
+        parser.add_argument(
+            '--output',
+            default=str(BENCHMARK_DIR / 'latest.json'),
+            help='Where to write the results'
+        )
+        parser.add_argument(
+            '--baseline',
+            default=str(BENCHMARK_DIR / 'baseline.json'),
+            help='Results to compare against'
+        )
+        parser.add_argument(
+            '--update-baseline',
+            action='store_true',
+            help='Write the results over the baseline instead of comparing'
+        )
+        parser.add_argument(
+            '--latency-tolerance',
+            type=float,
+            default=0.25,
+            help='Allowed p50/p90 slowdown as a fraction of the baseline (default 0.25)'
+        )
+        parser.add_argument(
+            '--memory-tolerance',
+            type=float,
+            default=0.25,
+            help='Allowed peak memory growth as a fraction of the baseline (default 0.25)'
+        )
+        parser.add_argument(
+            '--query-tolerance',
+            type=int,
+            default=0,
+            help='Extra queries per request allowed before failing (default 0)'
+        )
+
+    def handle(self, *args, **options):
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        runner.setup_test_environment()
+        old_config = runner.setup_databases()
+        # Per-request log lines and budget warnings would drown the report
+        logging.getLogger('core.instrumentation').setLevel(logging.ERROR)
+        try:
+            self.stdout.write(f'Generating {options["scale"]:,} donations (seed {options["seed"]})...')
+            call_command('populate_dummy_data', scale=options['scale'], seed=options['seed'], stdout=io.StringIO())
+            # Every request renders its page; the page cache would only measure the cache
+            middleware = [name for name in settings.MIDDLEWARE if name != 'core.middleware.PageCacheMiddleware']
+            with override_settings(MIDDLEWARE=middleware):
+                results = self.run_scenarios(options)
+        finally:
+            runner.teardown_databases(old_config)
+            runner.teardown_test_environment()
+
+        self.report(results)
+        output = Path(options['output'])
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2, sort_keys=True) + '\n')
+        self.stdout.write(f'Results written to {output}')
+
+        baseline_path = Path(options['baseline'])
+        if options['update_baseline']:
+            baseline_path.write_text(json.dumps(results, indent=2, sort_keys=True) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Baseline updated: {baseline_path}'))
+            return
+        if not baseline_path.exists():
+            self.stdout.write(self.style.WARNING(f'No baseline at {baseline_path}; run with --update-baseline'))
+            return
+        self.check_baseline(results, json.loads(baseline_path.read_text()), options)
+
+    def fixtures(self):
+        """The heaviest pages of each kind: the most funded project, the most frequent donor"""
+        project = fan_out(
+            Project.objects.filter(is_public=True).annotate(allocation_count=Count('allocations'))
+            .order_by('-allocation_count', 'pk').values_list('pk', flat=True)[:1]
+        )
+        donor = fan_out(
+            DonorStats.objects.order_by('-donation_count', 'donor_id').values_list('donor__donor_id', flat=True)[:1]
+        )
+        post = BlogPost.objects.filter(is_published=True).order_by('pk').values_list('slug', flat=True)[:1]
+        return {'project': project[0], 'donor_id': donor[0], 'post': post[0]}
+
+    def run_scenarios(self, options):
+        fixtures = self.fixtures()
+        public = Client()
+        admin = Client()
+        admin.force_login(CustomUser.objects.create_superuser('benchmark', 'benchmark@example.com', 'benchmark'))
+
+        scenarios = {}
+        for scenario in SCENARIOS:
+            if options['only'] and scenario.name not in options['only']:
+                continue
+            self.stdout.write(f'  {scenario.name}...')
+            try:
+                scenarios[scenario.name] = run_scenario(
+                    admin if scenario.admin else public, scenario, fixtures, options['iterations']
+                )
+            except Exception as e:
+                # A page that cannot be served here (e.g. its template is missing) is reported, not fatal
+                scenarios[scenario.name] = {'error': f'{type(e).__name__}: {e}'}
+        return {
+            'meta': {
+                'scale': options['scale'],
+                'seed': options['seed'],
+                'iterations': options['iterations'],
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': settings.DATABASES['default']['ENGINE'].rsplit('.', 1)[-1],
+            },
+            'scenarios': scenarios,
+        }
+
+    def report(self, results):
+        self.stdout.write('')
+        self.stdout.write(f'{"scenario":<24}{"queries":>8}{"p50 ms":>10}{"p90 ms":>10}{"p99 ms":>10}{"peak KB":>10}')
+        for name, result in results['scenarios'].items():
+            if 'error' in result:
+                self.stdout.write(self.style.WARNING(f'{name:<24}{result["error"]}'))
+                continue
+            self.stdout.write(
+                f'{name:<24}{result["queries"]:>8}{result["p50_ms"]:>10}{result["p90_ms"]:>10}'
+                f'{result["p99_ms"]:>10}{result["peak_memory_kb"]:>10}'
+            )
+
+    def check_baseline(self, results, baseline, options):
+        for key in ('scale', 'seed'):
+            if baseline['meta'].get(key) != results['meta'][key]:
+                self.stdout.write(self.style.WARNING(
+                    f'Baseline was recorded with {key}={baseline["meta"].get(key)}; latency and memory may not compare'
+                ))
+        regressions = compare(
+            results,
+            baseline,
+            latency_tolerance=options['latency_tolerance'],
+            memory_tolerance=options['memory_tolerance'],
+            query_tolerance=options['query_tolerance'],
+        )
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS('No regressions against the baseline.'))
+            return
+        for name, metric, before, current in regressions:
+            self.stdout.write(self.style.ERROR(f'{name}: {metric} {before} -> {current}'))
+        raise CommandError(f'{len(regressions)} regression(s) against {options["baseline"]}')
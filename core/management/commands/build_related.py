@@ -0,0 +1,27 @@
+"""Django management command to rebuild related-post and related-project recommendations"""
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from blog.related import related_posts
+from core.routers import community_databases
+from projects.related import related_projects
+
+
+class Command(BaseCommand):
+    help = 'Recompute the TF-IDF neighbours shown as related posts and related projects'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only',
+            choices=['posts', 'projects'],
+            help='Rebuild just one of the two tables'
+        )
+
+    def handle(self, *args, **options):
+        if options['only'] != 'projects':
+            count = related_posts.rebuild(using=DEFAULT_DB_ALIAS)
+            self.stdout.write(f'Related posts computed for {count} posts.')
+        if options['only'] != 'posts':
+            count = sum(related_projects.rebuild(using=alias) for alias in community_databases())
+            self.stdout.write(f'Related projects computed for {count} projects.')
+        self.stdout.write(self.style.SUCCESS('Recommendations rebuilt.'))
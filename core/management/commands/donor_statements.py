@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+"""Django management command to generate annual giving statements for donors"""
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Count, Sum
+from django.template.loader import render_to_string
+from django.utils import timezone, translation
+
+from core.models import Donor
+from core.routers import community_databases, use_community_database
+from core.translation import TRANSLATION_LANGUAGE
+from donations.models import Donation, DonationAllocation
+
+
+def collect_statements(year):
+    """Build every donor's statement data for ``year`` in three grouped queries per database"""
+    statements = {}
+
+    donors = Donor.objects.filter(
+        pk__in=Donation.objects.filter(date_received__year=year).values('donor_id')
+    ).values(
+        'pk', 'donor_id', 'name', 'email', 'address', 'community__name'
+    ).order_by('donor_id')
+    for donor in donors.iterator(chunk_size=5000):
+        statements[donor['pk']] = {
+            'donor': donor,
+            'totals': [],
+            'projects': [],
+        }
+
+    totals = Donation.objects.filter(
+        date_received__year=year
+    ).values('donor_id', 'currency').annotate(
+        total=Sum('amount'),
+        count=Count('id'),
+    ).order_by('donor_id', 'currency')
+    for row in totals.iterator(chunk_size=5000):
+        statements[row['donor_id']]['totals'].append(row)
+
+    allocations = DonationAllocation.objects.filter(
+        donation__date_received__year=year
+    ).values(
+        'donation__donor_id', 'donation__currency', 'project_id', 'project__title', 'project__title_ur'
+    ).annotate(
+        total=Sum('amount'),
+    ).order_by('donation__donor_id', 'project__title', 'donation__currency')
+    for row in allocations.iterator(chunk_size=5000):
+        statements[row['donation__donor_id']]['projects'].append({
+            'title': row['project__title'],
+            'title_ur': row['project__title_ur'],
+            'currency': row['donation__currency'],
+            'total': row['total'],
+        })
+
+    return list(statements.values())
+
+
+def render_batch(batch, year, output_dir, language, generated_at):
+    """Render and write one batch of statements; returns index rows"""
+    index_rows = []
+    urdu = language == TRANSLATION_LANGUAGE
+    with translation.override(language):
+        for statement in batch:
+            donor = statement['donor']
+            filename = f"{donor['donor_id']}.html"
+            html = render_to_string('core/donor_statement.html', {
+                'year': year,
+                'donor': donor,
+                'totals': statement['totals'],
+                'projects': [
+                    {**project, 'title': project['title_ur'] or project['title']} if urdu else project
+                    for project in statement['projects']
+                ],
+                'generated_at': generated_at,
+            })
+            Path(output_dir, filename).write_text(html, encoding='utf-8')
+            index_rows.append([
+                donor['donor_id'],
+                donor['name'],
+                filename,
+                '; '.join(f"{row['total']} {row['currency']}" for row in statement['totals']),
+                sum(row['count'] for row in statement['totals']),
+            ])
+    return index_rows
+
+
+class Command(BaseCommand):
+    help = 'Generate yearly giving statements for every donor who gave in the given year'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, required=True, help='Calendar year to report on')
+        parser.add_argument(
+            '--output',
+            help='Directory to write statements to (default: MEDIA_ROOT/statements/<year>)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of rendering processes'
+        )
+        parser.add_argument('--batch-size', type=int, default=500, help='Statements per worker task')
+        parser.add_argument('--language', default=settings.LANGUAGE_CODE, help='Language to render in')
+
+    def handle(self, *args, **options):
+        year = options['year']
+        if options['workers'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--workers and --batch-size must be positive')
+        output_dir = Path(options['output'] or Path(settings.MEDIA_ROOT, 'statements', str(year)))
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        self.stdout.write(f'Collecting donations for {year}...')
+        statements = []
+        for alias in community_databases():
+            with use_community_database(alias):
+                statements.extend(collect_statements(year))
+        if not statements:
+            self.stdout.write(self.style.WARNING(f'No donations found for {year}.'))
+            return
+
+        # Workers only render; make sure no forked child inherits an open connection
+        connections.close_all()
+
+        batch_size = options['batch_size']
+        batches = [statements[i:i + batch_size] for i in range(0, len(statements), batch_size)]
+        generated_at = timezone.now()
+        self.stdout.write(f'Rendering {len(statements)} statements with {options["workers"]} workers...')
+
+        index_rows = []
+        # django.setup is a no-op for forked workers and configures spawned ones
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=django.setup) as executor:
+            futures = [
+                executor.submit(render_batch, batch, year, str(output_dir), options['language'], generated_at)
+                for batch in batches
+            ]
+            for future in futures:
+                index_rows.extend(future.result())
+
+        with open(output_dir / 'index.csv', 'w', newline='', encoding='utf-8') as index_file:
+            writer = csv.writer(index_file)
+            writer.writerow(['donor_id', 'name', 'file', 'totals', 'donations'])
+            writer.writerows(index_rows)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {len(index_rows)} statements and index.csv to {output_dir}'
+        ))
@@ -0,0 +1,77 @@
+"""Django management command to report clusters of likely duplicate donors"""
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from core.dedup import blocking_keys, find_duplicate_clusters
+from core.models import Donor
+from core.routers import community_databases, use_community_database
+
+
+class Command(BaseCommand):
+    help = 'List clusters of donors sharing an email, phone number or (optionally) phonetic name'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--names',
+            action='store_true',
+            help='Also match donors of the same community whose names sound alike'
+        )
+        parser.add_argument(
+            '--community',
+            choices=['INTL', 'PAK'],
+            help='Only consider donors of this community type'
+        )
+        parser.add_argument(
+            '--refresh-keys',
+            action='store_true',
+            help='Recompute blocking keys first (needed after bulk imports that bypass save())'
+        )
+
+    def handle(self, *args, **options):
+        keys = ('email', 'phone', 'name') if options['names'] else ('email', 'phone')
+        cluster_count = duplicates = 0
+
+        # Duplicates can only be merged within a community, so each database is scanned on its own
+        for alias in community_databases():
+            with use_community_database(alias):
+                if options['refresh_keys']:
+                    self.refresh_keys()
+
+                queryset = Donor.objects.all()
+                if options['community']:
+                    queryset = queryset.filter(community__community_type=options['community'])
+
+                clusters = find_duplicate_clusters(queryset, keys=keys)
+                donors = Donor.objects.select_related('community').annotate(
+                    donation_count=Count('donations')
+                ).in_bulk([pk for cluster in clusters for pk in cluster])
+
+                for cluster in clusters:
+                    cluster_count += 1
+                    self.stdout.write(self.style.MIGRATE_HEADING(
+                        f'Cluster {cluster_count} ({len(cluster)} donors)'
+                    ))
+                    for pk in cluster:
+                        donor = donors[pk]
+                        self.stdout.write(
+                            f'  {donor.donor_id}  {donor.name}  <{donor.email or "-"}>  {donor.phone or "-"}  '
+                            f'{donor.community}  donations={donor.donation_count}'
+                        )
+                duplicates += sum(len(cluster) - 1 for cluster in clusters)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{cluster_count} clusters, {duplicates} donors could be merged. '
+            f'Use the "Merge selected donors" admin action to merge them.'
+        ))
+
+    def refresh_keys(self):
+        self.stdout.write('Refreshing blocking keys...')
+        batch = []
+        for donor in Donor.objects.only('name', 'email', 'phone').iterator(chunk_size=2000):
+            donor.name_key, donor.email_key, donor.phone_key = blocking_keys(donor.name, donor.email, donor.phone)
+            batch.append(donor)
+            if len(batch) == 2000:
+                Donor.objects.bulk_update(batch, ['name_key', 'email_key', 'phone_key'])
+                batch = []
+        if batch:
+            Donor.objects.bulk_update(batch, ['name_key', 'email_key', 'phone_key'])
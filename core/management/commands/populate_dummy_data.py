@@ -1,53 +1,389 @@
 #!/usr/bin/env python
-"""Django management command to populate dummy data for Bait ul Rizq"""
-from django.core.management.base import BaseCommand
-from django.utils import timezone
-from decimal import Decimal
+"""Django management command to populate dummy data for Bait ul Rizq.
+
+``--scale`` is the number of donations to generate (1,000 for a quick demo,
+up to 5,000,000 for a production-sized dataset); donors, projects,
+allocations, recoveries, blog posts and volunteers grow with it. The same
+``--seed`` always generates the same data. Rows are generated as streams
+and written with ``bulk_create`` in chunks, so memory use does not grow
+with the scale. ``--append`` adds a new batch on top of the existing data
+instead of replacing it.
+
+Distributions follow what the real data looks like: donation amounts are
+log-normal per currency, donations per donor are heavy-tailed (most donors
+give once, a few give every month), activity grows toward the present,
+and a project's status follows its age.
+"""
+import math
 import random
-from datetime import date, timedelta
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from decimal import Decimal
 
-from core.models import Community, CustomUser, Donor, Volunteer
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from blog.models import BlogCategory, BlogPost, BlogPostDailyViews, RelatedPost
+from blog.search import clear_index, index_posts
+from core.dedup import blocking_keys
+from core.feeds import touch_feeds
+from core.lookup import donor_ids
+from core.models import Community, CustomUser, Donor, DonorStats, Volunteer
+from core.pagecache import expire_pages
+from core.richtext import render_rich_text
+from core.routers import community_databases, database_for_community, fan_out, use_community_database
+from core.skills import invalidate_matches, skill_index, skill_tokens
 from donations.models import Donation, DonationAllocation
-from projects.models import ProjectCategory, Project, Recovery
-from blog.models import BlogPost, BlogCategory
+from projects.models import Project, ProjectCategory, ProjectUpdate, Recovery, RelatedProject
+
+
+# Years of history the generated activity spans
+HISTORY_DAYS = 5 * 365
+# Average donations funding one project, sets the number of projects
+DONATIONS_PER_PROJECT = 40
+# Share of donations allocated to a project while any still needs funding
+ALLOCATED_SHARE = 0.7
+# Donations per donor follow a Pareto law: mean ~3, capped at monthly giving
+DONOR_FREQUENCY_ALPHA = 1.5
+MAX_DONATIONS_PER_DONOR = 60
+
+PAK_FIRST_NAMES = [
+    'Muhammad', 'Ahmed', 'Ali', 'Hassan', 'Usman', 'Bilal', 'Hamza', 'Omar', 'Imran', 'Kashif',
+    'Fatima', 'Ayesha', 'Zainab', 'Amina', 'Maryam', 'Sana', 'Hina', 'Rabia', 'Nadia', 'Sadia',
+]
+PAK_LAST_NAMES = [
+    'Khan', 'Malik', 'Hussain', 'Raza', 'Tariq', 'Qureshi', 'Siddiqui', 'Sheikh', 'Butt', 'Chaudhry',
+    'Abbasi', 'Mirza', 'Baig', 'Javed', 'Iqbal',
+]
+INTL_FIRST_NAMES = [
+    'John', 'Emma', 'Michael', 'Sarah', 'David', 'Lisa', 'James', 'Maria', 'Daniel', 'Sophie',
+    'Yusuf', 'Layla', 'Adam', 'Hannah', 'Ibrahim', 'Noor',
+]
+INTL_LAST_NAMES = [
+    'Smith', 'Johnson', 'Brown', 'Davis', 'Wilson', 'Anderson', 'Taylor', 'Thomas', 'Moore', 'Martin',
+    'Rahman', 'Patel', 'Ahmed', 'Hussain',
+]
+
+COMMUNITIES = [
+    # type, name, description, share of donations
+    ('PAK', 'Pakistani Community', 'Pakistani donors and beneficiaries', 0.6),
+    ('INTL', 'International Community', 'International donors and beneficiaries', 0.4),
+]
+
+# How each community gives: currencies and payment methods with weights, and
+# the median and spread (log-normal sigma) of a donation in its currency
+DONATION_PROFILES = {
+    'PAK': {
+        'currencies': [('PKR', 1)],
+        'payment_methods': [('MOBILE', 40), ('BANK', 30), ('CASH', 25), ('CHEQUE', 5)],
+        'median': {'PKR': 5000},
+        'sigma': 1.1,
+        'names': (PAK_FIRST_NAMES, PAK_LAST_NAMES),
+        'phone': '03{:02d}-{:07d}',
+        'address': 'House #{}, Street {}, {}',
+        'cities': ['Karachi', 'Lahore', 'Islamabad', 'Faisalabad', 'Multan', 'Peshawar'],
+        'project_currency': 'PKR',
+        'project_amounts': (20000, 250000),
+    },
+    'INTL': {
+        'currencies': [('USD', 60), ('GBP', 25), ('EUR', 15)],
+        'payment_methods': [('CARD', 55), ('BANK', 40), ('OTHER', 5)],
+        'median': {'USD': 60, 'GBP': 50, 'EUR': 50},
+        'sigma': 1.0,
+        'names': (INTL_FIRST_NAMES, INTL_LAST_NAMES),
+        'phone': '+1-555-{:02d}{:05d}',
+        'address': '{} Main Street, Apt {}, {}',
+        'cities': ['London', 'Manchester', 'New York', 'Houston', 'Toronto', 'Dubai'],
+        'project_currency': 'USD',
+        'project_amounts': (500, 3000),
+    },
+}
+
+CATEGORIES = [
+    ('Food Cart', 'فوڈ کارٹ', 'Small food carts and stalls', 'bi-cart', 'Samosa Cart', 'سموسے کی ریڑھی'),
+    ('Fruit & Vegetable', 'پھل اور سبزی', 'Selling fresh produce', 'bi-basket', 'Fruit Stall', 'پھلوں کا اسٹال'),
+    ('Tailoring', 'سلائی', 'Sewing and tailoring business', 'bi-scissors', 'Tailor Shop', 'درزی کی دکان'),
+    ('General Store', 'کریانہ سٹور', 'Small neighborhood stores', 'bi-shop', 'General Store', 'کریانہ سٹور'),
+    ('Rickshaw', 'رکشا', 'Auto rickshaw for transport', 'bi-truck', 'Rickshaw', 'رکشا'),
+]
+
+PROJECT_STORIES = [
+    ('{name} lost a steady job and wants to support the family with a {business}.',
+     '{name} اپنے خاندان کی کفالت کے لیے {business_ur} شروع کرنا چاہتے ہیں'),
+    ('{name} is raising {children} children alone and has the skills to run a {business}.',
+     '{name} اکیلے {children} بچوں کی پرورش کر رہے ہیں اور {business_ur} چلا سکتے ہیں'),
+    ('After years of daily wage work, {name} is ready to own a {business}.',
+     'برسوں کی دیہاڑی کے بعد {name} اپنا {business_ur} چلانے کے لیے تیار ہیں'),
+]
+
+# Project status by age in days: (up to this age, [(status, weight), ...])
+STATUS_BY_AGE = [
+    (30, [('PENDING', 70), ('APPROVED', 20), ('REJECTED', 10)]),
+    (120, [('APPROVED', 35), ('FUNDED', 45), ('ON_HOLD', 10), ('REJECTED', 10)]),
+    (365, [('FUNDED', 25), ('ESTABLISHED', 40), ('RECOVERING', 30), ('ON_HOLD', 5)]),
+    (None, [('ESTABLISHED', 15), ('RECOVERING', 50), ('COMPLETED', 30), ('ON_HOLD', 5)]),
+]
+FUNDED_STATUSES = {'FUNDED', 'ESTABLISHED', 'RECOVERING', 'COMPLETED'}
+
+FIXED_BLOG_POSTS = [
+    {
+        'title': 'Success Story: How Rashid Built His Samosa Business',
+        'excerpt': 'From struggling to feed his family to running a successful samosa cart',
+        'content': '''
+        <h2>A Journey of Transformation</h2>
+        <p>Muhammad Rashid, a father of four, was struggling to make ends meet. After losing his job,
+        he approached Bait ul Rizq with a dream - to start a small samosa cart.</p>
+
+        <p>With support from our generous donors, Rashid received funding to purchase a cart, cooking
+        equipment, and initial inventory. Today, just 6 months later, he's not only supporting his family
+        but also contributing back to help others.</p>
+
+        <blockquote>"This opportunity changed my life. Now I can provide for my family with dignity and
+        help others like me." - Muhammad Rashid</blockquote>
+        ''',
+        'category': 'success-story',
+        'featured': True
+    },
+    {
+        'title': 'Understanding Our Self-Sustaining Model',
+        'excerpt': 'How donations create a continuous cycle of giving',
+        'content': '''
+        <h2>The Power of Sustainable Charity</h2>
+        <p>At Bait ul Rizq, we believe in empowering people, not just providing handouts. Our unique
+        model ensures that every donation creates lasting impact.</p>
+
+        <p>When a beneficiary's business becomes established, they begin making monthly contributions
+        back to the fund. These contributions then fund new businesses, creating a self-sustaining
+        cycle of prosperity.</p>
+        ''',
+        'category': 'information',
+        'featured': True
+    },
+    {
+        'title': 'Meet Our Volunteers: The Heart of Bait ul Rizq',
+        'excerpt': 'Dedicated volunteers who make everything possible',
+        'content': '''
+        <h2>Community Volunteers</h2>
+        <p>Our volunteers are the backbone of our organization. They verify beneficiaries, mentor
+        new business owners, and ensure transparency in every transaction.</p>
+
+        <p>From conducting field visits to providing business guidance, our volunteers dedicate
+        countless hours to transform lives.</p>
+        ''',
+        'category': 'community',
+        'featured': False
+    },
+    {
+        'title': 'Transparency Report: Q1 2025',
+        'excerpt': 'Complete breakdown of donations and allocations',
+        'content': '''
+        <h2>Quarterly Transparency Report</h2>
+        <p>In Q1 2025, we received donations totaling $45,000 and PKR 2,500,000. Here's how
+        every penny was utilized:</p>
+
+        <ul>
+            <li>85% directly funded new businesses</li>
+            <li>10% used for business training and mentorship</li>
+            <li>5% for administrative and verification costs</li>
+        </ul>
+
+        <p>Every donor can track their specific contribution using their unique donor ID.</p>
+        ''',
+        'category': 'report',
+        'featured': True
+    }
+]
+
+BLOG_CATEGORIES = [
+    ('Success Story', 'success-story', 'Success stories from beneficiaries'),
+    ('Information', 'information', 'Information about our programs and processes'),
+    ('Community', 'community', 'Community updates and volunteer stories'),
+    ('Report', 'report', 'Transparency reports and financial updates'),
+]
+
+# Generated posts: one per this many donations
+DONATIONS_PER_POST = 2000
+POST_TITLES = [
+    ('success-story', '{name} Opens a {business} in {city}'),
+    ('success-story', 'A Year On: {name} and the {business}'),
+    ('community', 'Volunteers Visit {city} Beneficiaries'),
+    ('information', 'How a {business} Is Verified Before Funding'),
+    ('report', 'Monthly Recovery Update from {city}'),
+]
+POST_PARAGRAPHS = [
+    'Every business we fund starts with a visit from our volunteers, who meet the family and check the plan.',
+    'Once the {business} was running, {name} began contributing back each month, funding the next family.',
+    'Donors in {city} and abroad can follow each allocation with their donor ID.',
+    'Recovered contributions have now funded more businesses than the original donations did alone.',
+    'The first weeks are the hardest: stock, customers and a routine all have to come together.',
+    'Our mentors help with pricing, bookkeeping and finding a good location.',
+]
+
+FIXED_VOLUNTEERS = [
+    ('Omar Farooq', 'omar.f@example.com', '0321-7654321', 'PAK', 'Field verification, mentoring'),
+    ('Aisha Siddiqui', 'aisha.s@example.com', '0333-1234567', 'PAK', 'Documentation, follow-up'),
+    ('Jennifer Wilson', 'jen.w@example.com', '+1-555-2345678', 'INTL', 'Online coordination'),
+]
+# Generated volunteers: one per this many donations
+DONATIONS_PER_VOLUNTEER = 500
+VOLUNTEER_SKILLS = [
+    'Field verification', 'Mentoring', 'Bookkeeping', 'Accounting', 'Photography', 'Urdu translation',
+    'Social media', 'Web development', 'Tailoring', 'Cooking', 'Driving', 'Retail', 'Fundraising',
+]
+
+CENT = Decimal('0.01')
+
+
+def _weighted(rng, choices):
+    """Pick from ``[(value, weight), ...]``"""
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+def _moment(rng, day):
+    """An aware datetime at a random time of ``day``"""
+    moment = datetime.combine(day, time()) + timedelta(seconds=rng.randrange(86400))
+    return timezone.make_aware(moment)
+
+
+@contextmanager
+def _backdated(*fields):
+    """Let bulk_create store the historical dates set on ``auto_now_add`` fields"""
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
 
 
 class Command(BaseCommand):
-    help = 'Populate database with dummy data for testing'
-
-    def handle(self, *args, **kwargs):
-        self.stdout.write(self.style.SUCCESS('Starting to populate dummy data...'))
+    help = 'Populate database with dummy data for testing, at any scale'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            type=int,
+            default=1000,
+            help='Number of donations to generate (1000 to 5000000); everything else grows with it'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed; the same seed always generates the same data'
+        )
+        parser.add_argument(
+            '--append',
+            action='store_true',
+            help='Add to the existing data instead of deleting it first'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows per bulk insert'
+        )
 
-        # Clear existing data (optional - comment out if you want to keep existing data)
-        self.stdout.write('Clearing existing data...')
-        Recovery.objects.all().delete()
-        DonationAllocation.objects.all().delete()
-        Donation.objects.all().delete()
-        Project.objects.all().delete()
-        ProjectCategory.objects.all().delete()
-        BlogPost.objects.all().delete()
-        BlogCategory.objects.all().delete()
-        Donor.objects.all().delete()
-        Volunteer.objects.all().delete()
+    def handle(self, *args, **options):
+        if options['scale'] < 1:
+            raise CommandError('--scale must be a positive number of donations.')
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.today = timezone.localdate()
+        scale = options['scale']
+
+        self.stdout.write(self.style.SUCCESS(f'Starting to populate dummy data ({scale:,} donations)...'))
+        if options['append']:
+            taken = fan_out(Donor.objects.values_list('donor_id', flat=True))
+            self.donor_ids = {int(donor_id) for donor_id in taken}
+        else:
+            self.stdout.write('Clearing existing data...')
+            self.clear()
+            self.donor_ids = set()
+
+        communities = self.create_communities()
+        categories = self.create_categories()
+        if not options['append']:
+            self.create_users(communities)
+
+        backdated = _backdated(
+            Donor._meta.get_field('created_at'),
+            Donation._meta.get_field('created_at'),
+            DonationAllocation._meta.get_field('allocated_date'),
+            Project._meta.get_field('application_date'),
+            Project._meta.get_field('created_at'),
+            Recovery._meta.get_field('created_at'),
+            BlogPost._meta.get_field('created_at'),
+            Volunteer._meta.get_field('created_at'),
+        )
+        with backdated:
+            for community_type, _name, _description, share in COMMUNITIES:
+                community = communities[community_type]
+                target = round(scale * share)
+                alias = database_for_community(community.pk) or DEFAULT_DB_ALIAS
+                open_projects = self.create_projects(community, categories, target, alias)
+                self.create_donations(community, target, alias, open_projects)
+            posts = self.create_blog_posts(scale, append=options['append'])
+            self.create_volunteers(scale, communities, append=options['append'])
+
+        self.refresh_derived_data(posts)
+        self.print_summary()
+
+    # Clearing
+
+    def truncate(self, model, alias):
+        """Delete every row of a table in one statement (no per-row signals)"""
+        connection = connections[alias]
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {connection.ops.quote_name(model._meta.db_table)}')
+
+    def clear(self):
+        for alias in community_databases():
+            with transaction.atomic(using=alias):
+                for model in (
+                    Recovery, ProjectUpdate, RelatedProject, DonationAllocation, Donation, DonorStats, Donor, Project
+                ):
+                    self.truncate(model, alias)
+        with transaction.atomic():
+            clear_index()
+            for model in (RelatedPost, BlogPostDailyViews, BlogPost, BlogCategory, Volunteer):
+                self.truncate(model, DEFAULT_DB_ALIAS)
+        # Few rows; deleted one by one so their copies in community databases go too
         CustomUser.objects.filter(is_superuser=False).delete()
+        ProjectCategory.objects.all().delete()
         Community.objects.all().delete()
 
-        # Create Communities
+    # Shared rows
+
+    def create_communities(self):
         self.stdout.write('Creating communities...')
-        intl_community = Community.objects.create(
-            name='International Community',
-            community_type='INTL',
-            description='International donors and beneficiaries'
-        )
-        pak_community = Community.objects.create(
-            name='Pakistani Community',
-            community_type='PAK',
-            description='Pakistani donors and beneficiaries'
-        )
+        communities = {}
+        for community_type, name, description, _share in COMMUNITIES:
+            communities[community_type], _created = Community.objects.get_or_create(
+                community_type=community_type,
+                defaults={'name': name, 'description': description}
+            )
+        return communities
 
-        # Create Users
+    def create_categories(self):
+        self.stdout.write('Creating project categories...')
+        categories = []
+        for name, name_ur, description, icon, business, business_ur in CATEGORIES:
+            category, _created = ProjectCategory.objects.get_or_create(
+                name=name,
+                defaults={'name_ur': name_ur, 'description': description, 'icon': icon}
+            )
+            categories.append((category, business, business_ur))
+        return categories
+
+    def create_users(self, communities):
         self.stdout.write('Creating users...')
-        director = CustomUser.objects.create_user(
+        CustomUser.objects.create_user(
             username='director',
             email='director@baitulrizq.org',
             password='director123',
@@ -56,357 +392,376 @@ class Command(BaseCommand):
             role='DIRECTOR',
             is_staff=True
         )
-
-        intl_manager = CustomUser.objects.create_user(
+        CustomUser.objects.create_user(
             username='intl_manager',
             email='intl.manager@baitulrizq.org',
             password='manager123',
             first_name='Sarah',
             last_name='Manager',
             role='INTL_MANAGER',
-            community=intl_community,
+            community=communities['INTL'],
             is_staff=True
         )
-
-        pak_manager = CustomUser.objects.create_user(
+        CustomUser.objects.create_user(
             username='pak_manager',
             email='pak.manager@baitulrizq.org',
             password='manager123',
             first_name='Ali',
             last_name='Manager',
             role='PAK_MANAGER',
-            community=pak_community,
+            community=communities['PAK'],
             is_staff=True
         )
 
-        # Create Project Categories
-        self.stdout.write('Creating project categories...')
-        categories = [
-            ProjectCategory.objects.create(name='Food Cart', description='Small food carts and stalls'),
-            ProjectCategory.objects.create(name='Fruit & Vegetable', description='Selling fresh produce'),
-            ProjectCategory.objects.create(name='Tailoring', description='Sewing and tailoring business'),
-            ProjectCategory.objects.create(name='General Store', description='Small neighborhood stores'),
-            ProjectCategory.objects.create(name='Rickshaw', description='Auto rickshaw for transport')
-        ]
-
-        # Create Donors and Donations
-        self.stdout.write('Creating donors and donations...')
-        donor_names_intl = [
-            ('John Smith', 'john.smith@example.com', 'USD'),
-            ('Emma Johnson', 'emma.j@example.com', 'USD'),
-            ('Michael Brown', 'michael.b@example.com', 'EUR'),
-            ('Sarah Davis', 'sarah.d@example.com', 'GBP'),
-            ('David Wilson', 'david.w@example.com', 'USD'),
-            ('Lisa Anderson', 'lisa.a@example.com', 'EUR'),
-        ]
-
-        donor_names_pak = [
-            ('Muhammad Ali', 'mali@example.com', 'PKR'),
-            ('Fatima Khan', 'fkhan@example.com', 'PKR'),
-            ('Ahmed Hassan', 'ahssan@example.com', 'PKR'),
-            ('Ayesha Malik', 'amalik@example.com', 'PKR'),
-            ('Usman Tariq', 'utariq@example.com', 'PKR'),
-            ('Zainab Raza', 'zraza@example.com', 'PKR'),
-        ]
-
-        donors = []
-
-        # Create international donors
-        for name, email, currency in donor_names_intl:
-            donor = Donor.objects.create(
-                name=name,
-                email=email,
-                phone=f'+1-555-{random.randint(1000000, 9999999)}',
-                address=f'{random.randint(100, 9999)} Main Street, City, Country',
-                community=intl_community,
-                is_anonymous=random.choice([True, False])
-            )
-            donors.append(donor)
-
-            # Create 1-3 donations for each donor
-            for _ in range(random.randint(1, 3)):
-                amount = Decimal(random.randint(100, 2000))
-                Donation.objects.create(
-                    donor=donor,
-                    amount=amount,
-                    currency=currency,
-                    payment_method=random.choice(['CARD', 'BANK', 'MOBILE']),
-                    date_received=date.today() - timedelta(days=random.randint(1, 180)),
-                    notes=f'Donation from {name}'
+    # Generators
+
+    def days_ago(self, days):
+        return self.today - timedelta(days=days)
+
+    def recent_offset(self):
+        """Days before today, denser toward the present (the organization grows)"""
+        return int(self.rng.triangular(0, HISTORY_DAYS, 0))
+
+    def person(self, community_type):
+        rng = self.rng
+        profile = DONATION_PROFILES[community_type]
+        first_names, last_names = profile['names']
+        name = f'{rng.choice(first_names)} {rng.choice(last_names)}'
+        phone = profile['phone'].format(rng.randrange(50), rng.randrange(10 ** 7))
+        address = profile['address'].format(rng.randint(1, 999), rng.randint(1, 60), rng.choice(profile['cities']))
+        return name, phone, address
+
+    def donor_id(self):
+        while True:
+            donor_id = self.rng.randrange(10 ** 9)
+            if donor_id not in self.donor_ids:
+                self.donor_ids.add(donor_id)
+                return f'{donor_id:09d}'
+
+    def amount(self, community_type, currency):
+        profile = DONATION_PROFILES[community_type]
+        value = self.rng.lognormvariate(math.log(profile['median'][currency]), profile['sigma'])
+        if currency == 'PKR':
+            # Rupee donations come in round hundreds
+            return Decimal(max(100, round(value, -2)))
+        return Decimal(max(5.0, value)).quantize(CENT)
+
+    def project(self, community, categories):
+        """An unsaved project and its recoveries ``[(date, amount), ...]``"""
+        rng = self.rng
+        profile = DONATION_PROFILES[community.community_type]
+        category, business, business_ur = rng.choice(categories)
+        name, phone, address = self.person(community.community_type)
+        first_name = name.split()[0]
+        story, story_ur = rng.choice(PROJECT_STORIES)
+        children = rng.randint(1, 6)
+
+        age = rng.randrange(HISTORY_DAYS)
+        status = _weighted(rng, next(weights for limit, weights in STATUS_BY_AGE if limit is None or age <= limit))
+        applied = self.days_ago(age)
+        low, high = profile['project_amounts']
+        requested = Decimal(round(rng.uniform(low, high), -2 if low >= 10000 else 0))
+
+        project = Project(
+            title=f'{business} for {first_name}',
+            title_ur=f'{first_name} کے لیے {business_ur}' if community.community_type == 'PAK' else '',
+            category=category,
+            community=community,
+            beneficiary_name=name,
+            beneficiary_phone=phone,
+            beneficiary_email=f'{slugify(name)}.{rng.randrange(10 ** 6)}@example.com',
+            beneficiary_address=address,
+            family_size=children + rng.randint(1, 3),
+            description=story.format(name=first_name, business=business.lower(), children=children),
+            description_ur=story_ur.format(name=first_name, business_ur=business_ur, children=children),
+            business_plan=f'Start-up costs for the {business.lower()}: equipment, first stock and a month of rent.',
+            requested_amount=requested,
+            currency=profile['project_currency'],
+            status=status,
+            application_date=applied,
+            created_at=_moment(rng, applied),
+            is_public=status not in ('PENDING', 'REJECTED') and rng.random() < 0.95,
+            is_featured=rng.random() < 0.05,
+        )
+        recoveries = []
+        if status in ('PENDING', 'REJECTED'):
+            return project, recoveries
+
+        project.approved_amount = requested
+        project.approval_date = min(self.today, applied + timedelta(days=rng.randint(7, 21)))
+        if status not in FUNDED_STATUSES:
+            return project, recoveries
+        project.funding_date = min(self.today, project.approval_date + timedelta(days=rng.randint(10, 60)))
+        if status == 'FUNDED':
+            return project, recoveries
+        project.establishment_date = min(self.today, project.funding_date + timedelta(days=rng.randint(14, 45)))
+        project.expected_monthly_recovery = (requested * Decimal(rng.uniform(0.03, 0.08))).quantize(CENT)
+        if status == 'ESTABLISHED':
+            return project, recoveries
+
+        project.recovery_start_date = min(self.today, project.establishment_date + timedelta(days=30))
+        day, total = project.recovery_start_date, Decimal('0.00')
+        while day <= self.today and (status != 'COMPLETED' or total < requested):
+            # Some months are missed, some pay a little extra
+            if rng.random() >= 0.15:
+                amount = (project.expected_monthly_recovery * Decimal(rng.uniform(0.6, 1.3))).quantize(CENT)
+                recoveries.append((day, amount))
+                total += amount
+            day += timedelta(days=30)
+        project.total_recovered = total
+        return project, recoveries
+
+    def create_projects(self, community, categories, donations, alias):
+        """Projects of a community; returns ``[[pk, amount still needed], ...]`` of the funded ones"""
+        self.stdout.write(f'Creating projects for {community.name}...')
+        count = max(4, donations // DONATIONS_PER_PROJECT)
+        open_projects = []
+        for start in range(0, count, self.batch_size):
+            batch = [self.project(community, categories) for _ in range(min(self.batch_size, count - start))]
+            with transaction.atomic(using=alias):
+                Project.objects.using(alias).bulk_create([project for project, _recoveries in batch])
+                Recovery.objects.using(alias).bulk_create(
+                    [
+                        Recovery(
+                            project_id=project.pk,
+                            amount=amount,
+                            recovery_date=day,
+                            payment_method=self.rng.choice(['CASH', 'BANK', 'MOBILE']),
+                            notes='Monthly contribution',
+                            created_at=_moment(self.rng, day),
+                        )
+                        for project, recoveries in batch
+                        for day, amount in recoveries
+                    ],
+                    batch_size=self.batch_size
                 )
-
-        # Create Pakistani donors
-        for name, email, currency in donor_names_pak:
-            donor = Donor.objects.create(
-                name=name,
-                email=email,
-                phone=f'03{random.randint(10, 49)}-{random.randint(1000000, 9999999)}',
-                address=f'House #{random.randint(1, 999)}, Street {random.randint(1, 50)}, Karachi/Lahore',
-                community=pak_community,
-                is_anonymous=random.choice([True, False])
-            )
-            donors.append(donor)
-
-            # Create 1-3 donations for each donor
-            for _ in range(random.randint(1, 3)):
-                amount = Decimal(random.randint(5000, 100000))
-                Donation.objects.create(
-                    donor=donor,
-                    amount=amount,
-                    currency=currency,
-                    payment_method=random.choice(['MOBILE', 'BANK', 'CASH']),
-                    date_received=date.today() - timedelta(days=random.randint(1, 180)),
-                    notes=f'Donation from {name}'
+            open_projects += [
+                [project.pk, project.approved_amount] for project, _recoveries in batch
+                if project.status in FUNDED_STATUSES
+            ]
+        return open_projects
+
+    def allocate(self, donation_amount, open_projects):
+        """``[(project pk, amount), ...]`` funded from one donation (at most two projects)"""
+        rng = self.rng
+        allocations = []
+        remaining = donation_amount
+        while open_projects and remaining > 0 and len(allocations) < 2:
+            index = rng.randrange(len(open_projects))
+            entry = open_projects[index]
+            amount = min(remaining, entry[1])
+            allocations.append((entry[0], amount))
+            remaining -= amount
+            entry[1] -= amount
+            if entry[1] <= 0:
+                # Fully funded: swap-remove
+                open_projects[index] = open_projects[-1]
+                open_projects.pop()
+        return allocations
+
+    def create_donations(self, community, target, alias, open_projects):
+        """Stream donors with their donations and allocations into ``alias``"""
+        self.stdout.write(f'Creating donors and donations for {community.name}...')
+        rng = self.rng
+        community_type = community.community_type
+        profile = DONATION_PROFILES[community_type]
+        created = reported = 0
+        while created < target:
+            # One chunk: donors with about batch_size donations between them
+            chunk, chunk_donations = [], 0
+            while chunk_donations < self.batch_size and created + chunk_donations < target:
+                count = min(
+                    int(rng.paretovariate(DONOR_FREQUENCY_ALPHA)),
+                    MAX_DONATIONS_PER_DONOR,
+                    target - created - chunk_donations,
                 )
-
-        # Create Projects (Beneficiaries)
-        self.stdout.write('Creating projects...')
-
-        project_data_intl = [
-            ('Help Sarah Start Tea Stall', 'Sarah is a widow with 3 children. She wants to start a small tea and snacks stall.', 800, 'USD'),
-            ('Fruit Cart for James', 'James lost his job and wants to sell fresh fruits to support his family.', 1200, 'USD'),
-            ('Tailor Shop for Maria', 'Maria has good sewing skills and needs a sewing machine to start home-based tailoring.', 600, 'EUR'),
-        ]
-
-        project_data_pak = [
-            ('Samosa Cart for Rashid', 'محمد راشد ایک محنت کش آدمی ہے جو سموسے بیچنا چاہتا ہے', 25000, 'PKR'),
-            ('Fruit Stall for Amina', 'آمنہ اپنے بچوں کی کفالت کے لیے پھل بیچنا چاہتی ہے', 30000, 'PKR'),
-            ('General Store for Bilal', 'بلال کو ایک چھوٹا کریانہ سٹور کھولنا ہے', 50000, 'PKR'),
-            ('Vegetable Cart for Hamza', 'حمزہ تازہ سبزیاں بیچ کر اپنا گھر چلانا چاہتا ہے', 20000, 'PKR'),
-            ('Rickshaw for Khalid', 'خالد رکشا چلا کر اپنی فیملی کا خرچہ اٹھانا چاہتا ہے', 150000, 'PKR'),
-        ]
-
-        projects = []
-        statuses = ['PENDING', 'APPROVED', 'FUNDED', 'ESTABLISHED', 'RECOVERING']
-
-        # Create international projects
-        for idx, (title, desc, amount, currency) in enumerate(project_data_intl):
-            status = statuses[min(idx, len(statuses) - 1)]
-            project = Project.objects.create(
-                beneficiary_name=title.split('for ')[-1] if 'for ' in title else f'Beneficiary {idx+1}',
-                title=title,
-                description=desc,
-                requested_amount=Decimal(amount),
-                approved_amount=Decimal(amount) if status != 'PENDING' else None,
-                currency=currency,
-                category=random.choice(categories),
-                status=status,
-                community=intl_community,
-                is_public=True,
-                is_featured=random.choice([True, False]),
-                beneficiary_phone=f'+1-555-{random.randint(1000000, 9999999)}',
-                beneficiary_email=f'beneficiary{idx+1}@example.com',
-                beneficiary_address=f'{random.randint(100, 999)} Street, City, Country',
-                family_size=random.randint(2, 6)
+                first = self.recent_offset()
+                currency = _weighted(rng, profile['currencies'])
+                method = _weighted(rng, profile['payment_methods'])
+                gifts = sorted(
+                    [first] + [rng.randint(0, first) for _ in range(count - 1)], reverse=True
+                )
+                name, phone, address = self.person(community_type)
+                email = f'{slugify(name)}.{rng.randrange(10 ** 6)}@example.com' if rng.random() < 0.9 else ''
+                donor = Donor(
+                    donor_id=self.donor_id(),
+                    name=name,
+                    email=email,
+                    phone=phone,
+                    address=address,
+                    community=community,
+                    is_anonymous=rng.random() < 0.3,
+                    created_at=_moment(rng, self.days_ago(first)),
+                )
+                donor.name_key, donor.email_key, donor.phone_key = blocking_keys(name, email, phone)
+                donations = [
+                    (self.days_ago(offset), self.amount(community_type, currency), currency, method)
+                    for offset in gifts
+                ]
+                chunk.append((donor, donations))
+                chunk_donations += count
+
+            with transaction.atomic(using=alias):
+                Donor.objects.using(alias).bulk_create([donor for donor, _donations in chunk])
+                donations = [
+                    Donation(
+                        donor_id=donor.pk,
+                        community_id=community.pk,
+                        amount=amount,
+                        currency=currency,
+                        payment_method=method,
+                        date_received=day,
+                        receipt_issued=day < self.today - timedelta(days=7),
+                        created_at=_moment(rng, day),
+                    )
+                    for donor, gifts in chunk
+                    for day, amount, currency, method in gifts
+                ]
+                Donation.objects.using(alias).bulk_create(donations, batch_size=self.batch_size)
+                allocations = [
+                    DonationAllocation(
+                        donation_id=donation.pk,
+                        project_id=project_pk,
+                        community_id=community.pk,
+                        amount=amount,
+                        allocated_date=min(self.today, donation.date_received + timedelta(days=rng.randint(1, 30))),
+                    )
+                    for donation in donations
+                    if rng.random() < ALLOCATED_SHARE
+                    for project_pk, amount in self.allocate(donation.amount, open_projects)
+                ]
+                DonationAllocation.objects.using(alias).bulk_create(allocations, batch_size=self.batch_size)
+
+            created += chunk_donations
+            if created - reported >= 100000 or created == target:
+                self.stdout.write(f'  {created:,} / {target:,} donations')
+                reported = created
+
+    def create_blog_posts(self, scale, append):
+        self.stdout.write('Creating blog posts...')
+        rng = self.rng
+        categories = {}
+        for name, slug, description in BLOG_CATEGORIES:
+            categories[slug], _created = BlogCategory.objects.get_or_create(
+                slug=slug, defaults={'name': name, 'description': description}
             )
-            projects.append(project)
-
-        # Create Pakistani projects
-        for idx, (title, desc, amount, currency) in enumerate(project_data_pak):
-            status = statuses[min(idx, len(statuses) - 1)]
-            project = Project.objects.create(
-                beneficiary_name=title.split('for ')[-1] if 'for ' in title else f'Beneficiary {idx+10}',
+        author = CustomUser.objects.filter(username='director').first()
+        taken = set(BlogPost.objects.values_list('slug', flat=True))
+
+        def post(title, excerpt, content, category, featured):
+            slug = base = slugify(title)[:40]
+            suffix = 2
+            while slug in taken:
+                slug, suffix = f'{base}-{suffix}', suffix + 1
+            taken.add(slug)
+            published = timezone.now() - timedelta(days=self.recent_offset(), seconds=rng.randrange(86400))
+            return BlogPost(
                 title=title,
-                description=desc,
-                requested_amount=Decimal(amount),
-                approved_amount=Decimal(amount) if status != 'PENDING' else None,
-                currency=currency,
-                category=random.choice(categories),
-                status=status,
-                community=pak_community,
-                is_public=True,
-                is_featured=random.choice([True, False]),
-                beneficiary_phone=f'03{random.randint(10, 49)}-{random.randint(1000000, 9999999)}',
-                beneficiary_email=f'beneficiary{idx+10}@example.com',
-                beneficiary_address=f'House #{random.randint(1, 999)}, Street {random.randint(1, 50)}, Karachi',
-                family_size=random.randint(2, 8)
+                slug=slug,
+                excerpt=excerpt,
+                content=content,
+                content_rendered=render_rich_text(content),
+                category=categories[category],
+                author=author,
+                is_published=rng.random() < 0.95,
+                is_featured=featured,
+                views_count=int(rng.lognormvariate(5, 1.2)),
+                published_date=published,
+                created_at=published,
             )
-            projects.append(project)
-
-        # Create Donation Allocations
-        self.stdout.write('Creating donation allocations...')
-        all_donations = list(Donation.objects.all())
-
-        for project in projects:
-            if project.status in ['FUNDED', 'ESTABLISHED', 'RECOVERING']:
-                # Allocate donations to funded projects
-                needed = project.approved_amount or project.requested_amount
-                allocated = Decimal('0.00')
-
-                # Match community donations to community projects
-                matching_donations = [d for d in all_donations if d.donor.community == project.community]
-
-                for donation in random.sample(matching_donations, min(3, len(matching_donations))):
-                    if allocated >= needed:
-                        break
-
-                    remaining_in_donation = donation.remaining_amount()
-                    if remaining_in_donation > 0:
-                        allocation_amount = min(remaining_in_donation, needed - allocated)
-
-                        DonationAllocation.objects.create(
-                            donation=donation,
-                            project=project,
-                            amount=allocation_amount,
-                            allocated_date=project.application_date + timedelta(days=random.randint(5, 30))
-                        )
-                        allocated += allocation_amount
-
-        # Create Recoveries for established/recovering projects
-        self.stdout.write('Creating recoveries...')
-        for project in projects:
-            if project.status in ['RECOVERING']:
-                # Create 2-6 monthly recoveries
-                for month in range(random.randint(2, 6)):
-                    recovery_amount = Decimal(random.randint(10, 30)) / 100 * (project.approved_amount or project.requested_amount)
-                    Recovery.objects.create(
-                        project=project,
-                        amount=recovery_amount,
-                        recovery_date=date.today() - timedelta(days=30 * (month + 1)),
-                        notes=f'Monthly contribution - Month {month + 1}'
-                    )
 
-        # Create Blog Categories
-        self.stdout.write('Creating blog categories...')
-        success_category = BlogCategory.objects.create(
-            name='Success Story',
-            slug='success-story',
-            description='Success stories from beneficiaries'
-        )
-        info_category = BlogCategory.objects.create(
-            name='Information',
-            slug='information',
-            description='Information about our programs and processes'
-        )
-        community_category = BlogCategory.objects.create(
-            name='Community',
-            slug='community',
-            description='Community updates and volunteer stories'
-        )
-        report_category = BlogCategory.objects.create(
-            name='Report',
-            slug='report',
-            description='Transparency reports and financial updates'
-        )
-
-        # Create Blog Posts
-        self.stdout.write('Creating blog posts...')
-        blog_posts = [
-            {
-                'title': 'Success Story: How Rashid Built His Samosa Business',
-                'excerpt': 'From struggling to feed his family to running a successful samosa cart',
-                'content': '''
-                <h2>A Journey of Transformation</h2>
-                <p>Muhammad Rashid, a father of four, was struggling to make ends meet. After losing his job,
-                he approached Bait ul Rizq with a dream - to start a small samosa cart.</p>
-
-                <p>With support from our generous donors, Rashid received funding to purchase a cart, cooking
-                equipment, and initial inventory. Today, just 6 months later, he's not only supporting his family
-                but also contributing back to help others.</p>
-
-                <blockquote>"This opportunity changed my life. Now I can provide for my family with dignity and
-                help others like me." - Muhammad Rashid</blockquote>
-                ''',
-                'category': success_category,
-                'featured': True
-            },
-            {
-                'title': 'Understanding Our Self-Sustaining Model',
-                'excerpt': 'How donations create a continuous cycle of giving',
-                'content': '''
-                <h2>The Power of Sustainable Charity</h2>
-                <p>At Bait ul Rizq, we believe in empowering people, not just providing handouts. Our unique
-                model ensures that every donation creates lasting impact.</p>
-
-                <p>When a beneficiary's business becomes established, they begin making monthly contributions
-                back to the fund. These contributions then fund new businesses, creating a self-sustaining
-                cycle of prosperity.</p>
-                ''',
-                'category': info_category,
-                'featured': True
-            },
-            {
-                'title': 'Meet Our Volunteers: The Heart of Bait ul Rizq',
-                'excerpt': 'Dedicated volunteers who make everything possible',
-                'content': '''
-                <h2>Community Volunteers</h2>
-                <p>Our volunteers are the backbone of our organization. They verify beneficiaries, mentor
-                new business owners, and ensure transparency in every transaction.</p>
-
-                <p>From conducting field visits to providing business guidance, our volunteers dedicate
-                countless hours to transform lives.</p>
-                ''',
-                'category': community_category,
-                'featured': False
-            },
-            {
-                'title': 'Transparency Report: Q1 2025',
-                'excerpt': 'Complete breakdown of donations and allocations',
-                'content': '''
-                <h2>Quarterly Transparency Report</h2>
-                <p>In Q1 2025, we received donations totaling $45,000 and PKR 2,500,000. Here's how
-                every penny was utilized:</p>
-
-                <ul>
-                    <li>85% directly funded new businesses</li>
-                    <li>10% used for business training and mentorship</li>
-                    <li>5% for administrative and verification costs</li>
-                </ul>
-
-                <p>Every donor can track their specific contribution using their unique donor ID.</p>
-                ''',
-                'category': report_category,
-                'featured': True
-            }
+        posts = [] if append else [
+            post(data['title'], data['excerpt'], data['content'], data['category'], data['featured'])
+            for data in FIXED_BLOG_POSTS
         ]
-
-        for post_data in blog_posts:
-            BlogPost.objects.create(
-                title=post_data['title'],
-                slug=post_data['title'].lower().replace(' ', '-').replace(':', ''),
-                excerpt=post_data['excerpt'],
-                content=post_data['content'],
-                category=post_data['category'],
-                author=director,
-                is_published=True,
-                is_featured=post_data['featured'],
-                published_date=timezone.now() - timedelta(days=random.randint(1, 90))
+        for _ in range(scale // DONATIONS_PER_POST):
+            category, title = rng.choice(POST_TITLES)
+            name = rng.choice(PAK_FIRST_NAMES)
+            business = rng.choice(CATEGORIES)[4]
+            city = rng.choice(DONATION_PROFILES['PAK']['cities'])
+            paragraphs = rng.sample(POST_PARAGRAPHS, 3)
+            content = ''.join(
+                f'<p>{paragraph.format(name=name, business=business.lower(), city=city)}</p>\n'
+                for paragraph in paragraphs
             )
-
-        # Create Volunteers
+            posts.append(post(
+                title.format(name=name, business=business, city=city),
+                paragraphs[0].format(name=name, business=business.lower(), city=city),
+                content,
+                category,
+                rng.random() < 0.05,
+            ))
+        return BlogPost.objects.bulk_create(posts, batch_size=self.batch_size)
+
+    def create_volunteers(self, scale, communities, append):
         self.stdout.write('Creating volunteers...')
-        volunteer_data = [
-            ('Omar Farooq', 'omar.f@example.com', '0321-7654321', pak_community, 'Field verification, mentoring'),
-            ('Aisha Siddiqui', 'aisha.s@example.com', '0333-1234567', pak_community, 'Documentation, follow-up'),
-            ('Jennifer Wilson', 'jen.w@example.com', '+1-555-2345678', intl_community, 'Online coordination'),
-        ]
-
-        for name, email, phone, community, skills in volunteer_data:
-            Volunteer.objects.create(
+        rng = self.rng
+        volunteers = [] if append else [
+            Volunteer(
                 name=name,
                 email=email,
                 phone=phone,
                 address='Volunteer address',
-                community=community,
+                community=communities[community_type],
                 skills=skills,
                 availability='Weekends',
                 message='Passionate about helping the community',
-                is_approved=True
+                is_approved=True,
+                created_at=timezone.now(),
             )
+            for name, email, phone, community_type, skills in FIXED_VOLUNTEERS
+        ]
+        for _ in range(scale // DONATIONS_PER_VOLUNTEER):
+            community_type = _weighted(rng, [(row[0], row[3]) for row in COMMUNITIES])
+            name, phone, address = self.person(community_type)
+            volunteers.append(Volunteer(
+                name=name,
+                email=f'{slugify(name)}.{rng.randrange(10 ** 6)}@example.com',
+                phone=phone,
+                address=address,
+                community=communities[community_type],
+                skills=', '.join(rng.sample(VOLUNTEER_SKILLS, rng.randint(1, 4))),
+                availability=rng.choice(['Weekends', 'Evenings', 'Weekdays', 'Flexible']),
+                message='Passionate about helping the community',
+                is_approved=rng.random() < 0.6,
+                created_at=_moment(rng, self.days_ago(self.recent_offset())),
+            ))
+        for volunteer in volunteers:
+            volunteer.skill_tokens = ' '.join(skill_tokens(volunteer.skills))
+        Volunteer.objects.bulk_create(volunteers, batch_size=self.batch_size)
+
+    # Everything bulk_create skipped: signals, indexes and caches
+
+    def refresh_derived_data(self, posts):
+        self.stdout.write('Refreshing donor statistics, search index and recommendations...')
+        for alias in community_databases():
+            with use_community_database(alias):
+                DonorStats.rebuild(batch_size=self.batch_size)
+        index_posts(posts)
+        call_command('build_related', stdout=self.stdout)
+        donor_ids.clear()
+        skill_index.clear()
+        invalidate_matches()
+        for section in ('blog', 'projects'):
+            touch_feeds(section)
+        expire_pages('blog', 'projects')
+
+    def print_summary(self):
+        def count(model):
+            return sum(model.objects.using(alias).count() for alias in community_databases())
 
-        # Print Summary
         self.stdout.write(self.style.SUCCESS('\n' + '='*50))
-        self.stdout.write(self.style.SUCCESS('SUMMARY OF CREATED DATA'))
+        self.stdout.write(self.style.SUCCESS('SUMMARY OF DATA'))
         self.stdout.write(self.style.SUCCESS('='*50))
         self.stdout.write(f'Communities: {Community.objects.count()}')
         self.stdout.write(f'Users: {CustomUser.objects.count()}')
-        self.stdout.write(f'Donors: {Donor.objects.count()}')
-        self.stdout.write(f'Donations: {Donation.objects.count()}')
-        self.stdout.write(f'Projects: {Project.objects.count()}')
-        self.stdout.write(f'Allocations: {DonationAllocation.objects.count()}')
-        self.stdout.write(f'Recoveries: {Recovery.objects.count()}')
-        self.stdout.write(f'Blog Posts: {BlogPost.objects.count()}')
-        self.stdout.write(f'Volunteers: {Volunteer.objects.count()}')
+        self.stdout.write(f'Donors: {count(Donor):,}')
+        self.stdout.write(f'Donations: {count(Donation):,}')
+        self.stdout.write(f'Projects: {count(Project):,}')
+        self.stdout.write(f'Allocations: {count(DonationAllocation):,}')
+        self.stdout.write(f'Recoveries: {count(Recovery):,}')
+        self.stdout.write(f'Blog Posts: {BlogPost.objects.count():,}')
+        self.stdout.write(f'Volunteers: {Volunteer.objects.count():,}')
         self.stdout.write(self.style.SUCCESS('='*50))
         self.stdout.write(self.style.SUCCESS('\nDummy data populated successfully!'))
         self.stdout.write(self.style.WARNING('\nTest Login Credentials:'))
@@ -0,0 +1,16 @@
+"""Django management command to rebuild precomputed donor statistics"""
+from django.core.management.base import BaseCommand
+
+from core.models import DonorStats
+from core.routers import community_databases, use_community_database
+
+
+class Command(BaseCommand):
+    help = 'Recompute DonorStats for every donor from a single grouped query per database'
+
+    def handle(self, *args, **kwargs):
+        count = 0
+        for alias in community_databases():
+            with use_community_database(alias):
+                count += DonorStats.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt statistics for {count} donors.'))
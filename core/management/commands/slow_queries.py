@@ -0,0 +1,79 @@
+"""Django management command to summarise the slow-query log by statement"""
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.slowqueries import log_path, read_samples
+
+SORT_KEYS = {
+    'total': lambda group: group['total'],
+    'count': lambda group: group['count'],
+    'max': lambda group: group['max'],
+    'avg': lambda group: group['total'] / group['count'],
+}
+
+
+class Command(BaseCommand):
+    help = 'Group the slow-query log by statement fingerprint, slowest first, with callers and query plans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--log',
+            help=f'Log file to read (default: SLOW_QUERY_LOG, currently {log_path()})'
+        )
+        parser.add_argument(
+            '--since',
+            type=float,
+            metavar='HOURS',
+            help='Only count samples from the last HOURS hours'
+        )
+        parser.add_argument(
+            '--sort',
+            choices=sorted(SORT_KEYS),
+            default='total',
+            help='Order statements by total (default), sample count, slowest or average time'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=10,
+            help='Statements to show (default 10)'
+        )
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(hours=options['since']) if options['since'] else None
+        groups = defaultdict(lambda: {
+            'count': 0, 'total': 0.0, 'max': 0.0, 'views': Counter(), 'callers': Counter(), 'latest': None,
+        })
+        for sample in read_samples(options['log']):
+            if since and datetime.fromisoformat(sample['time']) < since:
+                continue
+            group = groups[sample['fingerprint']]
+            group['count'] += 1
+            group['total'] += sample['duration_ms']
+            group['max'] = max(group['max'], sample['duration_ms'])
+            group['views'][sample.get('view') or '-'] += 1
+            group['callers'][(sample.get('stack') or ['-'])[0]] += 1
+            group['latest'] = sample
+
+        if not groups:
+            self.stdout.write('No slow queries logged.')
+            return
+
+        ranked = sorted(groups.items(), key=lambda item: SORT_KEYS[options['sort']](item[1]), reverse=True)
+        for number, (key, group) in enumerate(ranked[:options['limit']], 1):
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{number}. {group["count"]} samples, total {group["total"]:.1f} ms, '
+                f'avg {group["total"] / group["count"]:.1f} ms, max {group["max"]:.1f} ms'
+            ))
+            self.stdout.write(f'  {key}')
+            self.stdout.write('  views:   ' + ', '.join(f'{view} ({runs})' for view, runs in group['views'].most_common(3)))
+            self.stdout.write('  callers: ' + ', '.join(f'{caller} ({runs})' for caller, runs in group['callers'].most_common(3)))
+            plan = group['latest'].get('plan')
+            if plan:
+                self.stdout.write('  plan:')
+                for line in plan.splitlines():
+                    self.stdout.write(f'    {line}')
+        self.stdout.write(f'{len(groups)} distinct statements; showing {min(len(groups), options["limit"])}.')
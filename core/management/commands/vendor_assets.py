@@ -0,0 +1,115 @@
+"""Django management command to self-host the third-party CSS, JavaScript and fonts"""
+import string
+from pathlib import Path
+from urllib.error import URLError
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from core.assets import SUBSET_FONT_PATTERN, VENDOR_ASSETS, download, localize_css, strip_source_maps, vendor_url
+from core.routers import PARTITIONED_MODELS, community_databases
+from core.translation import translated_fields
+
+
+# Always kept in the Urdu font, so new content renders before the next subset
+URDU_CHARACTERS = (
+    'آأؤئابپتٹثجچحخدڈذرڑزژسشصضطظعغفقکگلمنںوہۂۃھءیےۓ'
+    '۰۱۲۳۴۵۶۷۸۹،؛؟۔٪'
+    # Diacritics, superscript alef, zero-width (non-)joiners
+    '\u064b\u064c\u064d\u064e\u064f\u0650\u0651\u0652\u0670\u200c\u200d'
+) + string.printable
+
+
+class Command(BaseCommand):
+    help = 'Download the CDN assets listed in core.assets into static/vendor and subset the Urdu font'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--no-subset',
+            action='store_true',
+            help='Keep the Urdu font files whole'
+        )
+
+    def handle(self, *args, **options):
+        root = Path(settings.STATICFILES_DIRS[0])
+        written, fonts = 0, []
+        try:
+            for path, url in VENDOR_ASSETS.values():
+                body = download(url)
+                if path.endswith(('.css', '.js')):
+                    text = strip_source_maps(body.decode('utf-8'))
+                    if path.endswith('.css'):
+                        text, files = localize_css(text, url, path)
+                        for file_path, file_url in files.items():
+                            self.write(root / file_path, download(file_url))
+                            written += 1
+                            if SUBSET_FONT_PATTERN.search(file_url):
+                                fonts.append(root / file_path)
+                    body = text.encode('utf-8')
+                self.write(root / path, body)
+                written += 1
+        except URLError as e:
+            raise CommandError(f'Download failed: {e}')
+        vendor_url.cache_clear()
+        self.stdout.write(f'Vendored {written} files into {root / "vendor"}.')
+
+        if fonts and not options['no_subset']:
+            self.subset_fonts(fonts)
+        self.stdout.write(self.style.SUCCESS('Done. Run collectstatic to fingerprint and compress them.'))
+
+    def write(self, path, body):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body)
+
+    def site_text(self):
+        """Every character the site shows in Urdu: templates, translations and stored text"""
+        characters = set(URDU_CHARACTERS)
+        sources = [Path(directory) for config in settings.TEMPLATES for directory in config.get('DIRS', [])]
+        sources += [Path(app.path) / 'templates' for app in apps.get_app_configs()]
+        sources += [Path(directory) for directory in getattr(settings, 'LOCALE_PATHS', [])]
+        for source in sources:
+            for file in source.rglob('*'):
+                if file.suffix in ('.html', '.txt', '.po'):
+                    characters.update(file.read_text(encoding='utf-8', errors='ignore'))
+
+        for model in apps.get_models():
+            columns = [field.translation for field in translated_fields(model)]
+            if not columns:
+                continue
+            aliases = community_databases() if model._meta.label_lower in PARTITIONED_MODELS else [DEFAULT_DB_ALIAS]
+            for alias in aliases:
+                for values in model.objects.using(alias).values_list(*columns).iterator(chunk_size=1000):
+                    characters.update(''.join(values))
+        return characters
+
+    def subset_fonts(self, fonts):
+        try:
+            from fontTools import subset
+            from fontTools.ttLib import TTFont
+            import brotli  # noqa: F401 (WOFF2 output)
+        except ImportError:
+            self.stdout.write(self.style.WARNING(
+                'fonttools and brotli are not installed; the Urdu font is kept whole '
+                '(pip install fonttools brotli to subset it).'
+            ))
+            return
+
+        codepoints = {ord(character) for character in self.site_text()}
+        options = subset.Options()
+        # Keep every shaping feature: Nastaliq joins and stacks letters through GSUB/GPOS
+        options.layout_features = ['*']
+        options.flavor = 'woff2'
+        for path in fonts:
+            font = TTFont(path)
+            before = path.stat().st_size
+            keep = codepoints & set(font.getBestCmap())
+            if not keep:
+                continue
+            subsetter = subset.Subsetter(options)
+            subsetter.populate(unicodes=keep)
+            subsetter.subset(font)
+            font.flavor = 'woff2'
+            font.save(path)
+            self.stdout.write(f'Subset {path.name}: {before // 1024} KB -> {path.stat().st_size // 1024} KB')
@@ -0,0 +1,246 @@
+import hashlib
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpResponse
+
+from .instrumentation import QueryBudgetExceeded, QueryRecorder, log_request, logger, server_timing
+from .pagecache import page_cache_tags, tag_versions
+from .routers import community_databases, database_for_community, routing_enabled, use_community_database
+from .scoping import ALL_COMMUNITIES, community_scope
+from .slowqueries import current_view
+
+
+class AsyncCapableMiddleware:
+    """Base for middleware serving both WSGI and ASGI requests.
+
+    Under ASGI Django hands it an async ``get_response``; ``acall`` then
+    handles the request on the event loop, so async views (core.asyncviews)
+    are not pushed back onto a thread by a sync middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.acall(request)
+        return self.call(request)
+
+
+class CommunityDatabaseMiddleware(AsyncCapableMiddleware):
+    """Pin a community manager's requests to their community's database.
+
+    Only active when COMMUNITY_DATABASES is configured; directors and
+    anonymous visitors are left unpinned and read across communities through
+    core.routers.fan_out.
+    """
+
+    def call(self, request):
+        with use_community_database(self.database(request)):
+            return self.get_response(request)
+
+    async def acall(self, request):
+        alias = await sync_to_async(self.database)(request) if routing_enabled() else None
+        with use_community_database(alias):
+            return await self.get_response(request)
+
+    def database(self, request):
+        if routing_enabled() and request.user.is_authenticated:
+            scope = community_scope(request)
+            if scope is not ALL_COMMUNITIES:
+                return database_for_community(scope)
+        return None
+
+
+class PageCacheMiddleware(AsyncCapableMiddleware):
+    """Serve anonymous visitors' pages from the cache (see core.pagecache).
+
+    Must come after the locale, authentication and message middleware.
+    A view may also define ``page_cache_hit(request, data)``: it is called
+    for every cached response served, with whatever the view stored in
+    ``request.page_cache_data`` when the page was rendered (e.g. to keep
+    counting views of a post).
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.timeout = getattr(settings, 'PAGE_CACHE_TIMEOUT', 600)
+
+    def call(self, request):
+        response = self.get_response(request)
+        key = getattr(request, '_page_cache_key', None)
+        if key and self.cacheable(request, response):
+            cache.set(key, self.entry(request, response), self.timeout)
+        return response
+
+    async def acall(self, request):
+        response = await self.get_response(request)
+        key = getattr(request, '_page_cache_key', None)
+        if key and self.cacheable(request, response):
+            await cache.aset(key, self.entry(request, response), self.timeout)
+        return response
+
+    def entry(self, request, response):
+        return response.content, dict(response.items()), getattr(request, 'page_cache_data', None)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        tags = page_cache_tags(view_func)
+        if tags is None or request.method not in ('GET', 'HEAD'):
+            return None
+        if request.user.is_authenticated or len(messages.get_messages(request)):
+            return None
+        # The page number is the only parameter these views read; any other
+        # (tracking tags, cache busters) would fill the cache with copies
+        if set(request.GET) - {'page'}:
+            return None
+
+        versions = ':'.join(tag_versions(tags))
+        url = request.build_absolute_uri(request.path)
+        digest = hashlib.md5(f'{versions}:{url}:{request.GET.get("page", "")}'.encode()).hexdigest()
+        key = f'pagecache:{request.LANGUAGE_CODE}:{digest}'
+        entry = cache.get(key)
+        if entry is None:
+            request._page_cache_key = key
+            return None
+
+        content, headers, data = entry
+        on_hit = getattr(getattr(view_func, 'view_class', view_func), 'page_cache_hit', None)
+        if on_hit is not None:
+            on_hit(request, data)
+        return HttpResponse(content, headers=headers)
+
+    def cacheable(self, request, response):
+        if response.status_code != 200 or response.streaming or response.cookies:
+            return False
+        # A page with a CSRF token would hand one visitor's token to everybody
+        if request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+            return False
+        # Set on the way out by the session and message middleware
+        if request.session.modified or request._messages.added_new:
+            return False
+        cache_control = response.get('Cache-Control', '')
+        return 'private' not in cache_control and 'no-store' not in cache_control
+
+
+class QueryInstrumentationMiddleware(AsyncCapableMiddleware):
+    """Measure each request's queries and template rendering (see core.instrumentation).
+
+    Place it near the top of MIDDLEWARE so its totals include the other
+    middleware; budgets count only what runs from the view onwards.
+    """
+
+    def call(self, request):
+        # The slow-query log names the view being served
+        token = current_view.set(None)
+        try:
+            if not getattr(settings, 'QUERY_INSTRUMENTATION', settings.DEBUG):
+                return self.get_response(request)
+            recorder = self.start(request)
+            start = time.perf_counter()
+            with ExitStack() as stack:
+                self.record_queries(stack, recorder)
+                response = self.get_response(request)
+            return self.report(request, response, time.perf_counter() - start)
+        finally:
+            current_view.reset(token)
+
+    async def acall(self, request):
+        token = current_view.set(None)
+        try:
+            if not getattr(settings, 'QUERY_INSTRUMENTATION', settings.DEBUG):
+                return await self.get_response(request)
+            recorder = self.start(request)
+            start = time.perf_counter()
+            # The async ORM runs queries in the request's database thread, on that thread's connections
+            with ExitStack() as stack:
+                await sync_to_async(self.record_queries)(stack, recorder)
+                try:
+                    response = await self.get_response(request)
+                finally:
+                    await sync_to_async(stack.close)()
+            return self.report(request, response, time.perf_counter() - start)
+        finally:
+            current_view.reset(token)
+
+    def start(self, request):
+        request._template_time = 0.0
+        request._query_recorder = QueryRecorder()
+        return request._query_recorder
+
+    def record_queries(self, stack, recorder):
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+
+    def report(self, request, response, total):
+        recorder = request._query_recorder
+        response['Server-Timing'] = server_timing([
+            ('db', recorder.duration, f'{recorder.count} queries'),
+            ('tpl', request._template_time, 'templates'),
+            ('total', total, None),
+        ])
+        match = request.resolver_match
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'queries': recorder.count,
+            'db_ms': round(recorder.duration * 1000, 2),
+            'template_ms': round(request._template_time * 1000, 2),
+            'total_ms': round(total * 1000, 2),
+            'duplicates': recorder.duplicates(),
+        }
+        log_request(record)
+        self.check_budget(request, record)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.resolver_match:
+            current_view.set(request.resolver_match.view_name)
+        if hasattr(request, '_query_recorder'):
+            view = getattr(view_func, 'view_class', view_func)
+            request._query_budget = getattr(view, 'query_budget', None)
+            if request._query_budget is not None:
+                # Queries repeated on each community database beyond the first
+                request._query_budget += getattr(view, 'fan_out_queries', 0) * (len(community_databases()) - 1)
+            # Loading the session and user is charged to the middleware, not the view
+            if hasattr(request, 'user'):
+                request.user.is_authenticated
+            request._queries_before_view = request._query_recorder.count
+
+    def process_template_response(self, request, response):
+        if hasattr(request, '_query_recorder'):
+            # Called just before the template renders
+            start = time.perf_counter()
+
+            def rendered(response):
+                request._template_time += time.perf_counter() - start
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def check_budget(self, request, record):
+        budget = getattr(request, '_query_budget', None)
+        if budget is None:
+            return
+        used = request._query_recorder.count - request._queries_before_view
+        if used <= budget:
+            return
+        message = f'{record["view"]} ran {used} queries, over its budget of {budget}'
+        if record['duplicates']:
+            message += '; repeated: ' + '; '.join(f'{runs}x {sql}' for sql, runs in record['duplicates'].items())
+        if getattr(settings, 'QUERY_BUDGET_ENFORCE', False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:15
+
+from django.db import migrations, models
+
+
+def populate_blocking_keys(apps, schema_editor):
+    from core.dedup import blocking_keys
+
+    Donor = apps.get_model("core", "Donor")
+    db_alias = schema_editor.connection.alias
+    donors = list(Donor.objects.using(db_alias).only("name", "email", "phone"))
+    for donor in donors:
+        donor.name_key, donor.email_key, donor.phone_key = blocking_keys(
+            donor.name, donor.email, donor.phone
+        )
+    Donor.objects.using(db_alias).bulk_update(
+        donors, ["name_key", "email_key", "phone_key"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="donor",
+            name="email_key",
+            field=models.CharField(
+                blank=True, db_index=True, editable=False, max_length=254
+            ),
+        ),
+        migrations.AddField(
+            model_name="donor",
+            name="name_key",
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name="donor",
+            name="phone_key",
+            field=models.CharField(
+                blank=True, db_index=True, editable=False, max_length=20
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="donor",
+            index=models.Index(
+                fields=["community", "name_key"], name="core_donor_name_key_idx"
+            ),
+        ),
+        migrations.RunPython(populate_blocking_keys, migrations.RunPython.noop),
+    ]
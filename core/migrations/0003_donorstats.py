@@ -0,0 +1,111 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_donor_stats(apps, schema_editor):
+    from core.models import base_currency_amount
+
+    Donor = apps.get_model("core", "Donor")
+    DonorStats = apps.get_model("core", "DonorStats")
+    db_alias = schema_editor.connection.alias
+    rows = (
+        Donor.objects.using(db_alias)
+        .annotate(
+            first=models.Min("donations__date_received"),
+            last=models.Max("donations__date_received"),
+            count=models.Count("donations"),
+            total=models.Sum(base_currency_amount("donations__")),
+        )
+        .values_list("pk", "first", "last", "count", "total")
+    )
+    DonorStats.objects.using(db_alias).bulk_create(
+        [
+            DonorStats(
+                donor_id=pk,
+                first_donation_date=first,
+                last_donation_date=last,
+                donation_count=count,
+                lifetime_total=total or 0,
+                cohort_month=first.replace(day=1) if first else None,
+            )
+            for pk, first, last, count, total in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_donor_blocking_keys"),
+        ("donations", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DonorStats",
+            fields=[
+                (
+                    "donor",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="core.donor",
+                        verbose_name="Donor",
+                    ),
+                ),
+                (
+                    "first_donation_date",
+                    models.DateField(
+                        blank=True, null=True, verbose_name="First Donation"
+                    ),
+                ),
+                (
+                    "last_donation_date",
+                    models.DateField(
+                        blank=True,
+                        db_index=True,
+                        null=True,
+                        verbose_name="Last Donation",
+                    ),
+                ),
+                (
+                    "donation_count",
+                    models.PositiveIntegerField(
+                        db_index=True, default=0, verbose_name="Donations"
+                    ),
+                ),
+                (
+                    "lifetime_total",
+                    models.DecimalField(
+                        db_index=True,
+                        decimal_places=2,
+                        default=0,
+                        help_text="Sum of all donations converted to the base currency",
+                        max_digits=14,
+                        verbose_name="Lifetime Total",
+                    ),
+                ),
+                (
+                    "cohort_month",
+                    models.DateField(
+                        blank=True,
+                        db_index=True,
+                        help_text="Month of the first donation",
+                        null=True,
+                        verbose_name="Cohort",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Donor Statistics",
+                "verbose_name_plural": "Donor Statistics",
+            },
+        ),
+        migrations.RunPython(build_donor_stats, migrations.RunPython.noop),
+    ]
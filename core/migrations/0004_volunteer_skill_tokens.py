@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:28
+
+from django.db import migrations, models
+
+from core.routers import run_python_where_migrated
+
+
+def populate_skill_tokens(apps, schema_editor):
+    from core.skills import skill_tokens
+
+    Volunteer = apps.get_model("core", "Volunteer")
+    db_alias = schema_editor.connection.alias
+    volunteers = list(Volunteer.objects.using(db_alias).only("skills"))
+    for volunteer in volunteers:
+        volunteer.skill_tokens = " ".join(skill_tokens(volunteer.skills))
+    Volunteer.objects.using(db_alias).bulk_update(
+        volunteers, ["skill_tokens"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_donorstats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="volunteer",
+            name="skill_tokens",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        run_python_where_migrated("volunteer", populate_skill_tokens),
+    ]
@@ -1,6 +1,8 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser, Group, Permission
 from django.utils.translation import gettext_lazy as _
+from decimal import Decimal
 import random
 import string
 
@@ -97,9 +99,12 @@ class CustomUser(AbstractUser):
 def generate_donor_id():
     """Generate a unique 9-digit donor ID"""
     from core.models import Donor
+    from core.lookup import donor_ids
     while True:
         donor_id = ''.join(random.choices(string.digits, k=9))
-        if not Donor.objects.filter(donor_id=donor_id).exists():
+        # The index (if this process has loaded it) also holds other community databases' IDs;
+        # its database fallback is left to public lookups
+        if not donor_ids.loaded_contains(donor_id) and not Donor.objects.filter(donor_id=donor_id).exists():
             return donor_id
 
 
@@ -129,6 +134,12 @@ class Donor(models.Model):
         help_text=_("If checked, donor's name will not be publicly displayed")
     )
     notes = models.TextField(blank=True, verbose_name=_("Internal Notes"))
+
+    # Blocking keys for duplicate detection (see core.dedup)
+    name_key = models.CharField(max_length=200, blank=True, editable=False)
+    email_key = models.CharField(max_length=254, blank=True, editable=False, db_index=True)
+    phone_key = models.CharField(max_length=20, blank=True, editable=False, db_index=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -136,10 +147,30 @@ class Donor(models.Model):
         verbose_name = _("Donor")
         verbose_name_plural = _("Donors")
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['community', 'name_key'], name='core_donor_name_key_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.donor_id})"
 
+    def save(self, *args, **kwargs):
+        from core.dedup import blocking_keys
+        self.name_key, self.email_key, self.phone_key = blocking_keys(self.name, self.email, self.phone)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'name_key', 'email_key', 'phone_key'}
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if adding or (update_fields is not None and not {'community', 'community_id'} & set(update_fields)):
+            return
+        # Keep the community denormalized onto donations and allocations
+        from donations.models import DonationAllocation
+        self.donations.exclude(community_id=self.community_id).update(community_id=self.community_id)
+        DonationAllocation.objects.using(self._state.db).filter(donation__donor=self).exclude(
+            community_id=self.community_id
+        ).update(community_id=self.community_id)
+
     def get_display_name(self):
         """Return name for public display (Anonymous if flagged)"""
         return "Anonymous Donor" if self.is_anonymous else self.name
@@ -152,6 +183,109 @@ class Donor(models.Model):
         )['total'] or 0
 
 
+def base_currency_amount(prefix=''):
+    """Expression converting a donation amount to settings.BASE_CURRENCY"""
+    amount = models.F(f'{prefix}amount')
+    return models.Case(
+        *[
+            models.When(**{f'{prefix}currency': currency}, then=amount * models.Value(Decimal(rate)))
+            for currency, rate in settings.EXCHANGE_RATES.items()
+        ],
+        default=amount,
+        output_field=models.DecimalField(max_digits=14, decimal_places=2)
+    )
+
+
+class DonorStats(models.Model):
+    """Precomputed giving history of a donor (recency, frequency, lifetime value, cohort)"""
+
+    donor = models.OneToOneField(
+        Donor,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name=_("Donor")
+    )
+    first_donation_date = models.DateField(null=True, blank=True, verbose_name=_("First Donation"))
+    last_donation_date = models.DateField(null=True, blank=True, db_index=True, verbose_name=_("Last Donation"))
+    donation_count = models.PositiveIntegerField(default=0, db_index=True, verbose_name=_("Donations"))
+    lifetime_total = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        db_index=True,
+        verbose_name=_("Lifetime Total"),
+        help_text=_("Sum of all donations converted to the base currency")
+    )
+    cohort_month = models.DateField(
+        null=True,
+        blank=True,
+        db_index=True,
+        verbose_name=_("Cohort"),
+        help_text=_("Month of the first donation")
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Donor Statistics")
+        verbose_name_plural = _("Donor Statistics")
+
+    def __str__(self):
+        return f"{self.donor_id}: {self.donation_count} donations"
+
+    @staticmethod
+    def _from_aggregates(donor_id, first, last, count, total):
+        return DonorStats(
+            donor_id=donor_id,
+            first_donation_date=first,
+            last_donation_date=last,
+            donation_count=count,
+            lifetime_total=total or Decimal('0.00'),
+            cohort_month=first.replace(day=1) if first else None,
+        )
+
+    @classmethod
+    def refresh_for(cls, donor_pk, using=None):
+        """Recompute one donor's row from its donations"""
+        from donations.models import Donation
+        totals = Donation.objects.using(using).filter(donor_id=donor_pk).aggregate(
+            first=models.Min('date_received'),
+            last=models.Max('date_received'),
+            count=models.Count('id'),
+            total=models.Sum(base_currency_amount()),
+        )
+        stats = cls._from_aggregates(donor_pk, **totals)
+        stats.save(using=using)
+        return stats
+
+    @classmethod
+    def rebuild(cls, batch_size=2000):
+        """Recreate every donor's row from one grouped query; returns the row count"""
+        with transaction.atomic(using=router.db_for_write(cls)):
+            return cls._rebuild(batch_size)
+
+    @classmethod
+    def _rebuild(cls, batch_size):
+        rows = Donor.objects.annotate(
+            first=models.Min('donations__date_received'),
+            last=models.Max('donations__date_received'),
+            count=models.Count('donations'),
+            total=models.Sum(base_currency_amount('donations__')),
+        ).values_list('pk', 'first', 'last', 'count', 'total').order_by()
+
+        cls.objects.all().delete()
+        created = 0
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(cls._from_aggregates(*row))
+            if len(batch) == batch_size:
+                cls.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        cls.objects.bulk_create(batch)
+        return created + len(batch)
+
+
 class Volunteer(models.Model):
     """Represents volunteers/members of the organization"""
 
@@ -182,6 +316,8 @@ class Volunteer(models.Model):
         help_text=_("Why do you want to join?")
     )
     is_approved = models.BooleanField(default=False, verbose_name=_("Approved"))
+    # Normalized skill tokens, space separated (see core.skills)
+    skill_tokens = models.TextField(blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -192,3 +328,11 @@ class Volunteer(models.Model):
 
     def __str__(self):
         return f"{self.name} - {self.email}"
+
+    def save(self, *args, **kwargs):
+        from core.skills import skill_tokens
+        self.skill_tokens = ' '.join(skill_tokens(self.skills))
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'skill_tokens'}
+        super().save(*args, **kwargs)
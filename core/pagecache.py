@@ -0,0 +1,50 @@
+"""Whole-page cache for anonymous visitors.
+
+Views opt in with a ``page_cache_tags`` attribute naming the content they
+show, e.g. ``('blog', 'pages')``. ``core.middleware.PageCacheMiddleware``
+keeps their responses to anonymous GET requests, keyed by language, URL and the current
+version of each tag, and answers later requests from the cache before the
+view runs. Only the ``page`` query parameter is part of the key; requests
+with any other parameter are not cached. ``expire_pages('blog')``, called from model signals once a
+change is committed, moves a tag to a new version: every page showing it
+is rendered afresh on its next request and the old entries age out.
+
+Requests from signed-in users or carrying flash messages always reach the
+view, and responses that set cookies or are marked private are never kept.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+
+TAG_VERSION_PREFIX = 'pagecache:tag'
+
+
+def _tag_key(tag):
+    return f'{TAG_VERSION_PREFIX}:{tag}'
+
+
+def tag_versions(tags):
+    """Current version token of each tag, in order (unknown tags get one)"""
+    keys = [_tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid.uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def expire_pages(*tags, using=DEFAULT_DB_ALIAS):
+    """Stop serving cached pages showing any of ``tags`` once the current transaction commits"""
+    def expire():
+        cache.set_many({_tag_key(tag): uuid.uuid4().hex for tag in tags}, None)
+    transaction.on_commit(expire, using=using)
+
+
+def page_cache_tags(view_func):
+    """Tags a resolved view declared, or None if its pages are not cached"""
+    view = getattr(view_func, 'view_class', view_func)
+    return getattr(view, 'page_cache_tags', None)
+
@@ -0,0 +1,162 @@
+"""Precomputed "related items" recommendations from TF-IDF similarity.
+
+Each item (a blog post, a project) is a bag of terms from its English and
+Urdu text. Terms are weighted by TF-IDF, vectors are L2-normalized, and an
+item's neighbours are the items with the highest cosine similarity. The
+vectors are sparse, so similarities are accumulated through an inverted
+index: only items sharing at least one term with an item are ever scored.
+
+A ``Recommender`` stores each item's top neighbours in a table with
+``source``/``target`` foreign keys, ``score`` and ``rank``. ``rebuild``
+recomputes the whole table; ``refresh`` recomputes only the lists a change
+can affect, and is called from signals whenever an item's text changes.
+"""
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, Min
+
+from .text import stem
+
+
+# Words too common in either language to say what an item is about
+STOPWORDS = {
+    'about', 'after', 'all', 'also', 'and', 'are', 'been', 'but', 'can', 'for', 'from', 'had',
+    'has', 'have', 'her', 'his', 'its', 'more', 'not', 'our', 'out', 'she', 'such', 'than',
+    'that', 'the', 'their', 'them', 'then', 'there', 'these', 'they', 'this', 'those', 'through',
+    'was', 'were', 'what', 'when', 'which', 'who', 'will', 'with', 'would', 'you', 'your',
+    'اور', 'ایک', 'بھی', 'تھا', 'تھی', 'تھے', 'سے', 'لیے', 'لئے', 'میں', 'نے', 'کا', 'کہ', 'کو',
+    'کی', 'کے', 'ہو', 'ہوا', 'ہوں', 'ہی', 'ہیں', 'ہے', 'یہ', 'وہ', 'پر', 'گیا', 'گئی', 'جو', 'اس',
+}
+
+# Neighbours scoring below this share too little to be worth showing
+MIN_SCORE = 0.05
+
+TOP_K = getattr(settings, 'RELATED_CONTENT_COUNT', 4)
+
+
+def terms(text):
+    """Normalized, stemmed terms of a text, repeats included"""
+    normalized = unicodedata.normalize('NFKC', text or '').lower()
+    for token in re.split(r'[\W_]+', normalized):
+        if not token or token in STOPWORDS or token.isdigit():
+            continue
+        if len(token) > 2 or not token.isascii():
+            yield stem(token)
+
+
+def tfidf_vectors(documents):
+    """``{pk: {term: weight}}`` unit vectors for ``{pk: [(text, field weight), ...]}``"""
+    counts = {}
+    for pk, fields in documents.items():
+        bag = Counter()
+        for text, weight in fields:
+            for term in terms(text):
+                bag[term] += weight
+        counts[pk] = bag
+    frequency = Counter(term for bag in counts.values() for term in bag)
+    total = len(counts)
+    idf = {term: math.log((1 + total) / (1 + df)) + 1 for term, df in frequency.items()}
+
+    vectors = {}
+    for pk, bag in counts.items():
+        vector = {term: (1 + math.log(count)) * idf[term] for term, count in bag.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        vectors[pk] = {term: weight / norm for term, weight in vector.items()} if norm else {}
+    return vectors
+
+
+class _Similarities:
+    """Cosine similarities between the vectors of one corpus"""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.postings = {}
+        for pk, vector in vectors.items():
+            for term, weight in vector.items():
+                self.postings.setdefault(term, []).append((pk, weight))
+
+    def scores(self, pk):
+        """``{other pk: similarity}`` of every item sharing a term with ``pk``"""
+        scores = Counter()
+        for term, weight in self.vectors[pk].items():
+            for other, other_weight in self.postings[term]:
+                scores[other] += weight * other_weight
+        del scores[pk]
+        return scores
+
+    def neighbours(self, pk, k):
+        """Best ``k`` ``(other pk, similarity)``, most similar (then lowest pk) first"""
+        candidates = ((other, score) for other, score in self.scores(pk).items() if score >= MIN_SCORE)
+        return heapq.nsmallest(k, candidates, key=lambda item: (-item[1], item[0]))
+
+
+class Recommender:
+    """Keeps a related-items table current for one model.
+
+    ``related_model`` is the label of the table, ``load_documents(using)``
+    returns ``{pk: [(text, field weight), ...]}`` for every item that may be
+    recommended (e.g. published posts only).
+    """
+
+    def __init__(self, related_model, load_documents, top_k=TOP_K):
+        self.related_model = related_model
+        self.load_documents = load_documents
+        self.top_k = top_k
+
+    @property
+    def model(self):
+        return apps.get_model(self.related_model)
+
+    def _rows(self, similarities, pks):
+        return [
+            self.model(source_id=pk, target_id=other, score=round(score, 6), rank=rank)
+            for pk in pks
+            for rank, (other, score) in enumerate(similarities.neighbours(pk, self.top_k), 1)
+        ]
+
+    def rebuild(self, using=DEFAULT_DB_ALIAS):
+        """Recompute every item's neighbours; returns the number of items"""
+        similarities = _Similarities(tfidf_vectors(self.load_documents(using)))
+        rows = self._rows(similarities, similarities.vectors)
+        with transaction.atomic(using=using):
+            self.model.objects.using(using).all().delete()
+            self.model.objects.using(using).bulk_create(rows, batch_size=1000)
+        return len(similarities.vectors)
+
+    def refresh(self, pks, using=DEFAULT_DB_ALIAS):
+        """Update the table after the items ``pks`` changed, were hidden or were deleted.
+
+        Recomputes the changed items' own lists, the lists that currently
+        include them, and the lists they now rank high enough to enter.
+        Term weights of unchanged items drift slightly as the corpus grows;
+        a periodic ``rebuild`` corrects that.
+        """
+        Related = self.model.objects.using(using)
+        similarities = _Similarities(tfidf_vectors(self.load_documents(using)))
+        changed = set(pks)
+        affected = changed | set(Related.filter(target__in=changed).values_list('source_id', flat=True))
+
+        stored = {
+            source: (count, lowest)
+            for source, count, lowest in Related.values('source_id').annotate(
+                count=Count('pk'), lowest=Min('score')
+            ).values_list('source_id', 'count', 'lowest')
+        }
+        for pk in changed & similarities.vectors.keys():
+            for other, score in similarities.scores(pk).items():
+                count, lowest = stored.get(other, (0, 0))
+                if score >= MIN_SCORE and (count < self.top_k or score > lowest):
+                    affected.add(other)
+
+        rows = self._rows(similarities, affected & similarities.vectors.keys())
+        with transaction.atomic(using=using):
+            Related.filter(source__in=affected).delete()
+            Related.bulk_create(rows)
+        return len(affected)
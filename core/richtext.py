@@ -0,0 +1,256 @@
+"""Save-time rendering of CKEditor (RichTextField) content.
+
+``render_rich_text`` turns editor HTML into what templates output as is:
+
+* only allowlisted tags, attributes, inline styles and URL schemes are kept;
+  scripts, styles and event handlers are dropped along with their content
+* images get ``loading="lazy"``, ``decoding="async"`` and their pixel size,
+  and uploaded images get a ``srcset`` of downscaled renditions
+* ``<h2>``/``<h3>`` headings get stable ids, and documents with enough of them
+  are prefixed with a table of contents
+"""
+import io
+import os
+import re
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils.text import slugify
+from django.utils.translation import gettext as _
+
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'caption', 'cite', 'code', 'div', 'em', 'figcaption',
+    'figure', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'img', 'li', 'ol', 'p', 'pre', 's',
+    'small', 'span', 'strong', 'sub', 'sup', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr',
+    'u', 'ul',
+}
+# Dropped together with everything inside them
+DROPPED_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'noscript', 'template', 'svg', 'math'}
+VOID_TAGS = {'br', 'hr', 'img'}
+
+GLOBAL_ATTRIBUTES = {'dir', 'lang', 'title', 'style'}
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'target'},
+    'img': {'src', 'alt', 'width', 'height'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan', 'scope'},
+    'ol': {'start'},
+}
+ALLOWED_STYLES = {
+    'text-align', 'float', 'width', 'height', 'margin', 'margin-left', 'margin-right',
+    'color', 'background-color', 'font-weight', 'font-style', 'text-decoration',
+}
+URL_ATTRIBUTES = {'href', 'src'}
+ALLOWED_SCHEMES = {'', 'http', 'https', 'mailto', 'tel'}
+
+TOC_LEVELS = {'h2', 'h3'}
+# Headings needed before a table of contents is worth showing
+TOC_MIN_HEADINGS = 3
+
+# Rendition widths for uploaded images, and the content column they are laid out in
+IMAGE_WIDTHS = getattr(settings, 'RICH_TEXT_IMAGE_WIDTHS', [480, 960, 1440])
+IMAGE_SIZES = '(max-width: 992px) 100vw, 800px'
+RESIZABLE_FORMATS = {'JPEG', 'PNG', 'WEBP'}
+
+
+def _clean_style(value):
+    declarations = []
+    for declaration in value.split(';'):
+        name, _sep, val = declaration.partition(':')
+        name, val = name.strip().lower(), val.strip()
+        if name in ALLOWED_STYLES and val and not re.search(r'url\(|expression|[<>"\\]', val, re.I):
+            declarations.append(f'{name}: {val}')
+    return '; '.join(declarations)
+
+
+def _clean_url(value):
+    value = value.strip()
+    # Browsers ignore control characters and whitespace in schemes ("java\tscript:")
+    scheme = urlsplit(re.sub(r'[\x00-\x20]', '', value)).scheme.lower()
+    return value if scheme in ALLOWED_SCHEMES else None
+
+
+def _media_name(url):
+    """Storage name of an uploaded file referenced by URL, if it is one"""
+    path = urlsplit(url).path
+    if settings.MEDIA_URL and path.startswith(settings.MEDIA_URL):
+        return unquote(path[len(settings.MEDIA_URL):])
+    return None
+
+
+def _rendition_name(name, width):
+    root, ext = os.path.splitext(name)
+    return f'{root}-{width}w{ext}'
+
+
+def image_info(url):
+    """``(width, height, srcset)`` for an uploaded image; Nones when unknown"""
+    from PIL import Image
+
+    name = _media_name(url)
+    if not name or not default_storage.exists(name):
+        return None, None, None
+    try:
+        with default_storage.open(name) as file, Image.open(file) as image:
+            width, height = image.size
+            srcset = []
+            if image.format in RESIZABLE_FORMATS:
+                for target in IMAGE_WIDTHS:
+                    if target >= width:
+                        break
+                    rendition = _rendition_name(name, target)
+                    if not default_storage.exists(rendition):
+                        resized = image.resize((target, round(height * target / width)), Image.LANCZOS)
+                        buffer = io.BytesIO()
+                        resized.save(buffer, format=image.format)
+                        default_storage.save(rendition, ContentFile(buffer.getvalue()))
+                    srcset.append(f'{default_storage.url(rendition)} {target}w')
+            if srcset:
+                srcset.append(f'{url} {width}w')
+    except (OSError, ValueError):
+        # Not an image Pillow can read; leave the tag as it is
+        return None, None, None
+    return width, height, ', '.join(srcset) or None
+
+
+class _Renderer(HTMLParser):
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.open_tags = []
+        # Dropped element being skipped, and how deeply it nests in itself
+        self.dropping, self.drop_depth = None, 0
+        self.headings = []
+        self.heading = None
+        self.slugs = set()
+
+    def _attributes(self, tag, attrs):
+        allowed = GLOBAL_ATTRIBUTES | ALLOWED_ATTRIBUTES.get(tag, set())
+        cleaned = {}
+        for name, value in attrs:
+            name = name.lower()
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRIBUTES:
+                value = _clean_url(value)
+            elif name == 'style':
+                value = _clean_style(value)
+            # An empty alt marks a decorative image, so it is kept
+            if value or name == 'alt':
+                cleaned[name] = value
+        if tag == 'a' and cleaned.get('target') == '_blank':
+            cleaned['rel'] = 'noopener noreferrer'
+        if tag == 'img':
+            self._image_attributes(cleaned)
+        return cleaned
+
+    def _image_attributes(self, attrs):
+        attrs['loading'] = 'lazy'
+        attrs['decoding'] = 'async'
+        if not attrs.get('src'):
+            return
+        width, height, srcset = image_info(attrs['src'])
+        if width and not ('width' in attrs or 'height' in attrs):
+            attrs['width'], attrs['height'] = str(width), str(height)
+        if srcset:
+            attrs['srcset'] = srcset
+            attrs['sizes'] = IMAGE_SIZES
+
+    @staticmethod
+    def _tag(tag, attrs):
+        rendered = ''.join(f' {name}="{escape(value)}"' for name, value in attrs.items())
+        return f'<{tag}{rendered}>'
+
+    def handle_starttag(self, tag, attrs):
+        if self.dropping:
+            self.drop_depth += tag == self.dropping
+            return
+        if tag in DROPPED_TAGS:
+            self.dropping, self.drop_depth = tag, 1
+            return
+        if tag not in ALLOWED_TAGS:
+            return
+        attrs = self._attributes(tag, attrs)
+        if tag in TOC_LEVELS and self.heading is None:
+            # The id is filled in once the heading's text is known
+            self.heading = (tag, attrs, len(self.out), [])
+            self.out.append('')
+        else:
+            self.out.append(self._tag(tag, attrs))
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self.dropping:
+            if tag == self.dropping:
+                self.drop_depth -= 1
+                if not self.drop_depth:
+                    self.dropping = None
+            return
+        if tag not in self.open_tags:
+            return
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            if self.heading and open_tag == self.heading[0]:
+                self._close_heading()
+            self.out.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+
+    def _close_heading(self):
+        tag, attrs, position, text = self.heading
+        self.heading = None
+        title = ' '.join(''.join(text).split())
+        base = slugify(title, allow_unicode=True) or 'section'
+        slug, counter = base, 2
+        while slug in self.slugs:
+            slug, counter = f'{base}-{counter}', counter + 1
+        self.slugs.add(slug)
+        self.out[position] = self._tag(tag, {'id': slug, **attrs})
+        if title:
+            self.headings.append((tag, slug, title))
+
+    def handle_data(self, data):
+        if self.dropping:
+            return
+        if self.heading:
+            self.heading[3].append(data)
+        self.out.append(escape(data, quote=False))
+
+    def render(self, html):
+        self.feed(html or '')
+        self.close()
+        self.dropping = None
+        while self.open_tags:
+            self.handle_endtag(self.open_tags[-1])
+        return ''.join(self.out)
+
+
+def _table_of_contents(headings):
+    items = []
+    for tag, slug, title in headings:
+        css = ' class="toc-sub"' if tag == 'h3' else ''
+        items.append(f'<li{css}><a href="#{escape(slug)}">{escape(title, quote=False)}</a></li>')
+    return (
+        f'<nav class="toc" aria-label="{escape(_("Contents"))}"><ol>{"".join(items)}</ol></nav>'
+    )
+
+
+def render_rich_text(html):
+    """Sanitized, display-ready HTML for stored rich text (see module docstring)"""
+    renderer = _Renderer()
+    body = renderer.render(html)
+    if len(renderer.headings) >= TOC_MIN_HEADINGS:
+        return _table_of_contents(renderer.headings) + body
+    return body
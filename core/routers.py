@@ -0,0 +1,352 @@
+"""Optional per-community database routing.
+
+When ``settings.COMMUNITY_DATABASES`` maps community types to database
+aliases, each community's donors, donations, allocations, projects, project
+updates, recoveries and related-project lists live in that community's
+database. Communities and project categories are shared: they are written to
+the default database and replicated to every community database with the
+same primary keys, so foreign keys resolve locally. Everything else stays
+on the default database.
+
+Reads of partitioned models go to the database pinned for the current
+context (see ``use_community_database`` and CommunityDatabaseMiddleware) or
+follow the instance they were reached from. Cross-community reads use
+``fan_out`` / ``get_from_any`` (``afan_out`` / ``aget_from_any`` in async
+views, and ``FannedOutQuerySet`` to paginate them).
+
+Primary keys of partitioned tables must not collide across community
+databases (public URLs use project pks): the n-th database of
+COMMUNITY_DATABASES numbers its rows from ``n * PK_STRIDE + 1``
+(``pk_range``). ``manage.py migrate --database=<alias>`` moves the
+sequences there, so the order of COMMUNITY_DATABASES must not change once
+data is written, and the ``core.E001`` check refuses databases holding
+rows outside their range. A pk therefore names its database
+(``database_for_pk``). With no COMMUNITY_DATABASES configured the router
+defers to Django's defaults and the helpers act on the queryset as is.
+"""
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from heapq import merge
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models.fields import AutoFieldMixin
+
+
+PARTITIONED_MODELS = {
+    'core.donor',
+    'core.donorstats',
+    'donations.donation',
+    'donations.donationallocation',
+    'projects.project',
+    'projects.projectupdate',
+    'projects.recovery',
+    'projects.relatedproject',
+}
+
+SHARED_MODELS = {
+    'core.community',
+    'projects.projectcategory',
+}
+
+# Width of each community database's primary key range
+PK_STRIDE = 10 ** 12
+
+_active_database = contextvars.ContextVar('community_database', default=None)
+
+# Community pk -> community_type, read once from the default database
+_community_types = {}
+
+
+def routing_enabled():
+    return bool(getattr(settings, 'COMMUNITY_DATABASES', None))
+
+
+def community_databases():
+    """Aliases holding partitioned data (just the default one when routing is off)"""
+    if not routing_enabled():
+        return [DEFAULT_DB_ALIAS]
+    return list(dict.fromkeys(settings.COMMUNITY_DATABASES.values()))
+
+
+def pk_range(alias):
+    """``(first, last)`` primary key of partitioned rows in community database ``alias``"""
+    index = community_databases().index(alias)
+    return index * PK_STRIDE + 1, (index + 1) * PK_STRIDE
+
+
+def database_for_pk(pk):
+    """Community database whose range holds ``pk`` (None when routing is off or it is out of range)"""
+    if not routing_enabled():
+        return None
+    try:
+        index = (int(pk) - 1) // PK_STRIDE
+    except (TypeError, ValueError):
+        return None
+    aliases = community_databases()
+    return aliases[index] if 0 <= index < len(aliases) else None
+
+
+def sequenced_models():
+    """Partitioned models whose primary keys come from a sequence"""
+    from django.apps import apps
+    return [
+        model for model in map(apps.get_model, sorted(PARTITIONED_MODELS))
+        if isinstance(model._meta.pk, AutoFieldMixin)
+    ]
+
+
+def sequence_value(connection, table, column):
+    """Last value a table's primary key sequence handed out (None where the backend is not supported)"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('SELECT seq FROM sqlite_sequence WHERE name = %s', [table])
+        elif connection.vendor == 'postgresql':
+            cursor.execute('SELECT pg_get_serial_sequence(%s, %s)', [table, column])
+            sequence = cursor.fetchone()[0]
+            cursor.execute(f'SELECT CASE WHEN is_called THEN last_value ELSE last_value - 1 END FROM {sequence}')
+        else:
+            return None
+        row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def set_pk_offsets(using):
+    """Move the sequences of ``using``'s partitioned tables up to its range (never back)"""
+    if not routing_enabled() or using not in community_databases():
+        return
+    start = pk_range(using)[0] - 1
+    if not start:
+        return
+    connection = connections[using]
+    tables = set(connection.introspection.table_names())
+    for model in sequenced_models():
+        table, column = model._meta.db_table, model._meta.pk.column
+        if table not in tables:
+            continue
+        current = sequence_value(connection, table, column)
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                if current == 0:
+                    cursor.execute('DELETE FROM sqlite_sequence WHERE name = %s', [table])
+                    cursor.execute('INSERT INTO sqlite_sequence (name, seq) VALUES (%s, %s)', [table, start])
+                elif current < start:
+                    cursor.execute('UPDATE sqlite_sequence SET seq = %s WHERE name = %s', [start, table])
+            elif connection.vendor == 'postgresql':
+                if current < start:
+                    cursor.execute('SELECT setval(pg_get_serial_sequence(%s, %s), %s)', [table, column, start])
+            elif connection.vendor == 'mysql':
+                # Ignored by MySQL when rows already go higher
+                cursor.execute(f'ALTER TABLE {connection.ops.quote_name(table)} AUTO_INCREMENT = {start + 1}')
+
+
+def database_for_community(community_id):
+    """Alias of the database holding a community's data"""
+    if not routing_enabled() or community_id is None:
+        return None
+    if community_id not in _community_types:
+        from .models import Community
+        _community_types.update(
+            Community.objects.using(DEFAULT_DB_ALIAS).values_list('pk', 'community_type')
+        )
+    return settings.COMMUNITY_DATABASES.get(_community_types.get(community_id))
+
+
+@contextmanager
+def use_community_database(alias):
+    """Route reads and writes of partitioned models without other hints to ``alias``"""
+    token = _active_database.set(alias)
+    try:
+        yield
+    finally:
+        _active_database.reset(token)
+
+
+def _run_on(alias, queryset):
+    try:
+        return list(queryset.using(alias))
+    finally:
+        # Worker threads open their own connections; don't leak them
+        connections[alias].close()
+
+
+def fan_out(queryset, key=None, reverse=False):
+    """Evaluate ``queryset`` on every community database and merge the rows.
+
+    Databases are queried concurrently. ``key``/``reverse`` must match the
+    queryset's ordering so per-database results can be merged in order.
+    Returns the queryset untouched when there is a single database.
+    """
+    aliases = community_databases()
+    if len(aliases) == 1:
+        return queryset
+    with ThreadPoolExecutor(max_workers=len(aliases)) as executor:
+        results = list(executor.map(lambda alias: _run_on(alias, queryset), aliases))
+    if key is None:
+        return [row for rows in results for row in rows]
+    return list(merge(*results, key=key, reverse=reverse))
+
+
+def get_from_any(queryset, **lookup):
+    """``queryset.get(**lookup)`` against whichever community database holds the row"""
+    aliases = community_databases()
+    if len(aliases) == 1:
+        return queryset.get(**lookup)
+    if set(lookup) == {'pk'}:
+        # A primary key names its database
+        alias = database_for_pk(lookup['pk'])
+        if alias is None:
+            raise queryset.model.DoesNotExist(f'{queryset.model._meta.object_name} matching query does not exist.')
+        return queryset.using(alias).get(**lookup)
+    for alias in aliases:
+        try:
+            return queryset.using(alias).get(**lookup)
+        except queryset.model.DoesNotExist:
+            continue
+    raise queryset.model.DoesNotExist(f'{queryset.model._meta.object_name} matching query does not exist.')
+
+
+async def afan_out(queryset, key=None, reverse=False):
+    """``fan_out`` for async views: a list of the rows of every community database"""
+    aliases = community_databases()
+    if len(aliases) == 1:
+        return [row async for row in queryset]
+    results = await asyncio.gather(*(_alist(queryset.using(alias)) for alias in aliases))
+    if key is None:
+        return [row for rows in results for row in rows]
+    return list(merge(*results, key=key, reverse=reverse))
+
+
+class FannedOutQuerySet:
+    """A queryset read from every community database, for async pagination.
+
+    ``acount`` adds up one COUNT per database. A slice ``[start:stop]`` is
+    iterated with ``async for``: it loads the first ``stop`` rows of each
+    database and merges them, so a page costs up to its end position per
+    database rather than every row. ``key``/``reverse`` must match the
+    queryset's ordering, as for ``fan_out``.
+    """
+
+    def __init__(self, queryset, key, reverse=False, start=0, stop=None):
+        self.queryset = queryset
+        self.key = key
+        self.reverse = reverse
+        self.start = start
+        self.stop = stop
+
+    async def acount(self):
+        counts = await asyncio.gather(*(self.queryset.using(alias).acount() for alias in community_databases()))
+        return sum(counts)
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice) or item.step is not None or self.start or self.stop is not None:
+            raise TypeError('FannedOutQuerySet only supports a single slice without a step')
+        return FannedOutQuerySet(self.queryset, self.key, self.reverse, item.start or 0, item.stop)
+
+    async def _rows(self):
+        queryset = self.queryset if self.stop is None else self.queryset[:self.stop]
+        for row in (await afan_out(queryset, key=self.key, reverse=self.reverse))[self.start:self.stop]:
+            yield row
+
+    def __aiter__(self):
+        return self._rows()
+
+
+async def aget_from_any(queryset, **lookup):
+    """``get_from_any`` for async views"""
+    aliases = community_databases()
+    if len(aliases) == 1:
+        return await queryset.aget(**lookup)
+    if set(lookup) == {'pk'}:
+        alias = database_for_pk(lookup['pk'])
+        if alias is None:
+            raise queryset.model.DoesNotExist(f'{queryset.model._meta.object_name} matching query does not exist.')
+        return await queryset.using(alias).aget(**lookup)
+    for alias in aliases:
+        try:
+            return await queryset.using(alias).aget(**lookup)
+        except queryset.model.DoesNotExist:
+            continue
+    raise queryset.model.DoesNotExist(f'{queryset.model._meta.object_name} matching query does not exist.')
+
+
+async def _alist(queryset):
+    return [row async for row in queryset]
+
+
+def _label(model):
+    return model._meta.label_lower
+
+
+def _instance_database(instance):
+    """Community database an instance of a partitioned model belongs to"""
+    if instance._state.db:
+        return instance._state.db
+    alias = database_for_community(getattr(instance, 'community_id', None))
+    if alias:
+        return alias
+    # ProjectUpdate/Recovery/DonorStats follow their (already loaded) parent
+    for parent in ('project', 'donor', 'donation'):
+        try:
+            related = instance._meta.get_field(parent).get_cached_value(instance, None)
+        except FieldDoesNotExist:
+            continue
+        if related is not None:
+            return _instance_database(related)
+    return _active_database.get()
+
+
+class CommunityRouter:
+    """Database router placing each community's operational data in its own database"""
+
+    def _route(self, model, **hints):
+        if not routing_enabled():
+            return None
+        label = _label(model)
+        if label in SHARED_MODELS:
+            return DEFAULT_DB_ALIAS
+        if label not in PARTITIONED_MODELS:
+            return None
+        instance = hints.get('instance')
+        if instance is not None:
+            hinted = _label(type(instance))
+            if hinted in PARTITIONED_MODELS:
+                return _instance_database(instance)
+            # Assigning a community to a new row (``Project(community=...)``)
+            if hinted == 'core.community':
+                return database_for_community(instance.pk) or _active_database.get()
+        return _active_database.get()
+
+    db_for_read = _route
+    db_for_write = _route
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if not routing_enabled():
+            return None
+        if _label(type(obj1)) in SHARED_MODELS or _label(type(obj2)) in SHARED_MODELS:
+            return True
+        if obj1._state.db and obj2._state.db:
+            return obj1._state.db == obj2._state.db
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if not routing_enabled() or db == DEFAULT_DB_ALIAS or model_name is None:
+            return None
+        if db in community_databases():
+            label = f'{app_label}.{model_name}'
+            return label in PARTITIONED_MODELS or label in SHARED_MODELS
+        return None
+
+
+def run_python_where_migrated(model_name, code, reverse_code=None):
+    """``RunPython`` for the rows of ``model_name``, run only on databases where its table is migrated.
+
+    Without the hint, ``allow_migrate`` cannot tell what the code touches and
+    Django runs it on every database, including community databases that
+    have no such table.
+    """
+    from django.db.migrations import RunPython
+    return RunPython(code, reverse_code or RunPython.noop, hints={'model_name': model_name})
@@ -0,0 +1,137 @@
+"""Community scoping for manager-facing querysets"""
+from urllib.parse import parse_qs
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.utils import unquote
+from django.utils.translation import gettext_lazy as _
+
+from .routers import (
+    PARTITIONED_MODELS, community_databases, database_for_pk, routing_enabled, use_community_database,
+)
+
+# Scope of directors and superusers
+ALL_COMMUNITIES = object()
+
+
+def community_scope(request):
+    """Resolve, once per request, which community the user may see.
+
+    Returns ALL_COMMUNITIES, a community id, or None when the user has no
+    community (and therefore sees nothing).
+    """
+    try:
+        return request._community_scope
+    except AttributeError:
+        pass
+    user = request.user
+    if user.is_superuser or user.role == 'DIRECTOR':
+        scope = ALL_COMMUNITIES
+    else:
+        # The id is on the user row already; no need to load the Community
+        scope = user.community_id
+    request._community_scope = scope
+    return scope
+
+
+def scope_queryset(queryset, request, community_field='community'):
+    """Restrict ``queryset`` to the request user's community"""
+    scope = community_scope(request)
+    if scope is ALL_COMMUNITIES:
+        return queryset
+    if scope is None:
+        return queryset.none()
+    return queryset.filter(**{f'{community_field}_id': scope})
+
+
+class CommunityDatabaseFilter(admin.SimpleListFilter):
+    """Which community database a director's changelist reads (see CommunityScopedAdminMixin)"""
+    title = _('database')
+    parameter_name = 'database'
+
+    def lookups(self, request, model_admin):
+        types = {alias: community_type for community_type, alias in settings.COMMUNITY_DATABASES.items()}
+        return [(alias, types[alias]) for alias in community_databases()]
+
+    def queryset(self, request, queryset):
+        # The view already runs on the chosen database
+        return queryset
+
+    def choices(self, changelist):
+        # One database at a time: no "All"
+        current = self.value() or self.lookup_choices[0][0]
+        for alias, label in self.lookup_choices:
+            yield {
+                'selected': alias == current,
+                'query_string': changelist.get_query_string({self.parameter_name: alias}),
+                'display': label,
+            }
+
+
+class CommunityScopedAdminMixin:
+    """ModelAdmin mixin limiting managers to their own community's rows.
+
+    ``community_field`` is the path to the community foreign key; models that
+    are queried often carry a denormalized ``community`` column so the filter
+    stays on the model's own table.
+
+    With COMMUNITY_DATABASES, managers are pinned to their community's
+    database by core.middleware; directors pick the database of a
+    partitioned model's changelist with CommunityDatabaseFilter, and its
+    objects open on the database their pk belongs to.
+    """
+    community_field = 'community'
+
+    def get_queryset(self, request):
+        return scope_queryset(super().get_queryset(request), request, self.community_field)
+
+    def community_database(self, request, object_id=None):
+        """Database a director's view of this model reads, or None to leave routing alone"""
+        if (
+            not routing_enabled()
+            or self.model._meta.label_lower not in PARTITIONED_MODELS
+            or community_scope(request) is not ALL_COMMUNITIES
+        ):
+            return None
+        aliases = community_databases()
+        if object_id is not None:
+            return database_for_pk(unquote(object_id)) or aliases[0]
+        alias = request.GET.get(CommunityDatabaseFilter.parameter_name)
+        if alias is None:
+            # Add and delete forms carry the changelist's filters along
+            filters = parse_qs(request.GET.get('_changelist_filters', ''))
+            alias = filters.get(CommunityDatabaseFilter.parameter_name, [None])[0]
+        return alias if alias in aliases else aliases[0]
+
+    def get_list_filter(self, request):
+        list_filter = super().get_list_filter(request)
+        if self.community_database(request) is None:
+            return list_filter
+        return [CommunityDatabaseFilter, *list_filter]
+
+    def _pinned(self, alias, view, *args, **kwargs):
+        if alias is None:
+            # Managers stay on the database the middleware chose
+            return view(*args, **kwargs)
+        with use_community_database(alias):
+            response = view(*args, **kwargs)
+            # Templates load lazily; render while still on the database
+            if hasattr(response, 'render'):
+                response.render()
+        return response
+
+    def changelist_view(self, request, extra_context=None):
+        alias = self.community_database(request)
+        return self._pinned(alias, super().changelist_view, request, extra_context)
+
+    def changeform_view(self, request, object_id=None, form_url='', extra_context=None):
+        alias = self.community_database(request, object_id)
+        return self._pinned(alias, super().changeform_view, request, object_id, form_url, extra_context)
+
+    def delete_view(self, request, object_id, extra_context=None):
+        alias = self.community_database(request, object_id)
+        return self._pinned(alias, super().delete_view, request, object_id, extra_context)
+
+    def history_view(self, request, object_id, extra_context=None):
+        alias = self.community_database(request, object_id)
+        return self._pinned(alias, super().history_view, request, object_id, extra_context)
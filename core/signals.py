@@ -0,0 +1,97 @@
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from donations.models import Donation
+from projects.models import ProjectCategory
+from .lookup import donor_ids
+from .models import Community, Donor, DonorStats, Volunteer
+from .routers import community_databases, routing_enabled, set_pk_offsets
+from .skills import invalidate_matches, skill_index
+
+
+@receiver(post_save, sender=Donor)
+def add_donor_to_lookup_index(sender, instance, created, **kwargs):
+    """Make new donor IDs resolvable by the public lookup"""
+    if created:
+        donor_ids.add(instance.donor_id)
+
+
+@receiver(post_delete, sender=Donor)
+def remove_donor_from_lookup_index(sender, instance, **kwargs):
+    """Stop resolving deleted donor IDs"""
+    donor_ids.discard(instance.donor_id)
+
+
+@receiver(post_save, sender=Volunteer)
+def reindex_volunteer(sender, instance, raw=False, using=None, **kwargs):
+    """Keep the skill index and cached shortlists in step with approvals and edits"""
+    if raw:
+        return
+    skill_index.update(instance)
+    # Other processes reload their index then, so not before the change is visible to them
+    transaction.on_commit(invalidate_matches, using=using)
+
+
+@receiver(post_delete, sender=Volunteer)
+def unindex_volunteer(sender, instance, using=None, **kwargs):
+    """Drop deleted volunteers from the skill index"""
+    skill_index.discard(instance.pk)
+    transaction.on_commit(invalidate_matches, using=using)
+
+
+@receiver(pre_save, sender=Donation)
+def remember_previous_donor(sender, instance, raw=False, **kwargs):
+    """Note the donor a donation is being moved away from"""
+    if instance.pk and not raw:
+        instance._previous_donor_id = (
+            Donation.objects.using(kwargs.get('using'))
+            .filter(pk=instance.pk).values_list('donor_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Donation)
+@receiver(post_delete, sender=Donation)
+def refresh_donor_stats(sender, instance, **kwargs):
+    """Keep DonorStats current for the donors touched by a donation write"""
+    if kwargs.get('raw'):
+        return
+    using = kwargs.get('using')
+    DonorStats.refresh_for(instance.donor_id, using=using)
+    previous = getattr(instance, '_previous_donor_id', None)
+    if previous and previous != instance.donor_id:
+        DonorStats.refresh_for(previous, using=using)
+
+
+@receiver(post_save, sender=Community)
+@receiver(post_save, sender=ProjectCategory)
+def replicate_shared_row(sender, instance, raw=False, using=None, **kwargs):
+    """Copy shared rows to every community database so foreign keys resolve there"""
+    # Replica saves land here too; only writes to the primary copy fan out
+    if raw or not routing_enabled() or using != DEFAULT_DB_ALIAS:
+        return
+    values = {
+        field.attname: getattr(instance, field.attname)
+        for field in sender._meta.concrete_fields if not field.primary_key
+    }
+    for alias in community_databases():
+        if alias != using:
+            sender.objects.using(alias).update_or_create(pk=instance.pk, defaults=values)
+
+
+@receiver(post_delete, sender=Community)
+@receiver(post_delete, sender=ProjectCategory)
+def remove_shared_row(sender, instance, using=None, **kwargs):
+    """Delete replicated copies of a shared row"""
+    if not routing_enabled() or using != DEFAULT_DB_ALIAS:
+        return
+    for alias in community_databases():
+        if alias != using:
+            sender.objects.using(alias).filter(pk=instance.pk).delete()
+
+
+@receiver(post_migrate)
+def start_community_sequences(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """Number a community database's new rows from its pk range once its tables exist"""
+    if sender.name == 'core' and routing_enabled():
+        set_pk_offsets(using)
@@ -0,0 +1,84 @@
+"""Sitemaps of the public site in every language.
+
+Each app contributes a section (``blog.sitemaps``, ``projects.sitemaps``,
+``pages.sitemaps``); ``sitemap_urls`` serves them as ``sitemap.xml`` (an
+index) and one ``sitemap-<section>.xml`` per section, split into pages of
+at most ``Sitemap.limit`` (50,000) URLs. Every item is listed once per
+language with hreflang alternates. Rendered sitemaps are cached until
+their section's content changes (see core.feeds).
+"""
+from functools import partial
+
+from django.conf import settings
+from django.contrib.sitemaps import Sitemap, views as sitemap_views
+from django.db.models import Max
+from django.http import Http404
+from django.urls import path, reverse
+
+from .feeds import cached_view
+
+
+class BilingualSitemap(Sitemap):
+    """Sitemap section listing each item under every language's URL"""
+
+    i18n = True
+    alternates = True
+    x_default = True
+    # Name of the core.feeds stamp expiring the section; None for static URLs
+    stamp = None
+
+    def lastmod(self, item):
+        return item.updated_at
+
+    def lastmod_querysets(self):
+        """Querysets whose latest ``updated_at`` is the section's lastmod"""
+        return []
+
+    def get_latest_lastmod(self):
+        # One aggregate per database rather than a pass over every item
+        latest = [
+            queryset.aggregate(latest=Max('updated_at'))['latest']
+            for queryset in self.lastmod_querysets()
+        ]
+        return max(filter(None, latest), default=None)
+
+
+class StaticViewSitemap(BilingualSitemap):
+    """Landing pages that are not backed by a model"""
+
+    changefreq = 'weekly'
+
+    def items(self):
+        return ['core:home', 'projects:project_list', 'blog:blog_list', 'core:donate', 'core:volunteer_application']
+
+    def location(self, item):
+        return reverse(item)
+
+    def lastmod(self, item):
+        return None
+
+
+def sitemap_urls(sitemaps):
+    """URL patterns serving the cached sitemap index and its sections"""
+    timeout = getattr(settings, 'SITEMAP_CACHE_TIMEOUT', 86400)
+    stamps = [sitemap.stamp for sitemap in sitemaps.values() if sitemap.stamp]
+    index = cached_view(
+        partial(sitemap_views.index, sitemaps=sitemaps, sitemap_url_name='sitemap_section'), stamps, timeout
+    )
+    sections = {
+        name: cached_view(
+            partial(sitemap_views.sitemap, sitemaps=sitemaps), [sitemap.stamp] if sitemap.stamp else [], timeout,
+            params=('p',),
+        )
+        for name, sitemap in sitemaps.items()
+    }
+
+    def section(request, section):
+        if section not in sections:
+            raise Http404(f'No sitemap available for section: {section!r}')
+        return sections[section](request, section=section)
+
+    return [
+        path('sitemap.xml', index, name='sitemap_index'),
+        path('sitemap-<section>.xml', section, name='sitemap_section'),
+    ]
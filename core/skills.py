@@ -0,0 +1,190 @@
+"""Volunteer skill tokens, an in-memory skill index and project matching"""
+import re
+import threading
+import time
+import unicodedata
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .text import stem
+
+
+# Filler words common in free-text skill descriptions
+STOPWORDS = {
+    'and', 'any', 'are', 'can', 'for', 'from', 'good', 'have', 'help', 'with',
+    'in', 'of', 'on', 'or', 'the', 'to', 'also', 'some', 'very', 'years',
+    'year', 'experience', 'experienced', 'skills', 'skill', 'work', 'working',
+    'know', 'basic', 'etc', 'other', 'all', 'able', 'well', 'like',
+}
+
+# Weights of the ranking signals
+CATEGORY_WEIGHT = 3
+SKILL_WEIGHT = 1
+COMMUNITY_WEIGHT = 2
+
+MATCH_CACHE_PREFIX = 'volunteer-matches'
+MATCH_GENERATION_KEY = f'{MATCH_CACHE_PREFIX}:generation'
+
+
+def skill_tokens(*texts):
+    """Sorted distinct tokens of free text, e.g. 'Tailoring, sewing' -> ['sew', 'tailor']"""
+    tokens = set()
+    for text in texts:
+        normalized = unicodedata.normalize('NFKC', text or '').lower()
+        for token in re.split(r'[\W_]+', normalized):
+            if not token or token in STOPWORDS or token.isdigit():
+                continue
+            # Short Latin tokens are mostly noise; Urdu words are kept whole
+            if len(token) > 2 or not token.isascii():
+                tokens.add(stem(token))
+    return sorted(tokens)
+
+
+class SkillIndex:
+    """Inverted index from skill token to approved volunteers, held per process.
+
+    Loaded with one query on first use and reloaded after ``ttl`` seconds;
+    volunteer saves and deletes in this process update it through signals.
+    Callers passing the shared shortlist generation (see
+    ``invalidate_matches``) get it reloaded as soon as any process has
+    changed a volunteer.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._postings = None
+        self._volunteers = {}
+        self._loaded_at = 0.0
+        self._generation = None
+        self._lock = threading.Lock()
+
+    def load(self, generation=None):
+        """(Re)build the index from every approved volunteer, as of shortlist ``generation``"""
+        from .models import Volunteer
+        postings, volunteers = {}, {}
+        rows = Volunteer.objects.filter(is_approved=True).values_list('pk', 'community_id', 'skill_tokens')
+        for pk, community_id, tokens in rows.iterator(chunk_size=5000):
+            volunteers[pk] = (community_id, tokens.split())
+            for token in volunteers[pk][1]:
+                postings.setdefault(token, set()).add(pk)
+        with self._lock:
+            self._postings, self._volunteers = postings, volunteers
+            self._loaded_at = time.monotonic()
+            self._generation = generation
+
+    def clear(self):
+        """Drop the index so the next match reloads it"""
+        with self._lock:
+            self._postings = None
+
+    def _current(self, generation=None):
+        if (
+            self._postings is None
+            or time.monotonic() - self._loaded_at > self.ttl
+            or (generation is not None and generation != self._generation)
+        ):
+            self.load(generation)
+        return self._postings, self._volunteers
+
+    def update(self, volunteer):
+        """Re-index one volunteer after a save"""
+        with self._lock:
+            if self._postings is None:
+                return
+            self._remove(volunteer.pk)
+            if volunteer.is_approved:
+                self._volunteers[volunteer.pk] = (volunteer.community_id, volunteer.skill_tokens.split())
+                for token in self._volunteers[volunteer.pk][1]:
+                    self._postings.setdefault(token, set()).add(volunteer.pk)
+
+    def discard(self, pk):
+        """Forget a deleted volunteer"""
+        with self._lock:
+            if self._postings is not None:
+                self._remove(pk)
+
+    def _remove(self, pk):
+        _, tokens = self._volunteers.pop(pk, (None, ()))
+        for token in tokens:
+            self._postings[token].discard(pk)
+            if not self._postings[token]:
+                del self._postings[token]
+
+    def rank(self, category_tokens, project_tokens, community_id, limit, only_community=False, generation=None):
+        """Return ``(pk, score, matched tokens)`` of the best matching volunteers.
+
+        With ``only_community``, volunteers of other communities are left out.
+        """
+        postings, volunteers = self._current(generation)
+        scores, matched = {}, {}
+        for tokens, weight in ((category_tokens, CATEGORY_WEIGHT), (project_tokens, SKILL_WEIGHT)):
+            for token in tokens:
+                for pk in postings.get(token, ()):
+                    if only_community and volunteers[pk][0] != community_id:
+                        continue
+                    scores[pk] = scores.get(pk, 0) + weight
+                    matched.setdefault(pk, set()).add(token)
+        for pk in scores:
+            if volunteers[pk][0] == community_id:
+                scores[pk] += COMMUNITY_WEIGHT
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [(pk, score, sorted(matched[pk])) for pk, score in ranked]
+
+
+def project_tokens(project):
+    """``(category tokens, description tokens)`` of a project"""
+    category = project.category
+    category_tokens = set(skill_tokens(category.name, category.name_ur)) if category else set()
+    text_tokens = set(skill_tokens(
+        project.title, project.title_ur, project.description, project.description_ur, project.business_plan
+    )) - category_tokens
+    return category_tokens, text_tokens
+
+
+def invalidate_matches():
+    """Expire every cached shortlist and every process's skill index (called when volunteers change)"""
+    try:
+        cache.incr(MATCH_GENERATION_KEY)
+    except ValueError:
+        cache.set(MATCH_GENERATION_KEY, 1, None)
+
+
+def match_volunteers(project, limit=10, only_community=False):
+    """Ranked shortlist of approved volunteers for a project.
+
+    Volunteers score for skills shared with the project's category and with
+    its title and description, plus a bonus for being in the project's
+    community; ``only_community`` leaves out everyone else (for managers,
+    who may not see other communities' volunteers). Rankings are cached per
+    project until the project or any volunteer changes, and only ranked
+    from an index loaded since that change. Each returned
+    volunteer carries ``match_score`` and ``matched_skills``.
+    """
+    from .models import Volunteer
+    generation = cache.get_or_set(MATCH_GENERATION_KEY, 1, None)
+    key = (
+        f'{MATCH_CACHE_PREFIX}:{project.pk}:{project.updated_at.timestamp()}:{generation}:{limit}'
+        f':{int(only_community)}'
+    )
+    ranked = cache.get(key)
+    if ranked is None:
+        category_tokens, text_tokens = project_tokens(project)
+        ranked = skill_index.rank(
+            category_tokens, text_tokens, project.community_id, limit, only_community, generation=generation
+        )
+        cache.set(key, ranked, getattr(settings, 'VOLUNTEER_MATCH_CACHE_TIMEOUT', 3600))
+
+    volunteers = Volunteer.objects.select_related('community').in_bulk([pk for pk, _, _ in ranked])
+    shortlist = []
+    for pk, score, matched in ranked:
+        volunteer = volunteers.get(pk)
+        # Skip volunteers deleted or unapproved since the ranking was cached
+        if volunteer is not None and volunteer.is_approved:
+            volunteer.match_score = score
+            volunteer.matched_skills = matched
+            shortlist.append(volunteer)
+    return shortlist
+
+
+skill_index = SkillIndex(ttl=getattr(settings, 'VOLUNTEER_SKILL_INDEX_TTL', 300))
@@ -0,0 +1,174 @@
+"""Slow-query log with query plans.
+
+Off unless SLOW_QUERY_THRESHOLD_MS is set. ``install`` (called for every
+new database connection, see core.apps) adds ``slow_query_log`` to the
+connection's execute wrappers, so statements from views, management
+commands and background work are all watched.
+
+A statement taking at least the threshold is written, as one JSON line,
+to the rotating file SLOW_QUERY_LOG with the view being served, the
+innermost project stack frame that ran it and the database's plan for it
+(``EXPLAIN QUERY PLAN`` on SQLite). Parameter values are left out of the
+log; they may hold donors' personal details.
+
+Samples are rate-limited per fingerprint (see core.instrumentation): a
+burst of SLOW_QUERY_BURST, then one every SLOW_QUERY_SAMPLE_INTERVAL
+seconds, so one slow statement in a loop does not fill the file.
+``manage.py slow_queries`` summarises the log.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+from .instrumentation import fingerprint
+from .lookup import TokenBucketThrottle
+
+logger = logging.getLogger('core.slowqueries')
+
+# Size of one log file, and how many rotated files are kept next to it
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+# Project frames kept with each sample, innermost first
+STACK_DEPTH = 5
+
+# URL name of the view being served (set by QueryInstrumentationMiddleware)
+current_view = ContextVar('current_view', default=None)
+
+_EXPLAINABLE = ('SELECT', 'WITH')
+_THIS_FILE = os.path.abspath(__file__)
+
+
+def threshold():
+    """Milliseconds from which a statement is logged, or None while the log is off"""
+    return getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', None)
+
+
+def log_path():
+    return Path(getattr(settings, 'SLOW_QUERY_LOG', Path(settings.BASE_DIR) / 'logs' / 'slow_queries.log'))
+
+
+def call_stack():
+    """``file:line in function`` of the project frames on the stack, innermost first"""
+    base = str(settings.BASE_DIR)
+    frames = []
+    frame = sys._getframe(1)
+    while frame is not None and len(frames) < STACK_DEPTH:
+        filename = frame.f_code.co_filename
+        if not filename.startswith('<'):
+            filename = os.path.abspath(filename)
+        if filename.startswith(base) and filename != _THIS_FILE and 'site-packages' not in filename:
+            frames.append(f'{os.path.relpath(filename, base)}:{frame.f_lineno} in {frame.f_code.co_name}')
+        frame = frame.f_back
+    return frames
+
+
+def explain(connection, sql, params):
+    """The database's plan for a SELECT, or None"""
+    if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    # A cursor of its own: the statement's results have not been fetched yet
+    cursor = connection.create_cursor()
+    try:
+        cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+        rows = cursor.fetchall()
+    except DatabaseError:
+        return None
+    finally:
+        cursor.close()
+    # SQLite's rows are (id, parent, notused, detail); other backends give one text column
+    return '\n'.join(str(row[-1]) for row in rows)
+
+
+class SlowQueryLog:
+    """Execute wrapper writing statements slower than the threshold to the slow-query log"""
+
+    def __init__(self):
+        self.throttle = TokenBucketThrottle(
+            getattr(settings, 'SLOW_QUERY_BURST', 3),
+            1 / getattr(settings, 'SLOW_QUERY_SAMPLE_INTERVAL', 60),
+        )
+        self._handler = None
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        limit = threshold()
+        if limit is None:
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = (time.perf_counter() - start) * 1000
+        if duration >= limit:
+            self.sample(sql, params, many, context['connection'], duration)
+        return result
+
+    def sample(self, sql, params, many, connection, duration):
+        key = fingerprint(sql)
+        if not self.throttle.allow(key):
+            return
+        self.write({
+            'time': timezone.now().isoformat(),
+            'database': connection.alias,
+            'duration_ms': round(duration, 2),
+            'view': current_view.get(),
+            'stack': call_stack(),
+            'fingerprint': key,
+            'sql': sql,
+            'plan': None if many else explain(connection, sql, params),
+        })
+
+    def write(self, entry):
+        self._ensure_handler()
+        logger.info(json.dumps(entry, ensure_ascii=False))
+
+    def _ensure_handler(self):
+        # Opened on the first sample, and again if SLOW_QUERY_LOG changes
+        path = log_path()
+        with self._lock:
+            if self._handler is not None and self._handler.baseFilename == str(path.resolve()):
+                return
+            if self._handler is not None:
+                logger.removeHandler(self._handler)
+                self._handler.close()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._handler = RotatingFileHandler(
+                path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+            )
+            self._handler.setFormatter(logging.Formatter('%(message)s'))
+            logger.addHandler(self._handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+
+
+slow_query_log = SlowQueryLog()
+
+
+def install(sender=None, connection=None, **kwargs):
+    """``connection_created`` receiver adding the slow-query log to a connection"""
+    # First in the list, as connection.execute_wrapper() blocks pop the last wrapper on exit
+    if slow_query_log not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, slow_query_log)
+
+
+def read_samples(path=None):
+    """Logged samples, oldest first, across the log and its rotated files"""
+    path = Path(path or log_path())
+    files = [path.with_name(f'{path.name}.{number}') for number in range(LOG_BACKUP_COUNT, 0, -1)] + [path]
+    for file in files:
+        if not file.exists():
+            continue
+        with file.open(encoding='utf-8') as lines:
+            for line in lines:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
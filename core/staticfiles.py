@@ -0,0 +1,109 @@
+"""Fingerprinted, precompressed static files and a view serving them.
+
+``collectstatic`` with ``CompressedManifestStaticFilesStorage`` writes each
+file under a content-hashed name plus ``.gz`` (and, with the ``brotli``
+package installed, ``.br``) siblings. ``serve`` answers with the smallest
+encoding the client accepts and lets browsers cache hashed names for a
+year; a front-end web server can do the same from STATIC_ROOT instead.
+"""
+import gzip
+import mimetypes
+import os
+import posixpath
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Formats that are not compressed already (fonts other than WOFF/WOFF2 included)
+COMPRESSIBLE_EXTENSIONS = {
+    '.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.xml', '.html', '.ico', '.ttf', '.otf', '.eot',
+}
+# Encodings in order of preference, with the suffix of their precompressed files
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage that also writes precompressed copies of the hashed files.
+
+    Before collectstatic has written a manifest (development, tests), files
+    keep their plain names instead of raising.
+    """
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for hashed_name in sorted(set(self.hashed_files.values())):
+            if os.path.splitext(hashed_name)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+                yield from self._compress(hashed_name)
+
+    def _compress(self, name):
+        with self.open(name) as file:
+            content = file.read()
+        variants = [('.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(content)))
+        for suffix, compressed in variants:
+            # Not worth a Content-Encoding when it barely helps
+            if len(compressed) < len(content) * 0.95:
+                if self.exists(name + suffix):
+                    self.delete(name + suffix)
+                self._save(name + suffix, ContentFile(compressed))
+                yield name, name + suffix, True
+
+
+@lru_cache(maxsize=1)
+def _immutable_names():
+    # The manifest is read once per process
+    return frozenset(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+
+def serve(request, path):
+    """Serve a collected static file, precompressed when the client accepts it"""
+    name = posixpath.normpath(path).lstrip('/')
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, name)
+    except SuspiciousFileOperation:
+        raise Http404('Invalid path')
+    if not os.path.isfile(full_path):
+        raise Http404(f'"{name}" does not exist')
+
+    stat = os.stat(full_path)
+    if not was_modified_since(request.headers.get('If-Modified-Since'), stat.st_mtime):
+        return HttpResponseNotModified()
+
+    accepted = request.headers.get('Accept-Encoding', '')
+    encoding, file_path = None, full_path
+    for candidate, suffix in ENCODINGS:
+        if candidate in accepted and os.path.isfile(full_path + suffix):
+            encoding, file_path = candidate, full_path + suffix
+            break
+
+    content_type, _ = mimetypes.guess_type(name)
+    response = FileResponse(open(file_path, 'rb'), content_type=content_type or 'application/octet-stream')
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Vary'] = 'Accept-Encoding'
+    if encoding:
+        response['Content-Encoding'] = encoding
+    # Hashed names change with their content, so they never need revalidating
+    response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if name in _immutable_names() else 'no-cache'
+    return response
@@ -0,0 +1,11 @@
+from django import template
+
+from core.assets import vendor_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def vendor_static(name):
+    """URL of a self-hosted third-party asset (see core.assets)"""
+    return vendor_url(name)
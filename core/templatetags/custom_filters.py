@@ -9,3 +9,10 @@ def multiply(value, arg):
         return int(value) * int(arg)
     except (ValueError, TypeError):
         return 0
+
+
+@register.simple_tag(takes_context=True)
+def translated_path(context, language):
+    """The current page's URL in another language (its language-prefixed twin)"""
+    from django.urls import translate_url
+    return translate_url(context['request'].path, language)
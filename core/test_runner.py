@@ -0,0 +1,50 @@
+import logging
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.db import connections
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+def run_in_new_process(code):
+    """Run ``code`` in a fresh Django process sharing this one's settings and cache"""
+    location = str(settings.CACHES['default']['LOCATION'])
+    script = (
+        'import django; from django.conf import settings; '
+        f'settings.CACHES["default"]["LOCATION"] = {location!r}; django.setup(); {code}'
+    )
+    subprocess.run([sys.executable, '-c', script], cwd=settings.BASE_DIR, check=True)
+
+
+# Community databases of the routing tests (core.tests.CommunityRoutingTests)
+ROUTING_TEST_DATABASES = ('intl', 'pak')
+
+
+class QueryBudgetTestRunner(DiscoverRunner):
+    """Test runner failing any request that goes over its view's query_budget"""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.QUERY_INSTRUMENTATION = settings.QUERY_BUDGET_ENFORCE = True
+        # Flushes from another thread would race the test transactions
+        settings.BLOG_VIEW_FLUSH_IN_BACKGROUND = False
+        # Budget failures raise; the per-request lines would only be noise
+        logging.getLogger('core.instrumentation').setLevel(logging.WARNING)
+        # Keep test entries out of the site's cache
+        self.cache_dir = tempfile.mkdtemp(prefix='test-cache-')
+        self.cache_settings = override_settings(
+            CACHES={'default': {**settings.CACHES['default'], 'LOCATION': self.cache_dir}}
+        )
+        self.cache_settings.enable()
+        for alias in ROUTING_TEST_DATABASES:
+            settings.DATABASES.setdefault(alias, {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ''})
+        connections.settings = connections.configure_settings(None)
+
+    def teardown_test_environment(self, **kwargs):
+        self.cache_settings.disable()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
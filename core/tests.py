@@ -1,3 +1,983 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import date
+from decimal import Decimal
+from operator import attrgetter
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.http import Http404, HttpResponse
+from django.contrib.auth.models import Permission
+from django.contrib.messages import constants as message_constants
+from django.contrib.messages.storage.cookie import CookieStorage
+from asgiref.sync import async_to_sync
+from django.db import connection, connections, models
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone, translation
+
+from .benchmarks import compare, percentile
+from .management.commands.donor_statements import collect_statements
+from .checks import check_community_pk_ranges
+from .dedup import find_duplicate_clusters, merge_donors, name_key, normalize_phone
+from .instrumentation import QueryBudgetExceeded, fingerprint
+from .lookup import donor_ids, lookup_throttle
+from .assets import vendor_url
+from .richtext import render_rich_text
+from . import routers
+from .routers import PK_STRIDE, afan_out, database_for_pk, get_from_any, set_pk_offsets, use_community_database
+from .scoping import scope_queryset
+from .slowqueries import read_samples, slow_query_log
+from .skills import match_volunteers, skill_index, skill_tokens
+from .test_runner import run_in_new_process
+from .staticfiles import CompressedManifestStaticFilesStorage, serve as serve_static
+from .views import DonorDetailView, HomeView
+from .models import Community, CustomUser, Donor, DonorStats, Volunteer, generate_donor_id
+from donations.models import Donation, DonationAllocation
+from projects.models import Project, ProjectCategory
+from projects.views import ProjectDetailView, ProjectListView
+from blog.models import BlogPost
+from blog.views import BlogDetailView, BlogListView
+from blog.sitemaps import BlogPostSitemap
+from pages.models import Page
+from pages.navigation import navigation
+from pages.views import PageDetailView
+
+
+class DonorDetailViewTests(TestCase):
+    """Donor dashboard rendering"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.community = Community.objects.create(name='Pakistani Community', community_type='PAK')
+        cls.donor = Donor.objects.create(name='Fatima Khan', email='fkhan@example.com', community=cls.community)
+        cls.projects = [
+            Project.objects.create(
+                title=f'Project {i}',
+                community=cls.community,
+                beneficiary_name=f'Beneficiary {i}',
+                beneficiary_phone='0300-0000000',
+                beneficiary_address='Karachi',
+                description='Food cart',
+                requested_amount=Decimal('1000.00'),
+                approved_amount=Decimal('1000.00'),
+                currency='PKR',
+            )
+            for i in range(5)
+        ]
+        for i in range(40):
+            donation = Donation.objects.create(
+                donor=cls.donor,
+                amount=Decimal('100.00'),
+                currency='PKR',
+                date_received=date(2025, 1, 1),
+            )
+            DonationAllocation.objects.create(
+                donation=donation,
+                project=cls.projects[i % len(cls.projects)],
+                amount=Decimal('50.00'),
+            )
+
+    def setUp(self):
+        donor_ids.load()
+        donor_ids.fallback_throttle.reset()
+        lookup_throttle.reset()
+        # Header/footer links are read once per process, not per request
+        navigation.links('en')
+
+    def test_query_budget_is_independent_of_donation_count(self):
+        url = reverse('core:donor_detail', kwargs={'donor_id': self.donor.donor_id})
+        # donor, donations, allocations, projects with funding totals
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_donated'], Decimal('4000.00'))
+        self.assertEqual(len(response.context['allocations']), 40)
+        # 8 allocations of 50 against a goal of 1000
+        self.assertEqual(response.context['allocations'][0].project.funding_progress(), 40)
+
+
+class DonorLookupTests(TestCase):
+    """Donor ID lookup guards"""
+
+    @classmethod
+    def setUpTestData(cls):
+        community = Community.objects.create(name='International Community', community_type='INTL')
+        cls.donor = Donor.objects.create(name='John Smith', community=community)
+
+    def setUp(self):
+        donor_ids.load()
+        donor_ids.fallback_throttle.reset()
+        lookup_throttle.reset()
+
+    def test_known_id_redirects_to_dashboard(self):
+        response = self.client.post(reverse('core:donor_lookup'), {'donor_id': self.donor.donor_id})
+        self.assertRedirects(
+            response, reverse('core:donor_detail', kwargs={'donor_id': self.donor.donor_id})
+        )
+
+    def test_unknown_ids_cost_one_query_until_the_fallback_budget_is_spent(self):
+        unknown = '000000000' if self.donor.donor_id != '000000000' else '000000001'
+        with self.assertNumQueries(1):
+            response = self.client.post(reverse('core:donor_lookup'), {'donor_id': unknown})
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('core:donor_detail', kwargs={'donor_id': unknown}))
+        self.assertEqual(response.status_code, 404)
+        with mock.patch.object(donor_ids.fallback_throttle, 'allow', return_value=False):
+            with self.assertNumQueries(0):
+                response = self.client.get(reverse('core:donor_detail', kwargs={'donor_id': unknown}))
+        self.assertEqual(response.status_code, 404)
+        with self.assertNumQueries(0):
+            self.client.post(reverse('core:donor_lookup'), {'donor_id': '12345'})
+
+    def test_donors_created_by_other_processes_are_found_before_the_reload(self):
+        donor = Donor.objects.create(name='Emma Johnson', community=self.donor.community)
+        # As if another process had created it after this one loaded the index
+        donor_ids.discard(donor.donor_id)
+        response = self.client.post(reverse('core:donor_lookup'), {'donor_id': donor.donor_id})
+        self.assertRedirects(response, reverse('core:donor_detail', kwargs={'donor_id': donor.donor_id}))
+        with self.assertNumQueries(0):
+            self.assertIn(donor.donor_id, donor_ids)
+
+    def test_new_donors_are_added_to_the_index(self):
+        donor = Donor.objects.create(name='Emma Johnson', community=self.donor.community)
+        self.assertIn(donor.donor_id, donor_ids)
+
+    def test_creating_donors_does_not_spend_the_lookup_fallback(self):
+        donor_ids.clear()
+        with mock.patch.object(donor_ids.fallback_throttle, 'allow') as allow:
+            with self.assertNumQueries(1):
+                generate_donor_id()
+        allow.assert_not_called()
+        self.assertIsNone(donor_ids._ids)
+
+    def test_lookups_are_throttled_per_ip(self):
+        for _ in range(lookup_throttle.capacity):
+            self.client.post(reverse('core:donor_lookup'), {'donor_id': '123'})
+        response = self.client.post(reverse('core:donor_lookup'), {'donor_id': '123'})
+        self.assertEqual(response.status_code, 429)
+        response = self.client.post(
+            reverse('core:donor_lookup'), {'donor_id': '123'}, REMOTE_ADDR='10.0.0.2'
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+class DonorDeduplicationTests(TestCase):
+    """Blocking keys, duplicate clusters and merging"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.community = Community.objects.create(name='Pakistani Community', community_type='PAK')
+
+    def make_donor(self, name, email='', phone=''):
+        return Donor.objects.create(name=name, email=email, phone=phone, community=self.community)
+
+    def test_blocking_keys(self):
+        self.assertEqual(normalize_phone('+92 300 1234567'), normalize_phone('0300-1234567'))
+        self.assertEqual(name_key('Muhammad Ali'), name_key('ali mohammad'))
+        donor = self.make_donor('Ayesha Malik', email=' AMalik@Example.com ')
+        self.assertEqual(donor.email_key, 'amalik@example.com')
+
+    def test_clusters_join_across_keys(self):
+        first = self.make_donor('Usman Tariq', email='utariq@example.com')
+        second = self.make_donor('Usman T.', email='UTariq@example.com', phone='0321 7654321')
+        third = self.make_donor('U. Tariq', phone='+92-321-7654321')
+        self.make_donor('Zainab Raza', email='zraza@example.com')
+        self.assertEqual(find_duplicate_clusters(), [[first.pk, second.pk, third.pk]])
+
+    def test_merge_moves_donations_and_keeps_survivor_id(self):
+        survivor = self.make_donor('Ahmed Hassan')
+        duplicate = self.make_donor('Ahmed Hasan', email='ahassan@example.com')
+        for donor in (survivor, duplicate):
+            Donation.objects.create(donor=donor, amount=Decimal('10.00'), date_received=date(2025, 1, 1))
+        self.assertEqual(merge_donors(survivor, [duplicate]), 1)
+        survivor.refresh_from_db()
+        self.assertEqual(survivor.donations.count(), 2)
+        self.assertEqual(survivor.email, 'ahassan@example.com')
+        self.assertFalse(Donor.objects.filter(pk=duplicate.pk).exists())
+
+    def donate(self, community, name, email='', phone=''):
+        return self.client.post(reverse('core:donate'), {
+            'name': name, 'email': email, 'phone': phone, 'community': community.pk,
+            'amount': '25.00', 'currency': 'USD', 'payment_method': 'CARD',
+        }, follow=True)
+
+    def test_donations_match_donors_of_the_same_community_by_email_or_phone_and_name(self):
+        donor = self.make_donor('Ayesha Malik', email='amalik@example.com', phone='0300 1234567')
+        self.donate(self.community, 'Ayesha M.', email='AMalik@example.com')
+        self.donate(self.community, 'Malik Ayesha', phone='+92 300 1234567')
+        self.assertEqual(donor.donations.count(), 2)
+
+        # Same phone, different person; same email, other community
+        self.donate(self.community, 'Bilal Malik', phone='0300-1234567')
+        other = Community.objects.create(name='International Community', community_type='INTL')
+        self.donate(other, 'Ayesha Malik', email='amalik@example.com')
+        self.assertEqual(donor.donations.count(), 2)
+        self.assertEqual(Donor.objects.count(), 3)
+
+    def test_only_new_donors_are_shown_their_id(self):
+        donor = self.make_donor('Ayesha Malik', email='amalik@example.com')
+        response = self.donate(self.community, 'Someone', email='amalik@example.com')
+        self.assertNotContains(response, donor.donor_id)
+        self.assertIsNone(self.client.session['donor_id'])
+
+        response = self.donate(self.community, 'Usman Tariq', email='utariq@example.com')
+        new_donor = Donor.objects.get(email_key='utariq@example.com')
+        self.assertContains(response, new_donor.donor_id)
+
+
+class DonorStatsTests(TestCase):
+    """Precomputed donor analytics"""
+
+    @classmethod
+    def setUpTestData(cls):
+        community = Community.objects.create(name='Pakistani Community', community_type='PAK')
+        cls.donor = Donor.objects.create(name='Muhammad Ali', community=community)
+        cls.idle_donor = Donor.objects.create(name='Zainab Raza', community=community)
+
+    def donate(self, amount, currency, received):
+        return Donation.objects.create(
+            donor=self.donor, amount=Decimal(amount), currency=currency, date_received=received
+        )
+
+    def test_refreshed_on_donation_writes(self):
+        self.donate('100.00', 'USD', date(2025, 3, 15))
+        donation = self.donate('10000.00', 'PKR', date(2025, 5, 2))
+        stats = DonorStats.objects.get(donor=self.donor)
+        self.assertEqual(stats.donation_count, 2)
+        self.assertEqual(stats.first_donation_date, date(2025, 3, 15))
+        self.assertEqual(stats.last_donation_date, date(2025, 5, 2))
+        self.assertEqual(stats.cohort_month, date(2025, 3, 1))
+        self.assertEqual(stats.lifetime_total, Decimal('136.00'))
+
+        donation.delete()
+        stats.refresh_from_db()
+        self.assertEqual(stats.donation_count, 1)
+        self.assertEqual(stats.lifetime_total, Decimal('100.00'))
+
+    def test_rebuild_covers_every_donor(self):
+        self.donate('50.00', 'USD', date(2025, 1, 10))
+        DonorStats.objects.all().delete()
+        self.assertEqual(DonorStats.rebuild(), 2)
+        self.assertEqual(DonorStats.objects.get(donor=self.donor).lifetime_total, Decimal('50.00'))
+        self.assertEqual(DonorStats.objects.get(donor=self.idle_donor).donation_count, 0)
+
+    def test_changelist_sorts_on_stats(self):
+        self.donate('50.00', 'USD', date(2025, 1, 10))
+        director = CustomUser.objects.create_superuser('director', 'director@example.com', 'director123')
+        self.client.force_login(director)
+        response = self.client.get(reverse('admin:core_donor_changelist'), {'o': '6', 'frequency': 'once'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['cl'].result_list), [self.donor])
+
+    def test_no_donations_filter_includes_donors_without_stats(self):
+        self.donate('50.00', 'USD', date(2025, 1, 10))
+        DonorStats.objects.filter(donor=self.idle_donor).delete()
+        director = CustomUser.objects.create_superuser('director', 'director@example.com', 'director123')
+        self.client.force_login(director)
+        response = self.client.get(reverse('admin:core_donor_changelist'), {'frequency': 'none'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.idle_donor])
+
+
+class DonorStatementTests(TestCase):
+    """Annual giving statements"""
+
+    @classmethod
+    def setUpTestData(cls):
+        community = Community.objects.create(name='Pakistani Community', community_type='PAK')
+        cls.donor = Donor.objects.create(name='Muhammad Ali', community=community)
+        project = Project.objects.create(
+            title='Tailoring workshop', category=ProjectCategory.objects.create(name='Tailoring'),
+            community=community, beneficiary_name='Nasreen Bibi', beneficiary_phone='0300-0000000',
+            beneficiary_address='Lahore', description='Sewing machines', requested_amount=Decimal('500.00'),
+        )
+        for amount, currency, received in [
+            ('100.00', 'USD', date(2025, 3, 15)),
+            ('50.00', 'USD', date(2025, 11, 2)),
+            ('10000.00', 'PKR', date(2025, 5, 2)),
+            ('70.00', 'USD', date(2024, 12, 31)),
+        ]:
+            donation = Donation.objects.create(
+                donor=cls.donor, amount=Decimal(amount), currency=currency, date_received=received
+            )
+            DonationAllocation.objects.create(donation=donation, project=project, amount=Decimal(amount))
+
+    def test_totals_per_currency_for_the_year_only(self):
+        [statement] = collect_statements(2025)
+        self.assertEqual(
+            [(row['currency'], row['total'], row['count']) for row in statement['totals']],
+            [('PKR', Decimal('10000.00'), 1), ('USD', Decimal('150.00'), 2)],
+        )
+        self.assertEqual(
+            [(row['currency'], row['total']) for row in statement['projects']],
+            [('PKR', Decimal('10000.00')), ('USD', Decimal('150.00'))],
+        )
+        self.assertEqual(collect_statements(2023), [])
+
+    def test_command_writes_statements_and_index(self):
+        output = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output)
+        call_command('donor_statements', '--year', '2025', '--output', output, '--workers', '1', stdout=io.StringIO())
+        with open(os.path.join(output, 'index.csv'), encoding='utf-8') as index_file:
+            rows = list(csv.reader(index_file))
+        donor_id, name, filename, totals, count = rows[1]
+        self.assertEqual((donor_id, name, count), (self.donor.donor_id, 'Muhammad Ali', '3'))
+        self.assertEqual(
+            [(Decimal(total.split()[0]), total.split()[1]) for total in totals.split('; ')],
+            [(Decimal('10000.00'), 'PKR'), (Decimal('150.00'), 'USD')],
+        )
+        with open(os.path.join(output, filename), encoding='utf-8') as statement_file:
+            self.assertIn('<td>Tailoring workshop</td>', statement_file.read())
+
+    def test_urdu_statements_use_urdu_project_titles(self):
+        Project.objects.update(title_ur='سلائی کا کارخانہ')
+        output = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output)
+        call_command(
+            'donor_statements', '--year', '2025', '--output', output, '--workers', '1', '--language', 'ur',
+            stdout=io.StringIO(),
+        )
+        with open(os.path.join(output, f'{self.donor.donor_id}.html'), encoding='utf-8') as statement_file:
+            self.assertIn('<td>سلائی کا کارخانہ</td>', statement_file.read())
+
+
+class CommunityScopingTests(TestCase):
+    """Manager access is limited to their own community"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.intl = Community.objects.create(name='International Community', community_type='INTL')
+        cls.pak = Community.objects.create(name='Pakistani Community', community_type='PAK')
+        for community in (cls.intl, cls.pak):
+            donor = Donor.objects.create(name=f'{community} donor', community=community)
+            Donation.objects.create(donor=donor, amount=Decimal('10.00'), date_received=date(2025, 1, 1))
+        cls.manager = CustomUser.objects.create_user(
+            'pak_manager', password='manager123', role='PAK_MANAGER', community=cls.pak, is_staff=True
+        )
+        cls.director = CustomUser.objects.create_user('director', password='director123', role='DIRECTOR')
+
+    def scoped(self, user):
+        request = RequestFactory().get('/')
+        request.user = user
+        return scope_queryset(Donation.objects.all(), request)
+
+    def test_manager_sees_own_community_without_joins(self):
+        queryset = self.scoped(self.manager)
+        self.assertEqual([donation.community_id for donation in queryset], [self.pak.pk])
+        self.assertNotIn('JOIN', str(queryset.query))
+
+    def test_director_and_unassigned_users(self):
+        self.assertEqual(self.scoped(self.director).count(), 2)
+        staff = CustomUser.objects.create_user('staff', password='staff123', role='STAFF')
+        self.assertEqual(self.scoped(staff).count(), 0)
+
+    def test_moving_a_donor_moves_its_donations(self):
+        donor = Donor.objects.get(community=self.intl)
+        donor.community = self.pak
+        donor.save()
+        self.assertEqual(Donation.objects.filter(community=self.pak).count(), 2)
+
+    def test_moving_a_donor_by_community_id_moves_its_donations(self):
+        donor = Donor.objects.get(community=self.intl)
+        donor.community_id = self.pak.pk
+        donor.save(update_fields=['community_id'])
+        self.assertEqual(Donation.objects.filter(community=self.pak).count(), 2)
+
+    def test_manager_sees_allocations_within_own_community_only(self):
+        project = Project.objects.create(
+            title='Tailoring workshop', category=ProjectCategory.objects.create(name='Tailoring'),
+            community=self.intl, beneficiary_name='Nasreen Bibi', beneficiary_phone='0300-0000000',
+            beneficiary_address='Lahore', description='Sewing machines', requested_amount=Decimal('500.00'),
+        )
+        donation = Donation.objects.get(community=self.pak)
+        DonationAllocation.objects.create(donation=donation, project=project, amount=Decimal('5.00'))
+        self.client.force_login(self.manager)
+        self.manager.user_permissions.add(*Permission.objects.filter(codename='view_donationallocation'))
+        response = self.client.get(reverse('admin:donations_donationallocation_changelist'))
+        self.assertEqual(list(response.context['cl'].result_list), [])
+
+
+@override_settings(COMMUNITY_DATABASES={'INTL': 'intl', 'PAK': 'pak'})
+class CommunityRoutingTests(TestCase):
+    """Each community's operational rows in its own database (see core.routers)"""
+    databases = {'default', 'intl', 'pak'}
+
+    @classmethod
+    def setUpTestData(cls):
+        routers._community_types.clear()
+        for alias in ('intl', 'pak'):
+            set_pk_offsets(alias)
+        cls.intl = Community.objects.create(name='International Community', community_type='INTL')
+        cls.pak = Community.objects.create(name='Pakistani Community', community_type='PAK')
+        cls.category = ProjectCategory.objects.create(name='Retail')
+        cls.projects = [cls.project(community, f'Shop {index}') for index, community in enumerate(
+            (cls.intl, cls.pak, cls.intl)
+        )]
+        cls.director = CustomUser.objects.create_superuser('director', password='director123', role='DIRECTOR')
+
+    @classmethod
+    def project(cls, community, title):
+        with use_community_database(routers.database_for_community(community.pk)):
+            return Project.objects.create(
+                title=title, category=cls.category, community=community, beneficiary_name='Beneficiary',
+                beneficiary_phone='0300-0000000', beneficiary_address='Karachi', description='General store',
+                requested_amount=Decimal('1000.00'), is_public=True,
+            )
+
+    def setUp(self):
+        routers._community_types.clear()
+        cache.clear()
+
+    def test_rows_are_written_to_their_communitys_database(self):
+        intl_shop, pak_shop, _ = self.projects
+        self.assertEqual((intl_shop._state.db, pak_shop._state.db), ('intl', 'pak'))
+        self.assertEqual(Project.objects.using('pak').get().pk, pak_shop.pk)
+        self.assertFalse(Project.objects.using('default').exists())
+        # Shared rows are copied so foreign keys resolve in each database
+        for alias in ('intl', 'pak'):
+            self.assertEqual(Community.objects.using(alias).count(), 2)
+            self.assertEqual(ProjectCategory.objects.using(alias).get().pk, self.category.pk)
+
+    def test_primary_keys_name_their_database(self):
+        intl_shop, pak_shop, _ = self.projects
+        self.assertLess(intl_shop.pk, PK_STRIDE)
+        self.assertGreater(pak_shop.pk, PK_STRIDE)
+        self.assertEqual([database_for_pk(project.pk) for project in self.projects], ['intl', 'pak', 'intl'])
+        with self.assertNumQueries(1, using='pak'):
+            self.assertEqual(get_from_any(Project.objects.all(), pk=pak_shop.pk), pak_shop)
+        with self.assertRaises(Project.DoesNotExist):
+            get_from_any(Project.objects.all(), pk=3 * PK_STRIDE)
+        response = self.client.get(reverse('projects:project_detail', args=[pak_shop.pk]))
+        self.assertEqual(response.context['project'], pak_shop)
+
+    def test_fan_out_merges_the_databases_in_order(self):
+        queryset = Project.objects.order_by('-created_at')
+        merged = async_to_sync(afan_out)(queryset, key=attrgetter('created_at'), reverse=True)
+        self.assertEqual(merged, self.projects[::-1])
+
+    def test_project_list_pages_load_only_their_rows(self):
+        url = reverse('projects:project_list')
+        with mock.patch.object(ProjectListView, 'paginate_by', 1):
+            with CaptureQueriesContext(connections['intl']) as intl_queries:
+                response = self.client.get(url, {'page': 2})
+        self.assertEqual(response.context['paginator'].count, 3)
+        self.assertEqual(list(response.context['projects']), [self.projects[1]])
+        # Two of the three projects are in 'intl', but page 2 needs only its first two rows
+        self.assertIn('LIMIT 2', intl_queries[-1]['sql'])
+
+    def test_rows_outside_their_range_are_reported(self):
+        self.assertEqual(check_community_pk_ranges(None, databases=['intl', 'pak']), [])
+        Project.objects.using('intl').filter(pk=self.projects[0].pk).update(id=2 * PK_STRIDE)
+        errors = check_community_pk_ranges(None, databases=['intl', 'pak'])
+        self.assertEqual([error.id for error in errors], ['core.E001'])
+
+    def test_directors_choose_the_database_of_a_changelist(self):
+        self.client.force_login(self.director)
+        url = reverse('admin:projects_project_changelist')
+        response = self.client.get(url)
+        self.assertEqual(list(response.context['cl'].result_list), [self.projects[2], self.projects[0]])
+        response = self.client.get(url, {'database': 'pak'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.projects[1]])
+        response = self.client.get(reverse('admin:projects_project_change', args=[self.projects[1].pk]))
+        self.assertEqual(response.context['original'], self.projects[1])
+
+
+class VolunteerMatchingTests(TestCase):
+    """Skill index and project shortlists"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.pak = Community.objects.create(name='Pakistani Community', community_type='PAK')
+        cls.intl = Community.objects.create(name='International Community', community_type='INTL')
+        cls.project = Project.objects.create(
+            title='Tailoring workshop',
+            category=ProjectCategory.objects.create(name='Tailoring'),
+            community=cls.pak,
+            beneficiary_name='Nasreen Bibi',
+            beneficiary_phone='0300-0000000',
+            beneficiary_address='Lahore',
+            description='Sewing machines and bookkeeping support for a small workshop',
+            requested_amount=Decimal('500.00'),
+        )
+
+    def setUp(self):
+        skill_index.clear()
+
+    def volunteer(self, name, skills, community, approved=True):
+        return Volunteer.objects.create(
+            name=name, email=f'{name.lower()}@example.com', phone='0300-1111111',
+            community=community, skills=skills, is_approved=approved,
+        )
+
+    def test_skill_tokens(self):
+        self.assertEqual(skill_tokens('Tailoring, sewing & 5 years experience'), ['sew', 'tailor'])
+
+    def test_shortlist_ranks_category_skills_and_community(self):
+        tailor = self.volunteer('Amina', 'Tailor, sewing', self.intl)
+        bookkeeper = self.volunteer('Bilal', 'Bookkeeping', self.pak)
+        self.volunteer('Omar', 'Tailoring', self.pak, approved=False)
+        self.volunteer('Sara', 'Web design', self.pak)
+        self.assertEqual(match_volunteers(self.project), [tailor, bookkeeper])
+        self.assertEqual(match_volunteers(self.project)[0].matched_skills, ['sew', 'tailor'])
+
+        bookkeeper.skills = 'Bookkeeping and tailoring'
+        with self.captureOnCommitCallbacks(execute=True):
+            bookkeeper.save()
+        self.assertEqual(match_volunteers(self.project), [bookkeeper, tailor])
+
+    def test_volunteers_approved_by_another_process_are_ranked(self):
+        self.assertEqual(match_volunteers(self.project), [])
+        tailor = self.volunteer('Amina', 'Tailor, sewing', self.pak)
+        # As if another process had approved her: this one's index never saw it
+        skill_index.discard(tailor.pk)
+        run_in_new_process('from core.skills import invalidate_matches; invalidate_matches()')
+        self.assertEqual(match_volunteers(self.project), [tailor])
+
+    def test_managers_are_only_suggested_their_own_communitys_volunteers(self):
+        self.volunteer('Amina', 'Tailor, sewing', self.intl)
+        self.volunteer('Bilal', 'Bookkeeping', self.pak)
+        manager = CustomUser.objects.create_user(
+            'pak_manager', password='manager123', role='PAK_MANAGER', community=self.pak, is_staff=True
+        )
+        manager.user_permissions.add(*Permission.objects.filter(codename='view_project'))
+        self.client.force_login(manager)
+        url = reverse('admin:projects_project_change', args=[self.project.pk])
+        response = self.client.get(url)
+        self.assertContains(response, 'Bilal')
+        self.assertNotContains(response, 'Amina')
+
+        self.client.force_login(CustomUser.objects.create_superuser('director', 'director@example.com', 'x'))
+        self.assertContains(self.client.get(url), 'Amina')
+
+
+class RichTextRenderingTests(SimpleTestCase):
+    """Save-time rendering of editor HTML"""
+
+    def test_sanitizes_markup(self):
+        html = render_rich_text(
+            '<p onclick="steal()" style="text-align: right; background: url(x)">Hi<script>alert(1)</script></p>'
+            '<a href="java\tscript:alert(1)" target="_blank">link</a><svg><p>hidden</svg>'
+        )
+        self.assertEqual(
+            html,
+            '<p style="text-align: right">Hi</p><a target="_blank" rel="noopener noreferrer">link</a>',
+        )
+
+    def test_headings_get_ids_and_table_of_contents(self):
+        html = render_rich_text('<h2>Goals</h2><h3>مقصد</h3><h2>Goals</h2><p>Text</p>')
+        self.assertIn('<h2 id="goals">Goals</h2><h3 id="مقصد">مقصد</h3><h2 id="goals-2">Goals</h2>', html)
+        self.assertTrue(html.startswith('<nav class="toc"'))
+        self.assertIn('<a href="#goals-2">Goals</a>', html)
+        self.assertNotIn('<nav', render_rich_text('<h2>Only one</h2>'))
+
+    def test_uploaded_images_get_size_and_renditions(self):
+        from PIL import Image
+
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        with override_settings(MEDIA_ROOT=media_root, MEDIA_URL='/media/'):
+            buffer = io.BytesIO()
+            Image.new('RGB', (1000, 500)).save(buffer, format='JPEG')
+            default_storage.save('uploads/photo.jpg', ContentFile(buffer.getvalue()))
+            html = render_rich_text('<img src="/media/uploads/photo.jpg" alt="Shop">')
+            self.assertTrue(default_storage.exists('uploads/photo-480w.jpg'))
+        self.assertEqual(
+            html,
+            '<img src="/media/uploads/photo.jpg" alt="Shop" loading="lazy" decoding="async" width="1000" '
+            'height="500" srcset="/media/uploads/photo-480w.jpg 480w, /media/uploads/photo-960w.jpg 960w, '
+            '/media/uploads/photo.jpg 1000w" sizes="(max-width: 992px) 100vw, 800px">',
+        )
+
+
+class SitemapTests(TestCase):
+    """Cached, bilingual sitemap sections"""
+
+    def setUp(self):
+        cache.clear()
+        self.post = BlogPost.objects.create(title='Post', slug='post', content='Text', is_published=True)
+        BlogPost.objects.create(title='Draft', slug='draft', content='Text')
+        Page.objects.create(title='About', slug='about', content='About us')
+
+    def test_index_lists_sections_with_lastmod(self):
+        response = self.client.get('/sitemap.xml')
+        self.assertContains(response, '<loc>http://testserver/sitemap-blog.xml</loc>')
+        self.assertContains(response, f'<lastmod>{timezone.localtime(self.post.updated_at).isoformat()}</lastmod>')
+        self.assertContains(response, '<loc>http://testserver/sitemap-pages.xml</loc>')
+
+    def test_sections_list_every_language(self):
+        response = self.client.get('/sitemap-blog.xml')
+        self.assertContains(response, '<loc>http://testserver/blog/post/</loc>')
+        self.assertContains(response, '<loc>http://testserver/ur/blog/post/</loc>')
+        self.assertContains(response, 'hreflang="x-default" href="http://testserver/blog/post/"')
+        self.assertNotContains(response, 'draft')
+        self.assertEqual(self.client.get('/sitemap-missing.xml').status_code, 404)
+
+    def test_sections_are_cached_until_their_content_changes(self):
+        self.client.get('/sitemap-blog.xml')
+        with self.assertNumQueries(0):
+            response = self.client.get('/sitemap-blog.xml')
+        self.assertEqual(
+            self.client.get('/sitemap-blog.xml', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Page.objects.create(title='Policies', slug='policies', content='Rules')
+        with self.assertNumQueries(0):
+            self.client.get('/sitemap-blog.xml')
+        with self.captureOnCommitCallbacks(execute=True):
+            BlogPost.objects.create(title='New', slug='new', content='Text', is_published=True)
+        self.assertContains(self.client.get('/sitemap-blog.xml'), '/blog/new/')
+
+    def test_sections_expired_by_another_process_are_rendered_again(self):
+        self.client.get('/sitemap-blog.xml')
+        BlogPost.objects.filter(pk=self.post.pk).update(slug='renamed')
+        run_in_new_process("from core.feeds import touch_feeds; touch_feeds('blog')")
+        self.assertContains(self.client.get('/sitemap-blog.xml'), '/blog/renamed/')
+
+    def test_large_sections_are_split_into_pages(self):
+        BlogPost.objects.create(title='Second', slug='second', content='Text', is_published=True)
+        # Two posts in two languages
+        with mock.patch.object(BlogPostSitemap, 'limit', 2):
+            self.assertContains(self.client.get('/sitemap.xml'), 'sitemap-blog.xml?p=2')
+            response = self.client.get('/sitemap-blog.xml', {'p': 2})
+        self.assertContains(response, '/blog/second/')
+        self.assertNotContains(response, '/blog/post/')
+
+
+class StaticAssetTests(SimpleTestCase):
+    """Self-hosted, fingerprinted and precompressed static files"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        vendor_url.cache_clear()
+        self.addCleanup(vendor_url.cache_clear)
+
+    def test_vendored_assets_replace_cdn_links(self):
+        self.assertTrue(vendor_url('bootstrap_css').startswith('https://cdn.jsdelivr.net/'))
+        os.makedirs(os.path.join(self.root, 'vendor', 'bootstrap'))
+        open(os.path.join(self.root, 'vendor', 'bootstrap', 'bootstrap.min.css'), 'w').close()
+        vendor_url.cache_clear()
+        with override_settings(STATICFILES_DIRS=[self.root]):
+            self.assertEqual(vendor_url('bootstrap_css'), '/static/vendor/bootstrap/bootstrap.min.css')
+
+    def test_collected_files_are_hashed_compressed_and_cached_for_good(self):
+        storage = CompressedManifestStaticFilesStorage(location=self.root)
+        storage.save('site.css', ContentFile(b'body { color: #333; }\n' * 100))
+        list(storage.post_process({'site.css': (storage, 'site.css')}))
+        hashed = storage.stored_name('site.css')
+        self.assertRegex(hashed, r'^site\.[0-9a-f]{12}\.css$')
+        self.assertTrue(storage.exists(hashed + '.gz'))
+
+        request = RequestFactory().get('/static/' + hashed, HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        with override_settings(STATIC_ROOT=self.root), \
+                mock.patch('core.staticfiles._immutable_names', return_value=frozenset([hashed])):
+            response = serve_static(request, hashed)
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertEqual(response['Content-Type'], 'text/css')
+            self.assertIn('immutable', response['Cache-Control'])
+            self.assertEqual(serve_static(RequestFactory().get('/'), 'site.css')['Cache-Control'], 'no-cache')
+            with self.assertRaises(Http404):
+                serve_static(request, '../secret.txt')
+
+
+class PageCacheTests(TestCase):
+    """Whole pages cached for anonymous visitors"""
+
+    @classmethod
+    def setUpTestData(cls):
+        community = Community.objects.create(name='Pakistani Community', community_type='PAK')
+        cls.project = Project.objects.create(
+            title='Corner Shop',
+            title_ur='کونے کی دکان',
+            category=ProjectCategory.objects.create(name='Retail'),
+            community=community,
+            beneficiary_name='Beneficiary',
+            beneficiary_phone='0300-0000000',
+            beneficiary_address='Karachi',
+            description='General store',
+            business_plan='Plan',
+            requested_amount=Decimal('1000.00'),
+            is_featured=True,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_repeat_visits_are_served_from_the_cache(self):
+        first = self.client.get(reverse('core:home'))
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('core:home'))
+        self.assertEqual(second.content, first.content)
+        self.assertIsNone(second.context)
+        self.assertNotIn('csrftoken', first.cookies)
+
+    def test_pages_are_kept_per_language(self):
+        self.client.get(reverse('core:home'))
+        with translation.override('en'):
+            response = self.client.get('/ur/')
+        self.assertContains(response, 'کونے کی دکان')
+        self.assertIsNotNone(response.context)
+
+    def test_content_changes_expire_tagged_pages(self):
+        self.client.get(reverse('projects:project_list'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.title = 'Tailor Shop'
+            self.project.save()
+        self.assertContains(self.client.get(reverse('projects:project_list')), 'Tailor Shop')
+
+    def test_signed_in_users_and_pending_messages_bypass_the_cache(self):
+        self.client.get(reverse('core:home'))
+        storage = CookieStorage(RequestFactory().get('/'))
+        response = HttpResponse()
+        storage.add(message_constants.SUCCESS, 'Thank you!')
+        storage.update(response)
+        self.client.cookies[storage.cookie_name] = response.cookies[storage.cookie_name].value
+        self.assertContains(self.client.get(reverse('core:home')), 'Thank you!')
+
+        self.client.cookies.clear()
+        self.client.force_login(CustomUser.objects.create_user('staff', password='x'))
+        self.assertIsNotNone(self.client.get(reverse('core:home')).context)
+
+    def test_only_the_page_number_is_part_of_the_key(self):
+        url = reverse('projects:project_list')
+        self.client.get(url, {'page': 1})
+        with self.assertNumQueries(0):
+            self.client.get(url, {'page': 1})
+        self.assertIsNotNone(self.client.get(url).context)
+        for _ in range(2):
+            self.assertIsNotNone(self.client.get(url, {'utm_source': 'newsletter'}).context)
+
+    def test_pages_expired_by_another_process_are_rendered_again(self):
+        self.client.get(reverse('projects:project_list'))
+        Project.objects.filter(pk=self.project.pk).update(title='Tailor Shop')
+        run_in_new_process("from core.pagecache import expire_pages; expire_pages('projects')")
+        self.assertContains(self.client.get(reverse('projects:project_list')), 'Tailor Shop')
+
+    def test_forms_are_never_cached(self):
+        self.client.get(reverse('core:donor_lookup'))
+        self.assertIsNotNone(self.client.get(reverse('core:donor_lookup')).context)
+
+
+class QueryInstrumentationTests(TestCase):
+    """Per-request query counts, timings and budgets"""
+
+    def setUp(self):
+        cache.clear()
+        navigation.links('en')
+
+    def test_fingerprints_ignore_parameter_values(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = \'x\'  LIMIT 21'),
+            'SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?'
+        )
+        self.assertEqual(fingerprint('SELECT 1 FROM t WHERE id IN (%s)'), fingerprint('SELECT 2 FROM t WHERE id IN (%s, %s)'))
+
+    def test_timings_are_reported_in_header_and_log(self):
+        with self.assertLogs('core.instrumentation', 'DEBUG') as logs:
+            response = self.client.get(reverse('core:home'))
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="2 queries", tpl;dur=[\d.]+;desc="templates", total;dur=')
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual((record['view'], record['status'], record['queries']), ('core:home', 200, 2))
+        self.assertGreater(record['template_ms'], 0)
+
+    def test_views_over_budget_fail(self):
+        with mock.patch.object(HomeView, 'query_budget', 1):
+            with self.assertRaisesMessage(QueryBudgetExceeded, 'core:home ran 2 queries, over its budget of 1'):
+                self.client.get(reverse('core:home'))
+
+
+class AsyncViewTests(TestCase):
+    """Public read pages served by async views through async-capable middleware"""
+
+    @classmethod
+    def setUpTestData(cls):
+        community = Community.objects.create(name='Pakistani Community', community_type='PAK')
+        cls.donor = Donor.objects.create(name='Fatima Khan', community=community)
+        cls.project = Project.objects.create(
+            title='Corner Shop',
+            category=ProjectCategory.objects.create(name='Retail'),
+            community=community,
+            beneficiary_name='Beneficiary',
+            beneficiary_phone='0300-0000000',
+            beneficiary_address='Karachi',
+            description='General store',
+            business_plan='Plan',
+            requested_amount=Decimal('1000.00'),
+            is_featured=True,
+        )
+
+    def setUp(self):
+        cache.clear()
+        navigation.links('en')
+        donor_ids.clear()
+        lookup_throttle.reset()
+
+    def test_read_views_are_async(self):
+        for view in (
+            HomeView, DonorDetailView, ProjectListView, ProjectDetailView, BlogListView, BlogDetailView, PageDetailView
+        ):
+            self.assertTrue(view.view_is_async, view.__name__)
+
+    async def test_pages_render_with_async_middleware(self):
+        with translation.override('en'):
+            home = await self.async_client.get(reverse('core:home'))
+            listing = await self.async_client.get(reverse('projects:project_list'), {'page': 'last'})
+            detail = await self.async_client.get(reverse('projects:project_detail', args=[self.project.pk]))
+            donor = await self.async_client.get(reverse('core:donor_detail', args=[self.donor.donor_id]))
+        self.assertContains(home, 'Corner Shop')
+        self.assertEqual([project.pk for project in listing.context['projects']], [self.project.pk])
+        self.assertEqual(listing.context['paginator'].count, 1)
+        self.assertContains(detail, 'Corner Shop')
+        self.assertContains(donor, 'Fatima Khan')
+        # Queries run by the async ORM are still counted (and held to the view's budget)
+        self.assertRegex(home['Server-Timing'], r'^db;dur=[\d.]+;desc="2 queries"')
+
+    async def test_budgets_are_enforced(self):
+        with mock.patch.object(HomeView, 'query_budget', 1), translation.override('en'):
+            with self.assertRaisesMessage(QueryBudgetExceeded, 'core:home ran 2 queries'):
+                await self.async_client.get(reverse('core:home'))
+
+    async def test_missing_objects_and_pages_are_not_found(self):
+        with translation.override('en'):
+            for url in (
+                reverse('projects:project_detail', args=[self.project.pk + 1]),
+                reverse('projects:project_list') + '?page=2',
+                reverse('core:donor_detail', args=['000000000']),
+            ):
+                response = await self.async_client.get(url)
+                self.assertEqual(response.status_code, 404, url)
+
+    async def test_pages_are_cached(self):
+        with translation.override('en'):
+            first = await self.async_client.get(reverse('core:home'))
+            second = await self.async_client.get(reverse('core:home'))
+        self.assertEqual(second.content, first.content)
+        self.assertIsNone(second.context)
+
+
+class SlowQueryLogTests(TestCase):
+    """Slow statements logged with their caller and plan"""
+
+    def setUp(self):
+        cache.clear()
+        navigation.links('en')
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.log = os.path.join(directory, 'slow.log')
+        settings = override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_LOG=self.log)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        slow_query_log.throttle.reset()
+
+    def test_samples_name_view_caller_and_plan(self):
+        with connection.execute_wrapper(slow_query_log):
+            self.client.get(reverse('core:home'))
+        samples = list(read_samples(self.log))
+        self.assertTrue(samples)
+        sample = samples[-1]
+        self.assertEqual(sample['view'], 'core:home')
+        self.assertRegex(sample['stack'][0], r'^\w+/[\w/]+\.py:\d+ in \w+$')
+        self.assertRegex(sample['plan'], r'SCAN|SEARCH')
+        self.assertNotIn('params', sample)
+
+    def test_repeated_statements_are_rate_limited(self):
+        with connection.execute_wrapper(slow_query_log):
+            for pk in range(6):
+                list(Donor.objects.filter(pk=pk))
+        self.assertEqual(len(list(read_samples(self.log))), 3)
+
+    def test_fast_statements_are_not_logged(self):
+        with override_settings(SLOW_QUERY_THRESHOLD_MS=10000), connection.execute_wrapper(slow_query_log):
+            list(Donor.objects.all())
+        self.assertEqual(list(read_samples(self.log)), [])
+
+    def test_report_groups_by_fingerprint(self):
+        with connection.execute_wrapper(slow_query_log):
+            for pk in range(2):
+                list(Donor.objects.filter(pk=pk))
+            list(Project.objects.all())
+        out = io.StringIO()
+        call_command('slow_queries', '--log', self.log, '--sort', 'count', stdout=out)
+        report = out.getvalue()
+        self.assertRegex(report, r'1\. 2 samples.*\n.*FROM "core_donor" WHERE "core_donor"."id" = %s')
+        self.assertIn('2 distinct statements', report)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class PopulateDummyDataTests(TestCase):
+    """Seeded, scalable dummy data"""
+
+    def populate(self, *args):
+        call_command('populate_dummy_data', *args, '--batch-size', '100', stdout=io.StringIO())
+        return list(Donation.objects.order_by('pk').values_list('donor__name', 'amount', 'currency', 'date_received'))
+
+    def test_same_seed_same_data(self):
+        first = self.populate('--scale', '500', '--seed', '7')
+        self.assertEqual(len(first), 500)
+        self.assertEqual(self.populate('--scale', '500', '--seed', '7'), first)
+        self.assertNotEqual(self.populate('--scale', '500', '--seed', '8'), first)
+
+    def test_generated_data_is_consistent(self):
+        self.populate('--scale', '500')
+        self.assertEqual(DonorStats.objects.count(), Donor.objects.count())
+        self.assertEqual(Donor.objects.values('donor_id').distinct().count(), Donor.objects.count())
+        self.assertFalse(Donation.objects.exclude(community=models.F('donor__community')).exists())
+        over_allocated = Donation.objects.annotate(allocated=models.Sum('allocations__amount')).filter(
+            allocated__gt=models.F('amount')
+        )
+        self.assertFalse(over_allocated.exists())
+        recovering = Project.objects.filter(status='RECOVERING').annotate(recovered=models.Sum('recoveries__amount'))
+        for project in recovering:
+            self.assertEqual(project.total_recovered, project.recovered or 0)
+
+    def test_append_keeps_existing_data(self):
+        self.populate('--scale', '300')
+        donors = Donor.objects.count()
+        self.populate('--scale', '300', '--append', '--seed', '1')
+        self.assertEqual(Donation.objects.count(), 600)
+        self.assertGreater(Donor.objects.count(), donors)
+        self.assertEqual(CustomUser.objects.filter(username='director').count(), 1)
+
+
+class BenchmarkComparisonTests(SimpleTestCase):
+    """Benchmark results against a baseline"""
+
+    def result(self, queries=3, p50=10.0, p90=12.0, memory=200.0):
+        return {'queries': queries, 'p50_ms': p50, 'p90_ms': p90, 'peak_memory_kb': memory}
+
+    def test_percentiles_interpolate(self):
+        self.assertEqual(percentile([4, 1, 3, 2], 0.5), 2.5)
+        self.assertEqual(percentile([5], 0.9), 5)
+
+    def test_regressions_beyond_tolerance(self):
+        baseline = {'scenarios': {'home': self.result(), 'blog': {'error': 'TemplateDoesNotExist'}}}
+        results = {'scenarios': {
+            'home': self.result(queries=4, p50=12.0, p90=20.0, memory=300.0),
+            'blog': self.result(),
+            'new': self.result(),
+        }}
+        self.assertEqual(compare(results, baseline), [
+            ('home', 'queries', 3, 4),
+            ('home', 'p90_ms', 12.0, 20.0),
+            ('home', 'peak_memory_kb', 200.0, 300.0),
+        ])
+        self.assertEqual(compare(results, baseline, latency_tolerance=1, memory_tolerance=1, query_tolerance=1), [])
+
+    def test_scenarios_that_start_failing_regress(self):
+        baseline = {'scenarios': {'home': self.result(), 'blog': {'error': 'TemplateDoesNotExist'}}}
+        results = {'scenarios': {'home': {'error': 'AssertionError: / answered 500'}, 'blog': {'error': 'Still'}}}
+        self.assertEqual(compare(results, baseline), [('home', 'error', 'ok', 'AssertionError: / answered 500')])
+
+    def test_sub_millisecond_changes_are_noise(self):
+        baseline = {'scenarios': {'lookup': self.result(p50=1.0, p90=1.2)}}
+        results = {'scenarios': {'lookup': self.result(p50=1.9, p90=2.1)}}
+        self.assertEqual(compare(results, baseline), [])
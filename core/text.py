@@ -0,0 +1,11 @@
+"""Text normalization shared by the skill index and the recommenders"""
+
+
+def stem(token):
+    """Fold plural/continuous forms of a Latin-script word into one token (Urdu words are kept whole)"""
+    if token.isascii():
+        if token.endswith('ing') and len(token) > 5:
+            return token[:-3]
+        if token.endswith('s') and not token.endswith('ss') and len(token) > 3:
+            return token[:-1]
+    return token
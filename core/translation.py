@@ -0,0 +1,78 @@
+"""Bilingual (English/Urdu) model fields.
+
+Translatable text is stored in column pairs such as ``title``/``title_ur``.
+``TranslatedField`` exposes the active language's value of a pair as one
+attribute (``localized_title``), falling back to English when the Urdu
+column is blank. ``LocalizedQuerySet.localized()`` makes a query load just
+that value: English pages defer the Urdu columns, and Urdu pages read one
+``COALESCE(NULLIF(title_ur, ''), title)`` column instead of both.
+"""
+from django.db import models
+from django.db.models.functions import Coalesce, NullIf
+from django.utils.translation import get_language
+
+
+# Language held in the ``*_ur`` columns; every other language reads the base column
+TRANSLATION_LANGUAGE = 'ur'
+
+
+def localized_field(obj, field):
+    """Urdu value of a bilingual field when rendering in Urdu and it is filled in"""
+    if get_language() == TRANSLATION_LANGUAGE:
+        return getattr(obj, f'{field}_ur', '') or getattr(obj, field)
+    return getattr(obj, field)
+
+
+class TranslatedField:
+    """Model attribute reading the active language's value of a column pair.
+
+    ``translation`` defaults to ``<field>_ur``. Values loaded by
+    ``localized()`` are used as they are; otherwise the attribute picks
+    between the two (loaded) columns.
+    """
+
+    def __init__(self, field, translation=None):
+        self.field = field
+        self.translation = translation or f'{field}_ur'
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        if self.name in instance.__dict__:
+            return instance.__dict__[self.name]
+        if get_language() == TRANSLATION_LANGUAGE:
+            return getattr(instance, self.translation) or getattr(instance, self.field)
+        return getattr(instance, self.field)
+
+    def __set__(self, instance, value):
+        # Set by querysets annotating the resolved value
+        instance.__dict__[self.name] = value
+
+
+def translated_fields(model):
+    """The TranslatedField attributes of a model"""
+    return [
+        attribute
+        for klass in reversed(model.__mro__)
+        for attribute in vars(klass).values()
+        if isinstance(attribute, TranslatedField)
+    ]
+
+
+class LocalizedQuerySet(models.QuerySet):
+    """Queryset of a model with TranslatedField attributes"""
+
+    def localized(self, language=None):
+        """Load only ``language``'s (default: the active language's) text of every translated field"""
+        fields = translated_fields(self.model)
+        if (language or get_language()) != TRANSLATION_LANGUAGE:
+            return self.defer(*[field.translation for field in fields])
+        return self.defer(*[column for field in fields for column in (field.field, field.translation)]).annotate(**{
+            field.name: Coalesce(
+                NullIf(field.translation, models.Value('')), field.field, output_field=models.TextField()
+            )
+            for field in fields
+        })
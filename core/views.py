@@ -1,8 +1,18 @@
+import asyncio
+from decimal import Decimal
+from operator import attrgetter
+from asgiref.sync import sync_to_async
+from django.db.models import Prefetch
+from django.http import Http404, HttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
-from django.views.generic import TemplateView, ListView, DetailView, CreateView
+from django.views.generic import TemplateView, ListView, CreateView
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
+from .asyncviews import AsyncDetailView, alist
+from .dedup import find_matching_donor
+from .lookup import client_ip, donor_ids, lookup_throttle
 from .models import Donor, Volunteer, Community
+from .routers import afan_out, aget_from_any, database_for_community, use_community_database
 from projects.models import Project
 from blog.models import BlogPost
 
@@ -10,18 +20,27 @@ from blog.models import BlogPost
 class HomeView(TemplateView):
     """Homepage view"""
     template_name = 'core/home.html'
-
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['featured_projects'] = Project.objects.filter(
-            is_featured=True,
-            is_public=True
-        )[:6]
-        context['featured_posts'] = BlogPost.objects.filter(
-            is_published=True,
-            is_featured=True
-        )[:3]
-        return context
+    page_cache_tags = ('projects', 'blog', 'pages')
+    # Featured projects, featured posts, navigation links (once per process)
+    query_budget = 3
+    # Featured projects, per community database
+    fan_out_queries = 1
+
+    async def get(self, request, *args, **kwargs):
+        featured_projects, featured_posts = await asyncio.gather(
+            afan_out(
+                Project.objects.filter(is_featured=True, is_public=True).for_cards().localized()[:6],
+                key=attrgetter('created_at'),
+                reverse=True
+            ),
+            alist(BlogPost.objects.filter(
+                is_published=True,
+                is_featured=True
+            ).for_cards().localized()[:3]),
+        )
+        return self.render_to_response(self.get_context_data(
+            featured_projects=featured_projects[:6], featured_posts=featured_posts, **kwargs
+        ))
 
 
 class DonorLookupView(TemplateView):
@@ -29,34 +48,67 @@ class DonorLookupView(TemplateView):
     template_name = 'core/donor_lookup.html'
 
     def post(self, request, *args, **kwargs):
+        if not lookup_throttle.allow(client_ip(request)):
+            messages.error(request, _('Too many lookup attempts. Please wait a minute and try again.'))
+            return self.render_to_response(self.get_context_data(**kwargs), status=429)
+
         donor_id = request.POST.get('donor_id', '').strip()
         if donor_id:
-            try:
-                donor = Donor.objects.get(donor_id=donor_id)
+            # Checked against the in-memory index; IDs missing from it cost one
+            # indexed query while the index's fallback budget lasts
+            if donor_id in donor_ids:
                 return redirect('core:donor_detail', donor_id=donor_id)
-            except Donor.DoesNotExist:
-                messages.error(request, _('Invalid Donor ID. Please check and try again.'))
+            messages.error(request, _('Invalid Donor ID. Please check and try again.'))
         return self.get(request, *args, **kwargs)
 
 
-class DonorDetailView(DetailView):
+class DonorDetailView(AsyncDetailView):
     """Donor detail page showing donations and allocations"""
     model = Donor
     template_name = 'core/donor_detail.html'
     slug_field = 'donor_id'
     slug_url_kwarg = 'donor_id'
-
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
+    # Donor, donations, allocations, projects with funding totals, navigation links
+    query_budget = 5
+
+    async def get(self, request, *args, **kwargs):
+        if not lookup_throttle.allow(client_ip(request)):
+            return HttpResponse(_('Too many lookup attempts.'), status=429)
+        return await super().get(request, *args, **kwargs)
+
+    async def aget_object(self, queryset=None):
+        donor_id = self.kwargs.get(self.slug_url_kwarg)
+        # The index is (re)loaded from the database now and then; see DonorIdIndex for misses
+        if not await sync_to_async(donor_ids.__contains__)(donor_id):
+            raise Http404(_('No donor found with this ID'))
+        try:
+            return await aget_from_any(queryset or self.get_queryset(), donor_id=donor_id)
+        except Donor.DoesNotExist:
+            raise Http404(_('No donor found with this ID'))
+
+    async def aget_context_data(self, **kwargs):
+        context = self.get_context_data(**kwargs)
         donor = self.object
-        context['donations'] = donor.donations.all().order_by('-date_received')
-        context['total_donated'] = donor.total_donated()
 
-        # Get all projects funded by this donor
+        # Donations, allocations and funded projects in three queries
         from donations.models import DonationAllocation
-        allocations = DonationAllocation.objects.filter(
-            donation__donor=donor
-        ).select_related('project').order_by('-allocated_date')
+        donations = await alist(
+            donor.donations.order_by('-date_received').prefetch_related(
+                Prefetch(
+                    'allocations',
+                    queryset=DonationAllocation.objects.order_by('-allocated_date')
+                ),
+                Prefetch('allocations__project', queryset=Project.objects.with_funding()),
+            )
+        )
+        context['donations'] = donations
+        context['total_donated'] = sum((donation.amount for donation in donations), Decimal('0.00'))
+
+        # Get all projects funded by this donor
+        allocations = [
+            allocation for donation in donations for allocation in donation.allocations.all()
+        ]
+        allocations.sort(key=lambda allocation: allocation.allocated_date, reverse=True)
         context['allocations'] = allocations
 
         return context
@@ -100,38 +152,47 @@ class DonateView(TemplateView):
         payment_method = request.POST.get('payment_method')
         is_anonymous = request.POST.get('is_anonymous') == 'on'
 
-        # Create or get donor
+        # Create or get donor, in the community's own database when routing is on
         community = Community.objects.get(id=community_id)
-        donor, created = Donor.objects.get_or_create(
-            email=email,
-            defaults={
-                'name': name,
-                'phone': phone,
-                'address': address,
-                'community': community,
-                'is_anonymous': is_anonymous
-            }
-        )
-
-        # Create donation
-        from datetime import date
-        donation = Donation.objects.create(
-            donor=donor,
-            amount=amount,
-            currency=currency,
-            payment_method=payment_method,
-            date_received=date.today()
-        )
-
-        # Store donor ID in session to show on success page
-        request.session['donor_id'] = donor.donor_id
+        with use_community_database(database_for_community(community.pk)):
+            donor = find_matching_donor(community, name=name, email=email, phone=phone)
+            created = donor is None
+            if created:
+                donor = Donor.objects.create(
+                    name=name,
+                    email=email or '',
+                    phone=phone or '',
+                    address=address,
+                    community=community,
+                    is_anonymous=is_anonymous
+                )
+
+            # Create donation
+            from datetime import date
+            donation = Donation.objects.create(
+                donor=donor,
+                amount=amount,
+                currency=currency,
+                payment_method=payment_method,
+                date_received=date.today()
+            )
+
+        # Only a new donor's ID is shown: matching an email or phone number
+        # must not hand someone else's ID to whoever typed it
+        request.session['donor_id'] = donor.donor_id if created else None
         request.session['donation_amount'] = str(amount)
         request.session['donation_currency'] = currency
 
-        messages.success(
-            request,
-            _('Thank you for your generous donation! Your unique Donor ID is: {}').format(donor.donor_id)
-        )
+        if created:
+            messages.success(
+                request,
+                _('Thank you for your generous donation! Your unique Donor ID is: {}').format(donor.donor_id)
+            )
+        else:
+            messages.success(
+                request,
+                _('Thank you for your generous donation! It has been added to your existing donor record.')
+            )
         return redirect('core:donate_success')
 
 
@@ -12,7 +12,7 @@ TEMPLATES = {
 {% load static %}
 {% load i18n %}
 
-{% block title %}{{ project.title }} - Bait ul Rizq{% endblock %}
+{% block title %}{{ project.localized_title }} - Bait ul Rizq{% endblock %}
 
 {% block content %}
 <section class="py-5">
@@ -20,20 +20,20 @@ TEMPLATES = {
         <div class="row">
             <div class="col-lg-8">
                 {% if project.image %}
-                <img src="{{ project.image.url }}" class="img-fluid rounded-4 shadow-lg mb-4" alt="{{ project.title }}">
+                <img src="{{ project.image.url }}" class="img-fluid rounded-4 shadow-lg mb-4" alt="{{ project.localized_title }}">
                 {% else %}
-                <img src="https://images.unsplash.com/photo-1556740758-90de374c12ad?w=800" class="img-fluid rounded-4 shadow-lg mb-4" alt="{{ project.title }}">
+                <img src="https://images.unsplash.com/photo-1556740758-90de374c12ad?w=800" class="img-fluid rounded-4 shadow-lg mb-4" alt="{{ project.localized_title }}">
                 {% endif %}
 
                 <div class="mb-4">
                     <span class="badge bg-primary me-2">{{ project.get_status_display }}</span>
                     {% if project.category %}
-                    <span class="badge bg-secondary">{{ project.category }}</span>
+                    <span class="badge bg-secondary">{{ project.category.localized_name }}</span>
                     {% endif %}
                 </div>
 
-                <h1 class="display-5 fw-bold mb-3">{{ project.title }}</h1>
-                <p class="lead text-muted mb-4">{{ project.description }}</p>
+                <h1 class="display-5 fw-bold mb-3">{{ project.localized_title }}</h1>
+                <p class="lead text-muted mb-4">{{ project.localized_description }}</p>
 
                 <div class="card border-0 bg-light mb-4">
                     <div class="card-body">
@@ -234,6 +234,12 @@ TEMPLATES = {
     <div class="container text-center">
         <h1 class="display-4 fw-bold mb-3">{% trans "Our Blog" %}</h1>
         <p class="lead">{% trans "Success stories, updates, and news from our community" %}</p>
+        <form action="{% url 'blog:blog_search' %}" method="get" class="row justify-content-center mt-4">
+            <div class="col-md-6 input-group">
+                <input type="search" name="q" class="form-control" placeholder="{% trans 'Search the blog' %}">
+                <button type="submit" class="btn btn-light"><i class="bi bi-search"></i></button>
+            </div>
+        </form>
     </div>
 </section>
 
@@ -244,21 +250,21 @@ TEMPLATES = {
             <div class="col-md-6 col-lg-4">
                 <div class="card h-100 border-0 shadow-sm">
                     {% if post.featured_image %}
-                    <img src="{{ post.featured_image.url }}" class="card-img-top" alt="{{ post.title }}">
+                    <img src="{{ post.featured_image.url }}" class="card-img-top" alt="{{ post.localized_title }}">
                     {% else %}
-                    <img src="https://images.unsplash.com/photo-1532629345422-7515f3d16bb6?w=400" class="card-img-top" alt="{{ post.title }}">
+                    <img src="https://images.unsplash.com/photo-1532629345422-7515f3d16bb6?w=400" class="card-img-top" alt="{{ post.localized_title }}">
                     {% endif %}
                     <div class="card-body">
                         <div class="mb-2">
                             {% if post.category %}
-                            <span class="badge bg-info">{{ post.category }}</span>
+                            <span class="badge bg-info">{{ post.category.localized_name }}</span>
                             {% endif %}
                             <small class="text-muted ms-2">
                                 <i class="bi bi-calendar3"></i> {{ post.published_date|date:"M d, Y" }}
                             </small>
                         </div>
-                        <h5 class="card-title fw-bold">{{ post.title }}</h5>
-                        <p class="card-text text-muted">{{ post.excerpt|truncatewords:20 }}</p>
+                        <h5 class="card-title fw-bold">{{ post.localized_title }}</h5>
+                        <p class="card-text text-muted">{{ post.localized_excerpt|truncatewords:20 }}</p>
                         <a href="{% url 'blog:blog_detail' post.slug %}" class="btn btn-outline-primary">
                             {% trans "Read More" %} <i class="bi bi-arrow-right"></i>
                         </a>
@@ -277,13 +283,67 @@ TEMPLATES = {
         </div>
     </div>
 </section>
+{% endblock %}''',
+
+    "templates/blog/blog_search.html": '''{% extends 'base.html' %}
+{% load static %}
+{% load i18n %}
+
+{% block title %}{% trans "Search" %} - Bait ul Rizq{% endblock %}
+
+{% block content %}
+<section class="hero-section py-5">
+    <div class="container text-center">
+        <h1 class="display-4 fw-bold mb-3">{% trans "Search the Blog" %}</h1>
+        <form action="{% url 'blog:blog_search' %}" method="get" class="row justify-content-center mt-4">
+            <div class="col-md-6 input-group">
+                <input type="search" name="q" value="{{ query }}" class="form-control" placeholder="{% trans 'Search the blog' %}" autofocus>
+                <button type="submit" class="btn btn-light"><i class="bi bi-search"></i></button>
+            </div>
+        </form>
+    </div>
+</section>
+
+<section class="py-5">
+    <div class="container">
+        {% if query %}
+        <p class="text-muted">{% blocktrans count counter=paginator.count %}{{ counter }} result for "{{ query }}"{% plural %}{{ counter }} results for "{{ query }}"{% endblocktrans %}</p>
+        {% endif %}
+        <div class="list-group list-group-flush">
+            {% for post in posts %}
+            <a href="{% url 'blog:blog_detail' post.slug %}" class="list-group-item list-group-item-action py-3">
+                <h5 class="fw-bold mb-1">{{ post.localized_title }}</h5>
+                <small class="text-muted"><i class="bi bi-calendar3"></i> {{ post.published_date|date:"M d, Y" }}</small>
+                <p class="mb-0 mt-2">{% if post.search_snippet %}{{ post.search_snippet }}{% else %}{{ post.localized_excerpt|truncatewords:30 }}{% endif %}</p>
+            </a>
+            {% empty %}
+            {% if query %}
+            <div class="alert alert-info text-center">{% trans "No posts match your search." %}</div>
+            {% endif %}
+            {% endfor %}
+        </div>
+
+        {% if is_paginated %}
+        <nav class="mt-4">
+            <ul class="pagination justify-content-center">
+                {% if page_obj.has_previous %}
+                <li class="page-item"><a class="page-link" href="?q={{ query|urlencode }}&page={{ page_obj.previous_page_number }}">{% trans "Previous" %}</a></li>
+                {% endif %}
+                {% if page_obj.has_next %}
+                <li class="page-item"><a class="page-link" href="?q={{ query|urlencode }}&page={{ page_obj.next_page_number }}">{% trans "Next" %}</a></li>
+                {% endif %}
+            </ul>
+        </nav>
+        {% endif %}
+    </div>
+</section>
 {% endblock %}''',
 
     "templates/blog/blog_detail.html": '''{% extends 'base.html' %}
 {% load static %}
 {% load i18n %}
 
-{% block title %}{{ post.title }} - Bait ul Rizq{% endblock %}
+{% block title %}{{ post.localized_title }} - Bait ul Rizq{% endblock %}
 
 {% block content %}
 <section class="py-5">
@@ -291,12 +351,12 @@ TEMPLATES = {
         <div class="row justify-content-center">
             <div class="col-lg-8">
                 {% if post.featured_image %}
-                <img src="{{ post.featured_image.url }}" class="img-fluid rounded-4 shadow-lg mb-4" alt="{{ post.title }}">
+                <img src="{{ post.featured_image.url }}" class="img-fluid rounded-4 shadow-lg mb-4" alt="{{ post.localized_title }}">
                 {% endif %}
 
                 <div class="mb-4">
                     {% if post.category %}
-                    <span class="badge bg-info me-2">{{ post.category }}</span>
+                    <span class="badge bg-info me-2">{{ post.category.localized_name }}</span>
                     {% endif %}
                     <span class="text-muted">
                         <i class="bi bi-calendar3"></i> {{ post.published_date|date:"F d, Y" }}
@@ -306,12 +366,32 @@ TEMPLATES = {
                     </span>
                 </div>
 
-                <h1 class="display-4 fw-bold mb-4">{{ post.title }}</h1>
+                <h1 class="display-4 fw-bold mb-4">{{ post.localized_title }}</h1>
 
                 <div class="blog-content">
-                    {{ post.content|safe }}
+                    {{ post.localized_content|safe }}
                 </div>
 
+                {% if related_posts %}
+                <hr class="my-5">
+
+                <h4 class="fw-bold mb-4">{% trans "Related Posts" %}</h4>
+                <div class="row g-4">
+                    {% for related in related_posts %}
+                    <div class="col-md-6">
+                        <div class="card h-100 border-0 shadow-sm">
+                            <div class="card-body">
+                                <h6 class="card-title fw-bold">
+                                    <a href="{% url 'blog:blog_detail' related.slug %}" class="text-decoration-none">{{ related.localized_title }}</a>
+                                </h6>
+                                <p class="card-text text-muted small">{{ related.localized_excerpt|truncatewords:20 }}</p>
+                            </div>
+                        </div>
+                    </div>
+                    {% endfor %}
+                </div>
+                {% endif %}
+
                 <hr class="my-5">
 
                 <div class="text-center">
@@ -329,16 +409,16 @@ TEMPLATES = {
 {% load static %}
 {% load i18n %}
 
-{% block title %}{{ page.title }} - Bait ul Rizq{% endblock %}
+{% block title %}{{ page.localized_title }} - Bait ul Rizq{% endblock %}
 
 {% block content %}
 <section class="py-5">
     <div class="container">
         <div class="row justify-content-center">
             <div class="col-lg-8">
-                <h1 class="display-4 fw-bold mb-4">{{ page.title }}</h1>
+                <h1 class="display-4 fw-bold mb-4">{{ page.localized_title }}</h1>
                 <div class="page-content">
-                    {{ page.content|safe }}
+                    {{ page.localized_content|safe }}
                 </div>
             </div>
         </div>
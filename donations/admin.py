@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 from django.db.models import Sum
+from core.scoping import CommunityScopedAdminMixin, scope_queryset
 from .models import Donation, DonationAllocation
 
 
@@ -13,10 +14,10 @@ class DonationAllocationInline(admin.TabularInline):
 
 
 @admin.register(Donation)
-class DonationAdmin(admin.ModelAdmin):
+class DonationAdmin(CommunityScopedAdminMixin, admin.ModelAdmin):
     list_display = ['donor', 'amount', 'currency', 'payment_method', 'date_received',
                     'allocated_amount_display', 'remaining_amount_display', 'receipt_issued', 'created_at']
-    list_filter = ['currency', 'payment_method', 'receipt_issued', 'date_received', 'donor__community']
+    list_filter = ['currency', 'payment_method', 'receipt_issued', 'date_received', 'community']
     search_fields = ['donor__name', 'donor__donor_id', 'reference_number']
     readonly_fields = ['created_at', 'updated_at', 'allocated_amount_display',
                        'remaining_amount_display', 'is_fully_allocated_display']
@@ -48,16 +49,6 @@ class DonationAdmin(admin.ModelAdmin):
         }),
     )
 
-    def get_queryset(self, request):
-        """Restrict queryset based on user role"""
-        qs = super().get_queryset(request)
-        if request.user.is_superuser or request.user.role == 'DIRECTOR':
-            return qs
-        # Managers only see their community's donations
-        if request.user.community:
-            return qs.filter(donor__community=request.user.community)
-        return qs.none()
-
     def allocated_amount_display(self, obj):
         """Display allocated amount"""
         return f"{obj.allocated_amount()} {obj.currency}"
@@ -76,9 +67,9 @@ class DonationAdmin(admin.ModelAdmin):
 
 
 @admin.register(DonationAllocation)
-class DonationAllocationAdmin(admin.ModelAdmin):
+class DonationAllocationAdmin(CommunityScopedAdminMixin, admin.ModelAdmin):
     list_display = ['donation', 'project', 'amount', 'allocated_date']
-    list_filter = ['allocated_date', 'donation__currency', 'project__community']
+    list_filter = ['allocated_date', 'donation__currency', 'community']
     search_fields = ['donation__donor__name', 'project__title', 'project__beneficiary_name']
     readonly_fields = ['allocated_date']
     autocomplete_fields = ['donation', 'project']
@@ -95,14 +86,5 @@ class DonationAllocationAdmin(admin.ModelAdmin):
     )
 
     def get_queryset(self, request):
-        """Restrict queryset based on user role"""
-        qs = super().get_queryset(request)
-        if request.user.is_superuser or request.user.role == 'DIRECTOR':
-            return qs
-        # Managers only see their community's allocations
-        if request.user.community:
-            return qs.filter(
-                donation__donor__community=request.user.community,
-                project__community=request.user.community
-            )
-        return qs.none()
+        """Managers see allocations of their community's donations to their community's projects"""
+        return scope_queryset(super().get_queryset(request), request, 'project__community')
@@ -0,0 +1,96 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_community(apps, schema_editor):
+    Donation = apps.get_model("donations", "Donation")
+    DonationAllocation = apps.get_model("donations", "DonationAllocation")
+    db_alias = schema_editor.connection.alias
+    Donation.objects.using(db_alias).update(
+        community_id=models.Subquery(
+            Donation.objects.filter(pk=models.OuterRef("pk")).values(
+                "donor__community_id"
+            )[:1]
+        )
+    )
+    DonationAllocation.objects.using(db_alias).update(
+        community_id=models.Subquery(
+            Donation.objects.filter(pk=models.OuterRef("donation_id")).values(
+                "community_id"
+            )[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_donorstats"),
+        ("donations", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="donation",
+            name="community",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="donations",
+                to="core.community",
+                verbose_name="Community",
+            ),
+        ),
+        migrations.AddField(
+            model_name="donationallocation",
+            name="community",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="allocations",
+                to="core.community",
+                verbose_name="Community",
+            ),
+        ),
+        migrations.RunPython(populate_community, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="donation",
+            name="community",
+            field=models.ForeignKey(
+                editable=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="donations",
+                to="core.community",
+                verbose_name="Community",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="donationallocation",
+            name="community",
+            field=models.ForeignKey(
+                editable=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="allocations",
+                to="core.community",
+                verbose_name="Community",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="donation",
+            index=models.Index(
+                fields=["community", "-date_received"],
+                name="donation_community_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="donationallocation",
+            index=models.Index(
+                fields=["community", "-allocated_date"],
+                name="allocation_community_date_idx",
+            ),
+        ),
+    ]
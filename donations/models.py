@@ -29,6 +29,14 @@ class Donation(models.Model):
         related_name='donations',
         verbose_name=_("Donor")
     )
+    # Denormalized from donor.community so community scoping needs no join
+    community = models.ForeignKey(
+        Community,
+        on_delete=models.PROTECT,
+        related_name='donations',
+        editable=False,
+        verbose_name=_("Community")
+    )
     amount = models.DecimalField(
         max_digits=12,
         decimal_places=2,
@@ -64,10 +72,23 @@ class Donation(models.Model):
         verbose_name = _("Donation")
         verbose_name_plural = _("Donations")
         ordering = ['-date_received', '-created_at']
+        indexes = [
+            models.Index(fields=['community', '-date_received'], name='donation_community_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.donor.name} - {self.amount} {self.currency} on {self.date_received}"
 
+    def save(self, *args, **kwargs):
+        self.community_id = self.donor.community_id
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'community'}
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if not adding:
+            self.allocations.exclude(community_id=self.community_id).update(community_id=self.community_id)
+
     def allocated_amount(self):
         """Calculate total amount allocated to projects"""
         return self.allocations.aggregate(
@@ -98,6 +119,14 @@ class DonationAllocation(models.Model):
         related_name='allocations',
         verbose_name=_("Project")
     )
+    # Denormalized from donation.community so community scoping needs no join
+    community = models.ForeignKey(
+        Community,
+        on_delete=models.PROTECT,
+        related_name='allocations',
+        editable=False,
+        verbose_name=_("Community")
+    )
     amount = models.DecimalField(
         max_digits=12,
         decimal_places=2,
@@ -115,6 +144,9 @@ class DonationAllocation(models.Model):
         verbose_name_plural = _("Donation Allocations")
         ordering = ['-allocated_date']
         unique_together = ['donation', 'project']
+        indexes = [
+            models.Index(fields=['community', '-allocated_date'], name='allocation_community_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.amount} {self.donation.currency} from {self.donation.donor.name} to {self.project.title}"
@@ -138,4 +170,5 @@ class DonationAllocation(models.Model):
 
     def save(self, *args, **kwargs):
         self.clean()
+        self.community_id = self.donation.community_id
         super().save(*args, **kwargs)
@@ -0,0 +1,39 @@
+from django.contrib import admin
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'priority', 'attempts', 'run_at', 'created_at', 'finished_at']
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'dedup_key']
+    readonly_fields = [
+        'name', 'args', 'kwargs', 'dedup_key', 'attempts', 'claimed_by', 'claimed_at', 'last_error',
+        'created_at', 'finished_at',
+    ]
+    actions = ['retry_now']
+
+    fieldsets = (
+        (_('Job'), {
+            'fields': ('name', 'args', 'kwargs', 'dedup_key')
+        }),
+        (_('Scheduling'), {
+            'fields': ('status', 'priority', 'run_at', 'attempts', 'max_attempts')
+        }),
+        (_('Execution'), {
+            'fields': ('claimed_by', 'claimed_at', 'finished_at', 'last_error'),
+        }),
+        (_('Timestamps'), {
+            'fields': ('created_at',),
+            'classes': ('collapse',)
+        }),
+    )
+
+    @admin.action(description=_('Run selected failed jobs again'))
+    def retry_now(self, request, queryset):
+        count = queryset.filter(status=Job.FAILED).update(
+            status=Job.PENDING, attempts=0, run_at=timezone.now(), claimed_by='', claimed_at=None, finished_at=None
+        )
+        self.message_user(request, _('%(count)d jobs queued again.') % {'count': count})
@@ -0,0 +1,84 @@
+"""Django management command to run background jobs (see jobs.queue)"""
+import multiprocessing
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.worker import Worker, run_process
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs in one or more worker processes until stopped'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=1,
+            help='Worker processes to run (default 1, in this process)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10,
+            help='Jobs each worker claims per poll (default 10)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            help='Seconds an idle worker waits between polls (default JOBS_POLL_INTERVAL)'
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Run the jobs that are ready, then exit (single process)'
+        )
+
+    def handle(self, *args, **options):
+        if options['burst'] or options['processes'] <= 1:
+            worker = Worker(
+                batch_size=options['batch_size'], poll_interval=options['poll_interval'], burst=options['burst']
+            )
+            if not options['burst']:
+                signal.signal(signal.SIGTERM, worker.stop)
+                signal.signal(signal.SIGINT, worker.stop)
+                self.stdout.write(f'Worker {worker.name} waiting for jobs (Ctrl-C to stop).')
+            succeeded, failed = worker.run()
+            self.stdout.write(f'Ran {succeeded + failed} jobs: {succeeded} succeeded, {failed} failed.')
+            return
+        self.supervise(options['processes'], options['batch_size'], options['poll_interval'])
+
+    def supervise(self, count, batch_size, poll_interval):
+        """Keep ``count`` worker processes running until SIGTERM/SIGINT"""
+        stopping = False
+
+        def stop(*args):
+            nonlocal stopping
+            stopping = True
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        # Forked children must open their own connections
+        connections.close_all()
+
+        def start():
+            process = multiprocessing.Process(target=run_process, args=(batch_size, poll_interval), daemon=False)
+            process.start()
+            return process
+
+        processes = [start() for _ in range(count)]
+        self.stdout.write(f'Started {count} workers (Ctrl-C to stop).')
+        while not stopping:
+            time.sleep(1)
+            for index, process in enumerate(processes):
+                if not process.is_alive() and not stopping:
+                    self.stderr.write(f'Worker {process.pid} exited with code {process.exitcode}; restarting it.')
+                    processes[index] = start()
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+        self.stdout.write('Workers stopped.')
@@ -0,0 +1,63 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class Job(models.Model):
+    """A call of a @job function waiting for, or done by, a worker (see jobs.queue)"""
+
+    PENDING = 'PENDING'
+    RUNNING = 'RUNNING'
+    DONE = 'DONE'
+    FAILED = 'FAILED'
+    STATUS_CHOICES = [
+        (PENDING, _('Pending')),
+        (RUNNING, _('Running')),
+        (DONE, _('Done')),
+        (FAILED, _('Failed')),
+    ]
+
+    name = models.CharField(max_length=200, verbose_name=_("Job"))
+    args = models.JSONField(default=list, blank=True, verbose_name=_("Arguments"))
+    kwargs = models.JSONField(default=dict, blank=True, verbose_name=_("Keyword Arguments"))
+    priority = models.SmallIntegerField(
+        default=0,
+        verbose_name=_("Priority"),
+        help_text=_("Jobs with a higher priority run first")
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, verbose_name=_("Status"))
+    # At most one pending job per key; later enqueues of the same key are dropped
+    dedup_key = models.CharField(max_length=200, null=True, blank=True, verbose_name=_("Deduplication Key"))
+    run_at = models.DateTimeField(default=timezone.now, verbose_name=_("Run At"))
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name=_("Attempts"))
+    max_attempts = models.PositiveSmallIntegerField(default=5, verbose_name=_("Max Attempts"))
+    claimed_by = models.CharField(max_length=100, blank=True, verbose_name=_("Claimed By"))
+    claimed_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Claimed At"))
+    last_error = models.TextField(blank=True, verbose_name=_("Last Error"))
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Finished At"))
+
+    class Meta:
+        verbose_name = _("Job")
+        verbose_name_plural = _("Jobs")
+        ordering = ['-created_at']
+        indexes = [
+            # The workers' poll: ready jobs, highest priority and longest waiting first
+            models.Index(
+                fields=['-priority', 'run_at'],
+                condition=models.Q(status='PENDING'),
+                name='job_ready_idx'
+            ),
+            # Stale claims and finished jobs to purge
+            models.Index(fields=['status', 'finished_at'], name='job_status_finished_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dedup_key'],
+                condition=models.Q(status='PENDING'),
+                name='job_pending_dedup_key_unique'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()})"
@@ -0,0 +1,228 @@
+"""Database-backed queue for work that should not hold up a request.
+
+A function decorated with ``@job`` in an app's ``jobs.py`` can be called
+as usual or scheduled with ``enqueue(*args, **kwargs)``, which stores a
+``Job`` row on the default database and returns at once. ``manage.py
+run_worker`` processes poll for ready jobs with one ``SELECT ... LIMIT``,
+claim them by switching them to RUNNING in the same statement (or with
+``SELECT ... FOR UPDATE SKIP LOCKED`` where the database has it) and run
+them, highest priority first. No broker is involved: the queue is a table.
+
+Arguments must be JSON-serialisable. Enqueueing inside a transaction
+makes the job visible to workers only once the transaction commits.
+
+- ``priority``: higher runs first (default: the decorator's, or 0).
+- ``dedup_key``: while a job with the key is pending, enqueueing it again
+  does nothing and returns the pending job; once it runs, a new one can be
+  queued (so a change made while it ran is not missed). For a function
+  registered with ``@job(merge=True)``, whose first argument is a list, the
+  list is added to the pending job's instead, so one run covers every
+  change queued meanwhile.
+- ``delay``: seconds before the job may run.
+
+A job that raises is retried after JOBS_RETRY_DELAY seconds, doubling
+with each attempt up to JOBS_RETRY_MAX_DELAY, until it has run
+``max_attempts`` times; then it is FAILED and kept with its traceback.
+A job claimed longer than JOBS_LEASE seconds ago is assumed lost with its
+worker and put back in the queue.
+"""
+import inspect
+import logging
+import random
+import traceback
+import uuid
+from datetime import timedelta
+from functools import update_wrapper
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger('jobs')
+
+# Job functions by name, filled in as apps' jobs.py modules are imported
+registry = {}
+
+# Names enqueue() takes for itself
+ENQUEUE_OPTIONS = ('priority', 'dedup_key', 'delay')
+
+
+class JobFunction:
+    """A function workers can run; see ``job``"""
+
+    def __init__(self, func, priority=0, max_attempts=5, merge=False):
+        clashing = set(ENQUEUE_OPTIONS) & set(inspect.signature(func).parameters)
+        if clashing:
+            raise TypeError(f'{func.__qualname__} cannot be a job: enqueue() uses the names {sorted(clashing)}')
+        update_wrapper(self, func)
+        self.func = func
+        self.name = f'{func.__module__}.{func.__qualname__}'
+        self.priority = priority
+        self.max_attempts = max_attempts
+        self.merge = merge
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, *args, priority=None, dedup_key=None, delay=0, **kwargs):
+        """Queue a call; returns its Job (the pending one, for a duplicate ``dedup_key``)"""
+        job = Job(
+            name=self.name,
+            args=list(args),
+            kwargs=kwargs,
+            priority=self.priority if priority is None else priority,
+            dedup_key=dedup_key,
+            max_attempts=self.max_attempts,
+            run_at=timezone.now() + timedelta(seconds=delay),
+        )
+        if dedup_key is None:
+            job.save(using=DEFAULT_DB_ALIAS)
+            return job
+        # The pending duplicate may start running between the failed insert and the lookup
+        for _ in range(3):
+            if self.merge:
+                pending = _merge_into_pending(dedup_key, job.args[0])
+                if pending is not None:
+                    return pending
+            try:
+                with transaction.atomic(using=DEFAULT_DB_ALIAS):
+                    job.save(using=DEFAULT_DB_ALIAS)
+                return job
+            except IntegrityError:
+                job.pk = None
+                if self.merge:
+                    continue
+                pending = Job.objects.using(DEFAULT_DB_ALIAS).filter(dedup_key=dedup_key, status=Job.PENDING).first()
+                if pending is not None:
+                    return pending
+        raise IntegrityError(f'Could not enqueue {self.name} with dedup key {dedup_key!r}')
+
+
+def job(func=None, *, priority=0, max_attempts=5, merge=False):
+    """Register a function as a job: ``@job`` or ``@job(priority=10, max_attempts=3, merge=True)``"""
+    def register(func):
+        job_function = JobFunction(func, priority=priority, max_attempts=max_attempts, merge=merge)
+        registry[job_function.name] = job_function
+        return job_function
+    return register(func) if func is not None else register
+
+
+def _merge_into_pending(dedup_key, items):
+    """Add ``items`` to the list argument of the pending job with ``dedup_key``; returns it, or None"""
+    jobs = Job.objects.using(DEFAULT_DB_ALIAS)
+    with transaction.atomic(using=DEFAULT_DB_ALIAS):
+        pending = jobs.select_for_update().filter(dedup_key=dedup_key, status=Job.PENDING).first()
+        if pending is None:
+            return None
+        args = [list(dict.fromkeys([*pending.args[0], *items])), *pending.args[1:]]
+        # Without row locks (SQLite) a worker may have claimed it since
+        if not jobs.filter(pk=pending.pk, status=Job.PENDING).update(args=args):
+            return None
+    pending.args = args
+    return pending
+
+
+def _ready(limit):
+    return (
+        Job.objects.using(DEFAULT_DB_ALIAS)
+        .filter(status=Job.PENDING, run_at__lte=timezone.now())
+        .order_by('-priority', 'run_at', 'pk')
+        .values_list('pk', flat=True)[:limit]
+    )
+
+
+def claim(worker, limit=10):
+    """Mark up to ``limit`` ready jobs as RUNNING for ``worker`` and return them, in running order"""
+    token = f'{worker}:{uuid.uuid4().hex[:8]}'
+    values = {
+        'status': Job.RUNNING, 'claimed_by': token, 'claimed_at': timezone.now(), 'attempts': F('attempts') + 1,
+    }
+    jobs = Job.objects.using(DEFAULT_DB_ALIAS)
+    if connections[DEFAULT_DB_ALIAS].features.has_select_for_update_skip_locked:
+        with transaction.atomic(using=DEFAULT_DB_ALIAS):
+            pks = list(_ready(limit).select_for_update(skip_locked=True))
+            claimed = jobs.filter(pk__in=pks).update(**values)
+    else:
+        # One statement: SQLite runs writers one at a time, and the status
+        # check keeps a job another worker just claimed from being claimed again
+        claimed = jobs.filter(pk__in=_ready(limit), status=Job.PENDING).update(**values)
+    if not claimed:
+        return []
+    return list(jobs.filter(claimed_by=token, status=Job.RUNNING).order_by('-priority', 'run_at', 'pk'))
+
+
+def retry_delay(attempts):
+    """Seconds before another attempt, after ``attempts`` failed ones (with jitter)"""
+    base = getattr(settings, 'JOBS_RETRY_DELAY', 10)
+    ceiling = getattr(settings, 'JOBS_RETRY_MAX_DELAY', 3600)
+    return min(base * 2 ** (attempts - 1), ceiling) * random.uniform(0.75, 1.0)
+
+
+def _requeue(job, run_at, error=''):
+    """Put a claimed job back in the queue"""
+    function = registry.get(job.name)
+    merge = function is not None and function.merge
+    for _ in range(3):
+        try:
+            with transaction.atomic(using=DEFAULT_DB_ALIAS):
+                Job.objects.using(DEFAULT_DB_ALIAS).filter(pk=job.pk).update(
+                    status=Job.PENDING, run_at=run_at, claimed_by='', claimed_at=None, last_error=error
+                )
+            return
+        except IntegrityError:
+            # The same work was queued again meanwhile; that job will do it (merged with this one's)
+            if not merge or _merge_into_pending(job.dedup_key, job.args[0]) is not None:
+                Job.objects.using(DEFAULT_DB_ALIAS).filter(pk=job.pk).delete()
+                return
+    _finish(job, Job.FAILED, error)
+
+
+def _finish(job, status, error=''):
+    Job.objects.using(DEFAULT_DB_ALIAS).filter(pk=job.pk).update(
+        status=status, finished_at=timezone.now(), last_error=error
+    )
+
+
+def run(job):
+    """Run a claimed job and record the outcome; returns True if it succeeded"""
+    function = registry.get(job.name)
+    if function is None:
+        _finish(job, Job.FAILED, f'No job named {job.name} is registered')
+        logger.error('Job %s: no job named %s is registered', job.pk, job.name)
+        return False
+    try:
+        function(*job.args, **job.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            _requeue(job, timezone.now() + timedelta(seconds=retry_delay(job.attempts)), error)
+            logger.warning('Job %s (%s) failed, attempt %s of %s', job.pk, job.name, job.attempts, job.max_attempts)
+        else:
+            _finish(job, Job.FAILED, error)
+            logger.error('Job %s (%s) failed for good after %s attempts', job.pk, job.name, job.attempts)
+        return False
+    _finish(job, Job.DONE)
+    return True
+
+
+def requeue_stale():
+    """Requeue (or fail) jobs claimed more than JOBS_LEASE seconds ago; returns how many"""
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, 'JOBS_LEASE', 600))
+    stale = list(Job.objects.using(DEFAULT_DB_ALIAS).filter(status=Job.RUNNING, claimed_at__lt=cutoff))
+    for job in stale:
+        error = f'Worker {job.claimed_by} did not finish the job within JOBS_LEASE'
+        if job.attempts < job.max_attempts:
+            _requeue(job, timezone.now(), error)
+        else:
+            _finish(job, Job.FAILED, error)
+    return len(stale)
+
+
+def purge_finished():
+    """Delete jobs done more than JOBS_KEEP_DAYS days ago (failed ones are kept); returns how many"""
+    cutoff = timezone.now() - timedelta(days=getattr(settings, 'JOBS_KEEP_DAYS', 7))
+    deleted, _ = Job.objects.using(DEFAULT_DB_ALIAS).filter(status=Job.DONE, finished_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,133 @@
+import io
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from .queue import claim, job, requeue_stale, run
+
+calls = []
+
+
+@job
+def remember(value):
+    calls.append(value)
+
+
+@job(max_attempts=2)
+def explode():
+    raise ValueError('Boom')
+
+
+@job(merge=True)
+def remember_all(values, label):
+    calls.append((label, values))
+
+
+@job(merge=True, max_attempts=2)
+def explode_all(values):
+    raise ValueError('Boom')
+
+
+class JobQueueTests(TestCase):
+    """Enqueueing, claiming and running background jobs"""
+
+    def setUp(self):
+        calls.clear()
+
+    def test_jobs_run_by_priority_then_age(self):
+        remember.enqueue('first')
+        remember.enqueue('urgent', priority=10)
+        remember.enqueue('second')
+        remember.enqueue('later', delay=3600)
+        jobs = claim('test', limit=10)
+        self.assertEqual([job.args for job in jobs], [['urgent'], ['first'], ['second']])
+        self.assertEqual({job.status for job in jobs}, {Job.RUNNING})
+        self.assertEqual(claim('other', limit=10), [])
+
+    def test_claims_respect_the_limit(self):
+        for value in range(5):
+            remember.enqueue(value)
+        self.assertEqual(len(claim('test', limit=2)), 2)
+        self.assertEqual(len(claim('test', limit=10)), 3)
+
+    def test_pending_duplicates_are_dropped(self):
+        first = remember.enqueue('a', dedup_key='key')
+        self.assertEqual(remember.enqueue('b', dedup_key='key').pk, first.pk)
+        self.assertEqual(Job.objects.count(), 1)
+        # Once it runs, the same key can be queued again
+        claim('test')
+        self.assertNotEqual(remember.enqueue('c', dedup_key='key').pk, first.pk)
+        self.assertEqual(Job.objects.count(), 2)
+
+    def test_merging_jobs_collect_pending_items(self):
+        first = remember_all.enqueue([1, 2], 'a', dedup_key='key')
+        self.assertEqual(remember_all.enqueue([2, 3], 'a', dedup_key='key').pk, first.pk)
+        self.assertEqual(Job.objects.get().args, [[1, 2, 3], 'a'])
+        # Items queued while it runs wait for the next run
+        claimed = claim('test')[0]
+        remember_all.enqueue([4], 'a', dedup_key='key')
+        run(claimed)
+        call_command('run_worker', '--burst', stdout=io.StringIO())
+        self.assertEqual(calls, [('a', [1, 2, 3]), ('a', [4])])
+
+    def test_failed_merging_job_joins_the_pending_one(self):
+        explode_all.enqueue([1, 2], dedup_key='key')
+        claimed = claim('test')[0]
+        explode_all.enqueue([3], dedup_key='key')
+        with self.assertLogs('jobs', 'WARNING'):
+            run(claimed)
+        self.assertEqual(Job.objects.get().args, [[3, 1, 2]])
+
+    def test_failures_are_retried_with_backoff_then_kept(self):
+        explode.enqueue()
+        with self.assertLogs('jobs', 'WARNING'):
+            self.assertFalse(run(claim('test')[0]))
+        retry = Job.objects.get()
+        self.assertEqual((retry.status, retry.attempts), (Job.PENDING, 1))
+        self.assertIn('ValueError: Boom', retry.last_error)
+        self.assertGreater(retry.run_at, timezone.now() + timedelta(seconds=5))
+        self.assertEqual(claim('test'), [])
+
+        Job.objects.update(run_at=timezone.now())
+        with self.assertLogs('jobs', 'ERROR'):
+            run(claim('test')[0])
+        self.assertEqual(Job.objects.get().status, Job.FAILED)
+
+    def test_retry_is_dropped_when_the_work_was_queued_again(self):
+        explode.enqueue(dedup_key='key')
+        claimed = claim('test')[0]
+        explode.enqueue(dedup_key='key')
+        with self.assertLogs('jobs', 'WARNING'):
+            run(claimed)
+        self.assertEqual(list(Job.objects.values_list('status', flat=True)), [Job.PENDING])
+
+    @override_settings(JOBS_LEASE=60)
+    def test_jobs_of_lost_workers_are_requeued(self):
+        remember.enqueue('a')
+        claim('test')
+        self.assertEqual(requeue_stale(), 0)
+        Job.objects.update(claimed_at=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(requeue_stale(), 1)
+        self.assertEqual(Job.objects.get().status, Job.PENDING)
+
+    def test_unknown_jobs_fail(self):
+        Job.objects.create(name='jobs.tests.missing')
+        with self.assertLogs('jobs', 'ERROR'):
+            run(claim('test')[0])
+        self.assertEqual(Job.objects.get().status, Job.FAILED)
+
+    def test_burst_worker_runs_ready_jobs(self):
+        for value in range(3):
+            remember.enqueue(value)
+        out = io.StringIO()
+        call_command('run_worker', '--burst', '--batch-size', '2', stdout=out)
+        self.assertEqual(calls, [0, 1, 2])
+        self.assertEqual(set(Job.objects.values_list('status', flat=True)), {Job.DONE})
+        self.assertIn('Ran 3 jobs: 3 succeeded, 0 failed.', out.getvalue())
+
+    def test_enqueue_options_cannot_be_job_arguments(self):
+        with self.assertRaises(TypeError):
+            job(lambda priority: None)
@@ -0,0 +1,84 @@
+"""The polling loop of ``manage.py run_worker`` (see jobs.queue)"""
+import logging
+import os
+import signal
+import socket
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+
+from .queue import claim, purge_finished, requeue_stale, run
+
+logger = logging.getLogger('jobs')
+
+# Seconds between looks for stale claims and old finished jobs
+HOUSEKEEPING_INTERVAL = 300
+
+
+class Worker:
+    """Claim ready jobs in batches and run them until stopped.
+
+    An idle worker sleeps ``poll_interval`` seconds between polls; while
+    jobs keep coming it polls again as soon as a batch is done. With
+    ``burst`` it stops once no job is ready instead.
+    """
+
+    def __init__(self, batch_size=10, poll_interval=None, burst=False, name=None):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval or getattr(settings, 'JOBS_POLL_INTERVAL', 1.0)
+        self.burst = burst
+        self.name = name or f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = False
+        self.succeeded = self.failed = 0
+        self._housekeeping_at = 0.0
+
+    def stop(self, *args):
+        """Finish the jobs already claimed, then return from ``run``"""
+        self.stopping = True
+
+    def run(self):
+        while not self.stopping:
+            self.housekeeping()
+            try:
+                jobs = claim(self.name, self.batch_size)
+            except DatabaseError:
+                logger.exception('Worker %s could not poll for jobs', self.name)
+                close_old_connections()
+                jobs = []
+            for job in jobs:
+                if run(job):
+                    self.succeeded += 1
+                else:
+                    self.failed += 1
+            if not jobs:
+                if self.burst:
+                    break
+                time.sleep(self.poll_interval)
+        return self.succeeded, self.failed
+
+    def housekeeping(self):
+        now = time.monotonic()
+        if now - self._housekeeping_at < HOUSEKEEPING_INTERVAL:
+            return
+        self._housekeeping_at = now
+        try:
+            requeued = requeue_stale()
+            if requeued:
+                logger.warning('Requeued %s jobs whose workers did not finish them', requeued)
+            purge_finished()
+        except DatabaseError:
+            logger.exception('Worker %s could not tidy the job table', self.name)
+
+
+def run_process(batch_size, poll_interval):
+    """Entry point of each worker process started by ``run_worker --processes``"""
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        # Started with the spawn method: nothing inherited
+        django.setup()
+    worker = Worker(batch_size=batch_size, poll_interval=poll_interval)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run()
@@ -0,0 +1,9 @@
+from django.utils.translation import get_language
+
+from .navigation import navigation
+
+
+def navigation_pages(request):
+    """Header and footer page links, as ``header_pages`` and ``footer_pages``"""
+    links = navigation.links(get_language())
+    return {'header_pages': links['header'], 'footer_pages': links['footer']}
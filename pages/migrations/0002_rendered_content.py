@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:35
+
+from django.db import migrations, models
+
+from core.routers import run_python_where_migrated
+
+
+def render_content(apps, schema_editor):
+    from core.richtext import render_rich_text
+
+    Page = apps.get_model("pages", "Page")
+    db_alias = schema_editor.connection.alias
+    pages = list(Page.objects.using(db_alias).only("content", "content_ur"))
+    for page in pages:
+        page.content_rendered = render_rich_text(page.content)
+        page.content_ur_rendered = render_rich_text(page.content_ur)
+    Page.objects.using(db_alias).bulk_update(
+        pages, ["content_rendered", "content_ur_rendered"], batch_size=200
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pages", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="page",
+            name="content_rendered",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="page",
+            name="content_ur_rendered",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        run_python_where_migrated("page", render_content),
+    ]
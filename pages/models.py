@@ -1,6 +1,7 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from ckeditor.fields import RichTextField
+from core.translation import LocalizedQuerySet, TranslatedField
 
 
 class Page(models.Model):
@@ -12,6 +13,9 @@ class Page(models.Model):
 
     content = RichTextField(verbose_name=_("Content"))
     content_ur = RichTextField(blank=True, verbose_name=_("Content (Urdu)"))
+    # Sanitized, display-ready HTML, rendered on save (see core.richtext)
+    content_rendered = models.TextField(blank=True, editable=False)
+    content_ur_rendered = models.TextField(blank=True, editable=False)
 
     is_published = models.BooleanField(default=True, verbose_name=_("Published"))
     show_in_footer = models.BooleanField(
@@ -28,6 +32,11 @@ class Page(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    localized_title = TranslatedField('title')
+    localized_content = TranslatedField('content_rendered', 'content_ur_rendered')
+
+    objects = LocalizedQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Page")
         verbose_name_plural = _("Pages")
@@ -35,3 +44,13 @@ class Page(models.Model):
 
     def __str__(self):
         return self.title
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'content', 'content_ur'} & set(update_fields):
+            from core.richtext import render_rich_text
+            self.content_rendered = render_rich_text(self.content)
+            self.content_ur_rendered = render_rich_text(self.content_ur)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'content_rendered', 'content_ur_rendered'}
+        super().save(*args, **kwargs)
@@ -0,0 +1,70 @@
+"""Header and footer links to content pages"""
+import threading
+import uuid
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.urls import reverse
+
+
+NAVIGATION_VERSION_KEY = 'pages:navigation:version'
+
+
+class NavigationCache:
+    """Per-process copy of the header/footer page links.
+
+    Links are read with one query and kept, rendered per language, until
+    the shared version key changes; page saves and deletes replace it, so
+    every process reloads on its next request. In the steady state a
+    request costs one cache read and no queries.
+    """
+
+    def __init__(self):
+        self._version = None
+        self._pages = None
+        self._links = {}
+        self._lock = threading.Lock()
+
+    def _load(self, version):
+        from .models import Page
+        pages = list(
+            Page.objects.filter(is_published=True)
+            .filter(Q(show_in_header=True) | Q(show_in_footer=True))
+            .only('slug', 'title', 'title_ur', 'show_in_header', 'show_in_footer')
+            .order_by('title')
+        )
+        with self._lock:
+            self._version, self._pages, self._links = version, pages, {}
+
+    def links(self, language):
+        """``{'header': [...], 'footer': [...]}`` of ``{'title', 'url'}`` links for ``language``"""
+        version = cache.get(NAVIGATION_VERSION_KEY)
+        if version is None:
+            cache.add(NAVIGATION_VERSION_KEY, uuid.uuid4().hex, None)
+            version = cache.get(NAVIGATION_VERSION_KEY)
+        if self._pages is None or version != self._version:
+            self._load(version)
+        pages, rendered = self._pages, self._links
+        links = rendered.get(language)
+        if links is None:
+            header, footer = [], []
+            for page in pages:
+                link = {
+                    'title': page.localized_title,
+                    'url': reverse('pages:page_detail', args=[page.slug]),
+                }
+                if page.show_in_header:
+                    header.append(link)
+                if page.show_in_footer:
+                    footer.append(link)
+            links = rendered[language] = {'header': header, 'footer': footer}
+        return links
+
+    def invalidate(self):
+        """Make every process reload the links"""
+        # A fresh token rather than a counter, which a cache flush would restart at a version already seen
+        cache.set(NAVIGATION_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+navigation = NavigationCache()
+
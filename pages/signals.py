@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.feeds import touch_feeds
+from core.pagecache import expire_pages
+from .models import Page
+from .navigation import navigation
+
+
+@receiver(post_save, sender=Page)
+@receiver(post_delete, sender=Page)
+def expire_page_sitemap(sender, raw=False, using=None, **kwargs):
+    """Re-render the pages sitemap once a page change is committed"""
+    if not raw:
+        transaction.on_commit(lambda: touch_feeds('pages'), using=using)
+
+
+@receiver(post_save, sender=Page)
+@receiver(post_delete, sender=Page)
+def expire_navigation(sender, raw=False, using=None, **kwargs):
+    """Reload header/footer links everywhere once a page change is committed"""
+    if not raw:
+        transaction.on_commit(navigation.invalidate, using=using)
+
+
+@receiver(post_save, sender=Page)
+@receiver(post_delete, sender=Page)
+def expire_pages_showing_navigation(sender, raw=False, using=None, **kwargs):
+    """Re-render every cached page (they all show the header/footer links) once a page change is committed"""
+    if not raw:
+        expire_pages('pages', using=using)
@@ -0,0 +1,20 @@
+from django.urls import reverse
+
+from core.sitemaps import BilingualSitemap
+from .models import Page
+
+
+class PageSitemap(BilingualSitemap):
+    """Published content pages"""
+
+    changefreq = 'monthly'
+    stamp = 'pages'
+
+    def items(self):
+        return Page.objects.filter(is_published=True).only('slug', 'updated_at').order_by('pk')
+
+    def location(self, item):
+        return reverse('pages:page_detail', args=[item.slug])
+
+    def lastmod_querysets(self):
+        return [Page.objects.filter(is_published=True)]
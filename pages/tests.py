@@ -1,3 +1,66 @@
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import translation
 
-# Create your tests here.
+from core.test_runner import run_in_new_process
+
+from .models import Page
+from .navigation import navigation
+
+
+class PageRenderingTests(TestCase):
+    """Pre-rendered page content"""
+
+    def test_content_is_rendered_on_save(self):
+        page = Page.objects.create(title='About', slug='about', content='<p>About us<script>x()</script></p>')
+        self.assertEqual(page.content_rendered, '<p>About us</p>')
+
+        page.content = '<p>Updated</p>'
+        page.save(update_fields=['content'])
+        page.refresh_from_db()
+        self.assertEqual(page.content_rendered, '<p>Updated</p>')
+        Page.objects.filter(pk=page.pk).update(content_rendered='stale')
+        page.save(update_fields=['show_in_footer'])
+        page.refresh_from_db()
+        self.assertEqual(page.content_rendered, 'stale')
+
+
+class NavigationTests(TestCase):
+    """Cached header/footer page links"""
+
+    def setUp(self):
+        cache.clear()
+        self.about = Page.objects.create(
+            title='About', title_ur='ہمارے بارے میں', slug='about', content='About us', show_in_header=True
+        )
+        Page.objects.create(title='Privacy', slug='privacy', content='Rules', show_in_footer=True)
+        Page.objects.create(title='Hidden', slug='hidden', content='Draft', show_in_header=True, is_published=False)
+
+    def test_links_in_both_languages(self):
+        links = navigation.links('en')
+        self.assertEqual(links['header'], [{'title': 'About', 'url': '/pages/about/'}])
+        self.assertEqual(links['footer'], [{'title': 'Privacy', 'url': '/pages/privacy/'}])
+        with translation.override('ur'):
+            self.assertEqual(navigation.links('ur')['header'], [{'title': 'ہمارے بارے میں', 'url': '/ur/pages/about/'}])
+
+    def test_steady_state_costs_no_queries(self):
+        response = self.client.get(reverse('core:donor_lookup'))
+        self.assertContains(response, 'href="/pages/privacy/"')
+        with self.assertNumQueries(0):
+            navigation.links('en')
+
+    def test_page_changes_reload_links(self):
+        navigation.links('en')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.about.show_in_header = False
+            self.about.show_in_footer = True
+            self.about.save()
+        self.assertEqual(navigation.links('en')['header'], [])
+        self.assertEqual(len(navigation.links('en')['footer']), 2)
+
+    def test_changes_made_in_another_process_reload_links(self):
+        navigation.links('en')
+        Page.objects.filter(pk=self.about.pk).update(show_in_header=False)
+        run_in_new_process('from pages.navigation import navigation; navigation.invalidate()')
+        self.assertEqual(navigation.links('en')['header'], [])
@@ -1,13 +1,17 @@
 from django.shortcuts import render
-from django.views.generic import DetailView
+from core.asyncviews import AsyncDetailView
 from .models import Page
 
 
-class PageDetailView(DetailView):
+class PageDetailView(AsyncDetailView):
     """Static page detail view"""
     model = Page
     template_name = 'pages/page_detail.html'
     context_object_name = 'page'
+    page_cache_tags = ('pages',)
+    # Page, navigation links
+    query_budget = 2
 
     def get_queryset(self):
-        return Page.objects.filter(is_published=True)
+        # The page shows the pre-rendered HTML, never the editor source
+        return Page.objects.filter(is_published=True).defer('content', 'content_ur').localized()
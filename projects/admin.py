@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
-from django.utils.html import format_html
+from django.utils.html import format_html, format_html_join
+from core.scoping import ALL_COMMUNITIES, CommunityScopedAdminMixin, community_scope
+from core.skills import match_volunteers
 from .models import ProjectCategory, Project, ProjectUpdate, Recovery
 
 
@@ -27,7 +29,7 @@ class RecoveryInline(admin.TabularInline):
 
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(CommunityScopedAdminMixin, admin.ModelAdmin):
     list_display = ['title', 'beneficiary_name', 'category', 'community', 'status',
                     'requested_amount', 'approved_amount', 'funding_progress_display',
                     'is_featured', 'application_date']
@@ -35,7 +37,7 @@ class ProjectAdmin(admin.ModelAdmin):
     search_fields = ['title', 'title_ur', 'beneficiary_name', 'beneficiary_phone', 'beneficiary_cnic']
     readonly_fields = ['application_date', 'created_at', 'updated_at',
                        'total_funded', 'funding_progress_display', 'donor_count',
-                       'recovery_progress_display']
+                       'recovery_progress_display', 'suggested_volunteers']
     list_editable = ['is_featured']
     date_hierarchy = 'application_date'
     inlines = [ProjectUpdateInline, RecoveryInline]
@@ -79,22 +81,16 @@ class ProjectAdmin(admin.ModelAdmin):
             'fields': ('donor_count',),
             'classes': ('collapse',)
         }),
+        (_('Volunteer Matches'), {
+            'fields': ('suggested_volunteers',),
+            'classes': ('collapse',)
+        }),
         (_('Timestamps'), {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
     )
 
-    def get_queryset(self, request):
-        """Restrict queryset based on user role"""
-        qs = super().get_queryset(request)
-        if request.user.is_superuser or request.user.role == 'DIRECTOR':
-            return qs
-        # Managers only see their community's projects
-        if request.user.community:
-            return qs.filter(community=request.user.community)
-        return qs.none()
-
     def funding_progress_display(self, obj):
         """Display funding progress as a colored bar"""
         progress = obj.funding_progress()
@@ -113,9 +109,39 @@ class ProjectAdmin(admin.ModelAdmin):
         return f"{progress:.1f}%"
     recovery_progress_display.short_description = _("Recovery Progress")
 
+    def get_object(self, request, object_id, from_field=None):
+        obj = super().get_object(request, object_id, from_field)
+        if obj is not None:
+            # Read by suggested_volunteers, which is only handed the object
+            obj.viewer_scope = community_scope(request)
+        return obj
+
+    def suggested_volunteers(self, obj):
+        """Approved volunteers ranked by category, skill and community match"""
+        if obj.pk is None:
+            return '-'
+        # Managers only see volunteers of the project's (their own) community
+        only_community = getattr(obj, 'viewer_scope', None) is not ALL_COMMUNITIES
+        volunteers = match_volunteers(obj, only_community=only_community)
+        if not volunteers:
+            return _("No matching volunteers")
+        return format_html(
+            '<ol>{}</ol>',
+            format_html_join(
+                '', '<li>{} ({}, {}) &ndash; {} &ndash; {} [{}]</li>',
+                (
+                    (volunteer.name, volunteer.community, volunteer.phone, volunteer.availability or '-',
+                     ', '.join(volunteer.matched_skills), volunteer.match_score)
+                    for volunteer in volunteers
+                )
+            )
+        )
+    suggested_volunteers.short_description = _("Suggested Volunteers")
+
 
 @admin.register(ProjectUpdate)
-class ProjectUpdateAdmin(admin.ModelAdmin):
+class ProjectUpdateAdmin(CommunityScopedAdminMixin, admin.ModelAdmin):
+    community_field = 'project__community'
     list_display = ['project', 'title', 'created_at']
     list_filter = ['created_at', 'project__community']
     search_fields = ['title', 'title_ur', 'project__title']
@@ -134,18 +160,10 @@ class ProjectUpdateAdmin(admin.ModelAdmin):
         }),
     )
 
-    def get_queryset(self, request):
-        """Restrict queryset based on user role"""
-        qs = super().get_queryset(request)
-        if request.user.is_superuser or request.user.role == 'DIRECTOR':
-            return qs
-        if request.user.community:
-            return qs.filter(project__community=request.user.community)
-        return qs.none()
-
 
 @admin.register(Recovery)
-class RecoveryAdmin(admin.ModelAdmin):
+class RecoveryAdmin(CommunityScopedAdminMixin, admin.ModelAdmin):
+    community_field = 'project__community'
     list_display = ['project', 'amount', 'recovery_date', 'payment_method', 'created_at']
     list_filter = ['recovery_date', 'payment_method', 'project__community']
     search_fields = ['project__title', 'project__beneficiary_name', 'reference_number']
@@ -169,15 +187,6 @@ class RecoveryAdmin(admin.ModelAdmin):
         }),
     )
 
-    def get_queryset(self, request):
-        """Restrict queryset based on user role"""
-        qs = super().get_queryset(request)
-        if request.user.is_superuser or request.user.role == 'DIRECTOR':
-            return qs
-        if request.user.community:
-            return qs.filter(project__community=request.user.community)
-        return qs.none()
-
 
 # Enable autocomplete for related lookups
 Project.search_fields = ['title', 'beneficiary_name']
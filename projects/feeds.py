@@ -0,0 +1,52 @@
+from operator import attrgetter
+
+from django.contrib.syndication.views import Feed
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+from django.utils.translation import gettext as _
+
+from core.routers import fan_out
+from .models import ProjectUpdate
+
+
+class ProjectUpdatesFeed(Feed):
+    """Latest progress updates on public projects"""
+
+    def title(self):
+        return _('Bait ul Rizq Project Updates')
+
+    def description(self):
+        return _('Progress reports from the businesses our donors have funded')
+
+    def link(self):
+        return reverse('projects:project_list')
+
+    def items(self):
+        return fan_out(
+            ProjectUpdate.objects.filter(project__is_public=True).select_related('project').localized()[:20],
+            key=attrgetter('created_at'),
+            reverse=True
+        )[:20]
+
+    def item_title(self, item):
+        return f"{item.project.localized_title}: {item.localized_title}"
+
+    def item_description(self, item):
+        return Truncator(item.localized_content).words(80)
+
+    def item_link(self, item):
+        return reverse('projects:project_detail', kwargs={'pk': item.project_id})
+
+    def item_guid(self, item):
+        return f'project-update-{item.pk}'
+
+    item_guid_is_permalink = False
+
+    def item_pubdate(self, item):
+        return item.created_at
+
+
+class ProjectUpdatesAtomFeed(ProjectUpdatesFeed):
+    feed_type = Atom1Feed
+    subtitle = ProjectUpdatesFeed.description
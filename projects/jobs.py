@@ -0,0 +1,9 @@
+"""Background jobs of the projects app (run by ``manage.py run_worker``)"""
+from jobs.queue import job
+from .related import related_projects
+
+
+@job(merge=True)
+def update_related_projects(pks, using):
+    """Recompute the recommendations touching the projects ``pks``"""
+    related_projects.refresh(pks, using=using)
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedProject",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField(verbose_name="Similarity")),
+                ("rank", models.PositiveSmallIntegerField(verbose_name="Rank")),
+                (
+                    "source",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_entries",
+                        to="projects.project",
+                        verbose_name="Project",
+                    ),
+                ),
+                (
+                    "target",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_from",
+                        to="projects.project",
+                        verbose_name="Related Project",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Related Project",
+                "verbose_name_plural": "Related Projects",
+                "ordering": ["source", "rank"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("source", "rank"),
+                        name="projects_related_project_rank_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.utils.translation import gettext_lazy as _
 from core.models import Community
+from core.translation import LocalizedQuerySet, TranslatedField
 from decimal import Decimal
 
 
@@ -17,6 +19,10 @@ class ProjectCategory(models.Model):
         verbose_name=_("Icon")
     )
 
+    localized_name = TranslatedField('name')
+
+    objects = LocalizedQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Project Category")
         verbose_name_plural = _("Project Categories")
@@ -26,6 +32,32 @@ class ProjectCategory(models.Model):
         return self.name
 
 
+# Columns rendered by the public project cards (home page and project list)
+PROJECT_CARD_FIELDS = [
+    'title', 'title_ur', 'category__name', 'category__name_ur', 'beneficiary_name',
+    'description', 'status', 'image', 'currency', 'requested_amount', 'approved_amount',
+    'created_at',
+]
+
+
+class ProjectQuerySet(LocalizedQuerySet):
+    """Queryset helpers for projects"""
+
+    def for_cards(self):
+        """Only the card columns, with the category joined and funding totals annotated"""
+        return self.select_related('category').only(*PROJECT_CARD_FIELDS).with_funding()
+
+    def with_funding(self):
+        """Annotate each project with its funded total (read by total_funded)"""
+        return self.annotate(
+            funded_total=Coalesce(
+                models.Sum('allocations__amount'),
+                models.Value(Decimal('0.00')),
+                output_field=models.DecimalField(max_digits=12, decimal_places=2)
+            )
+        )
+
+
 class Project(models.Model):
     """Represents a project/beneficiary business"""
 
@@ -190,6 +222,11 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    localized_title = TranslatedField('title')
+    localized_description = TranslatedField('description')
+
+    objects = ProjectQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Project")
         verbose_name_plural = _("Projects")
@@ -200,6 +237,9 @@ class Project(models.Model):
 
     def total_funded(self):
         """Calculate total amount funded from donations"""
+        if hasattr(self, 'funded_total'):
+            # Precomputed by ProjectQuerySet.with_funding()
+            return self.funded_total
         return self.allocations.aggregate(
             total=models.Sum('amount')
         )['total'] or Decimal('0.00')
@@ -229,6 +269,36 @@ class Project(models.Model):
         return self.allocations.values('donation__donor').distinct().count()
 
 
+class RelatedProject(models.Model):
+    """A project recommended on another project's page (see projects.related)"""
+
+    source = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name='related_entries',
+        verbose_name=_("Project")
+    )
+    target = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name='related_from',
+        verbose_name=_("Related Project")
+    )
+    score = models.FloatField(verbose_name=_("Similarity"))
+    rank = models.PositiveSmallIntegerField(verbose_name=_("Rank"))
+
+    class Meta:
+        verbose_name = _("Related Project")
+        verbose_name_plural = _("Related Projects")
+        ordering = ['source', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'rank'], name='projects_related_project_rank_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.source} -> {self.target}"
+
+
 class ProjectUpdate(models.Model):
     """Progress updates for projects"""
 
@@ -250,6 +320,11 @@ class ProjectUpdate(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    localized_title = TranslatedField('title')
+    localized_content = TranslatedField('content')
+
+    objects = LocalizedQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Project Update")
         verbose_name_plural = _("Project Updates")
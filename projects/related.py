@@ -0,0 +1,22 @@
+"""Related-project recommendations (see core.recommendations)"""
+from core.recommendations import Recommender
+
+
+# Columns a project's similarity is computed from, and how much each counts
+RELATED_FIELDS = {
+    'title': 3, 'title_ur': 3, 'category__name': 2, 'category__name_ur': 2,
+    'description': 1, 'description_ur': 1,
+}
+
+
+def _documents(using):
+    from .models import Project
+    rows = Project.objects.using(using).filter(is_public=True).values_list('pk', *RELATED_FIELDS)
+    weights = list(RELATED_FIELDS.values())
+    return {
+        pk: [(text or '', weight) for text, weight in zip(texts, weights)]
+        for pk, *texts in rows.iterator(chunk_size=1000)
+    }
+
+
+related_projects = Recommender('projects.RelatedProject', _documents)
@@ -0,0 +1,61 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from core.feeds import touch_feeds
+from core.pagecache import expire_pages
+from donations.models import DonationAllocation
+from .jobs import update_related_projects
+from .models import Project, ProjectCategory, ProjectUpdate, RelatedProject
+
+
+# Saves touching any of these can change which projects are related
+RELATED_PROJECT_FIELDS = {'title', 'title_ur', 'description', 'description_ur', 'category', 'is_public'}
+
+
+def _refresh_related(pks, using):
+    # Recomputing similarities reads every project: left to a worker, with the projects changed
+    # meanwhile merged into one pending job per database
+    def enqueue():
+        update_related_projects.enqueue(list(pks), using, dedup_key=f'related-projects:{using}')
+
+    transaction.on_commit(enqueue, using=using, robust=True)
+
+
+@receiver(post_save, sender=ProjectUpdate)
+@receiver(post_delete, sender=ProjectUpdate)
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def expire_project_feeds(sender, raw=False, using=None, **kwargs):
+    """Re-render the project update feeds once a change to updates or project visibility is committed"""
+    if not raw:
+        transaction.on_commit(lambda: touch_feeds('projects'), using=using)
+
+
+@receiver(post_save, sender=Project)
+def refresh_related_projects(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    """Update recommendations once a change to a project's text or visibility is committed"""
+    if not raw and (update_fields is None or RELATED_PROJECT_FIELDS & set(update_fields)):
+        _refresh_related([instance.pk], using)
+
+
+@receiver(pre_delete, sender=Project)
+def refill_related_projects(sender, instance, using=None, **kwargs):
+    """Refill the lists a deleted project is about to drop out of"""
+    sources = list(RelatedProject.objects.using(using).filter(target=instance).values_list('source_id', flat=True))
+    if sources:
+        _refresh_related(sources, using)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=ProjectUpdate)
+@receiver(post_delete, sender=ProjectUpdate)
+@receiver(post_save, sender=ProjectCategory)
+@receiver(post_delete, sender=ProjectCategory)
+@receiver(post_save, sender=DonationAllocation)
+@receiver(post_delete, sender=DonationAllocation)
+def expire_project_pages(sender, raw=False, using=None, **kwargs):
+    """Re-render cached project pages (and the home page) once a change, funding included, is committed"""
+    if not raw:
+        expire_pages('projects', using=using)
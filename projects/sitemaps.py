@@ -0,0 +1,24 @@
+from django.urls import reverse
+
+from core.routers import community_databases, fan_out
+from core.sitemaps import BilingualSitemap
+from .models import Project
+
+
+class ProjectSitemap(BilingualSitemap):
+    """Public projects from every community database"""
+
+    changefreq = 'weekly'
+    stamp = 'projects'
+
+    def items(self):
+        return fan_out(
+            Project.objects.filter(is_public=True).only('pk', 'updated_at').order_by('pk'),
+            key=lambda project: project.pk
+        )
+
+    def location(self, item):
+        return reverse('projects:project_detail', args=[item.pk])
+
+    def lastmod_querysets(self):
+        return [Project.objects.using(alias).filter(is_public=True) for alias in community_databases()]
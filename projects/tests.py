@@ -1,3 +1,99 @@
+from datetime import date
+from decimal import Decimal
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import translation
+
+from core.models import Community, Donor
+from donations.models import Donation, DonationAllocation
+from pages.navigation import navigation
+from .models import PROJECT_CARD_FIELDS, Project, ProjectCategory, ProjectUpdate
+from .related import related_projects
+
+
+class ProjectListViewTests(TestCase):
+    """Public project cards"""
+
+    @classmethod
+    def setUpTestData(cls):
+        community = Community.objects.create(name='Pakistani Community', community_type='PAK')
+        category = ProjectCategory.objects.create(name='Retail')
+        for i in range(3):
+            Project.objects.create(
+                title=f'Shop {i}',
+                category=category,
+                community=community,
+                beneficiary_name=f'Beneficiary {i}',
+                beneficiary_phone='0300-0000000',
+                beneficiary_address='Karachi',
+                description='General store',
+                business_plan='Long plan ' * 500,
+                requested_amount=Decimal('1000.00'),
+                is_featured=True,
+            )
+
+    def setUp(self):
+        # Rendered pages, not cached ones; header/footer links are read once per process
+        cache.clear()
+        navigation.links('en')
+
+    def test_cards_fetch_only_card_columns(self):
+        # count and page; category and funding totals come with the page
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('projects:project_list'))
+        self.assertEqual(response.status_code, 200)
+        # English pages leave the Urdu text unread
+        card_columns = {'id'} | {
+            Project._meta.get_field(field.split('__')[0]).attname for field in PROJECT_CARD_FIELDS
+        } - {'title_ur', 'description_ur'}
+        all_columns = {field.attname for field in Project._meta.concrete_fields}
+        for project in response.context['projects']:
+            self.assertEqual(all_columns - project.get_deferred_fields(), card_columns)
+
+    def test_urdu_cards_show_urdu_text(self):
+        Project.objects.filter(title='Shop 0').update(title_ur='دکان', description_ur='جنرل اسٹور')
+        # override() restores the language the request activates
+        with translation.override('en'), self.assertNumQueries(2):
+            response = self.client.get('/ur/projects/')
+        self.assertContains(response, 'دکان')
+        self.assertContains(response, 'جنرل اسٹور')
+        self.assertContains(response, 'Shop 1')
+
+    def test_home_page_cards(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('core:home'))
+        self.assertEqual(len(response.context['featured_projects']), 3)
+
+    def test_updates_feed_lists_public_projects_only(self):
+        cache.clear()
+        public, hidden = Project.objects.all()[:2]
+        hidden.is_public = False
+        hidden.save()
+        ProjectUpdate.objects.create(project=public, title='Stock delivered', content='Shelves are full')
+        ProjectUpdate.objects.create(project=hidden, title='Private note', content='Internal')
+        response = self.client.get(reverse('projects:updates_atom_feed'))
+        self.assertContains(response, 'Stock delivered')
+        self.assertNotContains(response, 'Private note')
+
+    def test_detail_page_shows_related_projects(self):
+        bakery = Project.objects.first()
+        bakery.title, bakery.description = 'Bakery', 'Bread oven for a family bakery'
+        bakery.save()
+        related_projects.rebuild()
+        response = self.client.get(reverse('projects:project_detail', args=[bakery.pk]))
+        self.assertEqual(len(response.context['related_projects']), 2)
+        self.assertContains(response, 'Related Projects')
 
-# Create your tests here.
+    def test_detail_page_of_a_funded_project(self):
+        project = Project.objects.first()
+        project.status, project.approved_amount = 'FUNDED', Decimal('800.00')
+        project.save()
+        donor = Donor.objects.create(name='Muhammad Ali', community=project.community)
+        donation = Donation.objects.create(donor=donor, amount=Decimal('200.00'), date_received=date(2025, 1, 1))
+        DonationAllocation.objects.create(donation=donation, project=project, amount=Decimal('200.00'))
+        # Project with category and funding total, related projects
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('projects:project_detail', args=[project.pk]))
+        self.assertContains(response, 'width: 25')
@@ -1,5 +1,6 @@
 from django.urls import path
-from . import views
+from core.feeds import cached_feed
+from . import feeds, views
 
 app_name = 'projects'
 
@@ -8,4 +9,6 @@ urlpatterns = [
     path('<int:pk>/', views.ProjectDetailView.as_view(), name='project_detail'),
     path('apply/', views.ProjectApplicationView.as_view(), name='project_apply'),
     path('apply/success/', views.ProjectApplicationSuccessView.as_view(), name='project_apply_success'),
+    path('updates/feed/', cached_feed(feeds.ProjectUpdatesFeed(), 'projects'), name='updates_feed'),
+    path('updates/feed/atom/', cached_feed(feeds.ProjectUpdatesAtomFeed(), 'projects'), name='updates_atom_feed'),
 ]
@@ -1,29 +1,63 @@
+from operator import attrgetter
+from django.http import Http404
 from django.shortcuts import render
-from django.views.generic import ListView, DetailView, CreateView, TemplateView
+from django.views.generic import CreateView, TemplateView
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
+from core.asyncviews import AsyncDetailView, AsyncListView, alist
+from core.routers import FannedOutQuerySet, aget_from_any, community_databases
 from .models import Project
 
 
-class ProjectListView(ListView):
+class ProjectListView(AsyncListView):
     """List all public projects"""
     model = Project
     template_name = 'projects/project_list.html'
     context_object_name = 'projects'
     paginate_by = 12
+    page_cache_tags = ('projects', 'pages')
+    # Count, page with categories and funding totals, navigation links
+    query_budget = 3
+    # Count and page, per community database
+    fan_out_queries = 2
 
     def get_queryset(self):
-        return Project.objects.filter(is_public=True).order_by('-created_at')
+        return Project.objects.filter(is_public=True).for_cards().localized().order_by('-created_at')
 
+    async def aget_object_list(self):
+        queryset = self.get_queryset()
+        if len(community_databases()) == 1:
+            # Counted and sliced by the database
+            return queryset
+        # Counted per database; a page loads no more than its own end position from each
+        return FannedOutQuerySet(queryset, key=attrgetter('created_at'), reverse=True)
 
-class ProjectDetailView(DetailView):
+
+class ProjectDetailView(AsyncDetailView):
     """Project detail page"""
     model = Project
     template_name = 'projects/project_detail.html'
     context_object_name = 'project'
+    page_cache_tags = ('projects', 'pages')
+    # Project with its category and funding total, related projects, navigation links
+    query_budget = 3
 
     def get_queryset(self):
-        return Project.objects.filter(is_public=True)
+        return Project.objects.filter(is_public=True).select_related('category').with_funding().localized()
+
+    async def aget_object(self, queryset=None):
+        try:
+            return await aget_from_any(queryset or self.get_queryset(), pk=self.kwargs['pk'])
+        except Project.DoesNotExist:
+            raise Http404(_('No project found'))
+
+    async def aget_context_data(self, **kwargs):
+        context = self.get_context_data(**kwargs)
+        # Precomputed by projects.related in the project's own database
+        context['related_projects'] = await alist(Project.objects.using(self.object._state.db).filter(
+            related_from__source=self.object, is_public=True
+        ).for_cards().localized().order_by('related_from__rank'))
+        return context
 
 
 class ProjectApplicationView(CreateView):